@@ -35,6 +35,7 @@ from plainbox.impl.transport import InvalidSecureIDError
 from plainbox.impl.transport import SECURE_ID_PATTERN
 from plainbox.impl.transport import TransportBase
 from plainbox.impl.transport import TransportError
+from plainbox.impl.transport import get_http_session
 import requests
 
 
@@ -149,7 +150,7 @@ class CertificationTransport(TransportBase):
         # Requests takes care of properly handling a file-like data.
         form_payload = {"data": data}
         try:
-            response = requests.post(
+            response = get_http_session(self.url).post(
                 self.url, files=form_payload, headers=headers, proxies=proxies)
         except requests.exceptions.Timeout as exc:
             raise TransportError(
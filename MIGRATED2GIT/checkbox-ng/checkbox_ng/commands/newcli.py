@@ -26,9 +26,11 @@
     THIS MODULE DOES NOT HAVE STABLE PUBLIC API
 """
 
+from collections import OrderedDict
 from gettext import gettext as _
 from logging import getLogger
 from shutil import copyfileobj
+import contextlib
 import io
 import operator
 import os
@@ -39,6 +41,7 @@ import sys
 from plainbox.abc import IJobResult
 from plainbox.impl.commands.inv_run import RunInvocation
 from plainbox.impl.exporter import ByteStringStreamTranslator
+from plainbox.impl.exporter import dump_many_from_session_manager
 from plainbox.impl.secure.config import Unset, ValidationError
 from plainbox.impl.secure.origin import CommandLineTextSource
 from plainbox.impl.secure.origin import Origin
@@ -361,16 +364,29 @@ class CliInvocation2(RunInvocation):
                 '2013.com.canonical.plainbox::xlsx',
                 '2013.com.canonical.plainbox::json',
             ]
+        # Exporters sharing a file extension write to the same file so only
+        # the last one of them matters.
+        exporter_map = OrderedDict()
         for unit_name in exporters:
             exporter = self.manager.create_exporter(
                 unit_name, exp_options, strict=False)
+            exporter_map[exporter.unit.file_extension] = exporter
+        with contextlib.ExitStack() as stack:
+            exporter_stream_list = []
+            for extension, exporter in exporter_map.items():
+                results_path = os.path.join(
+                    base_dir, 'submission.{}'.format(extension))
+                stream = stack.enter_context(open(results_path, "wb"))
+                exporter_stream_list.append((exporter, stream))
+            render_time_list = dump_many_from_session_manager(
+                self.manager, exporter_stream_list)
+        for (exporter, stream), render_time in zip(
+                exporter_stream_list, render_time_list):
             extension = exporter.unit.file_extension
-            results_path = os.path.join(
-                base_dir, 'submission.{}'.format(extension))
-            with open(results_path, "wb") as stream:
-                exporter.dump_from_session_manager(self.manager, stream)
+            logger.info(_("Rendered %s report in %.2fs"),
+                        extension, render_time)
             print(_("View results") + " ({}): file://{}".format(
-                extension, results_path))
+                extension, stream.name))
         self.submission_file = os.path.join(base_dir, 'submission.xml')
         if self.launcher.submit_to is not Unset:
             if self.launcher.submit_to == 'certification':
@@ -26,6 +26,7 @@
 """
 
 from argparse import ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
 from plainbox.i18n import docstring
 from plainbox.i18n import gettext as _
 from plainbox.i18n import gettext_noop as N_
@@ -33,6 +34,7 @@ import re
 
 from plainbox.impl.commands import PlainBoxCommand
 from plainbox.impl.secure.config import Unset
+from plainbox.impl.transport import HTTP_POOL_SIZE
 from plainbox.impl.transport import TransportError
 from plainbox.impl.transport import SECURE_ID_PATTERN
 
@@ -53,20 +55,46 @@ class SubmitInvocation:
         options_string = "secure_id={0}".format(self.ns.secure_id)
         transport = CertificationTransport(self.ns.url, options_string)
 
-        try:
-            with open(self.ns.submission, "r", encoding='utf-8') as subm_file:
-                result = transport.send(subm_file)
-        except (TransportError, OSError) as exc:
-            raise SystemExit(exc)
-        else:
-            if 'url' in result:
-                # TRANSLATORS: Do not translate the {} format marker.
-                print(_("Successfully sent, submission status"
-                        " at {0}").format(result['url']))
+        if len(self.ns.submission) == 1:
+            try:
+                result = self._send(transport, self.ns.submission[0])
+            except (TransportError, OSError) as exc:
+                raise SystemExit(exc)
             else:
-                # TRANSLATORS: Do not translate the {} format marker.
-                print(_("Successfully sent, server response"
-                        ": {0}").format(result))
+                self._print_result(result)
+            return
+        # Send all the submissions at once, over the connections kept open
+        # by the transport.
+        with ThreadPoolExecutor(HTTP_POOL_SIZE) as executor:
+            future_list = [
+                executor.submit(self._send, transport, submission)
+                for submission in self.ns.submission]
+        failed = False
+        for submission, future in zip(self.ns.submission, future_list):
+            print("{0}:".format(submission), end=' ')
+            try:
+                result = future.result()
+            except (TransportError, OSError) as exc:
+                print(exc)
+                failed = True
+            else:
+                self._print_result(result)
+        if failed:
+            raise SystemExit(1)
+
+    def _send(self, transport, submission):
+        with open(submission, "r", encoding='utf-8') as subm_file:
+            return transport.send(subm_file)
+
+    def _print_result(self, result):
+        if 'url' in result:
+            # TRANSLATORS: Do not translate the {} format marker.
+            print(_("Successfully sent, submission status"
+                    " at {0}").format(result['url']))
+        else:
+            # TRANSLATORS: Do not translate the {} format marker.
+            print(_("Successfully sent, server response"
+                    ": {0}").format(result))
 
 
 @docstring(
@@ -82,6 +110,7 @@ class SubmitInvocation:
     submit test results to the Canonical certification website
 
     This command sends the XML results file to the Certification website.
+    Several results files can be sent at once.
     """))
 class SubmitCommand(PlainBoxCommand):
 
@@ -101,7 +130,8 @@ class SubmitCommand(PlainBoxCommand):
     def register_arguments(self, parser):
         parser.set_defaults(command=self)
         parser.add_argument(
-            'submission', help=_("The path to the results xml file"))
+            'submission', nargs='+',
+            help=_("The path to the results xml file"))
         self.register_optional_arguments(parser, required=True)
 
     def register_optional_arguments(self, parser, required=False):
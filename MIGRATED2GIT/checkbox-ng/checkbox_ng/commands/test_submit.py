@@ -0,0 +1,109 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+checkbox_ng.commands.test_submit
+================================
+
+Test definitions for checkbox_ng.commands.submit module
+"""
+
+from argparse import Namespace
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+import threading
+
+from plainbox.impl.transport import TransportError
+from plainbox.testing_utils.io import TestIO
+from plainbox.vendor import mock
+
+from checkbox_ng.commands.submit import SubmitInvocation
+
+
+class SubmitInvocationTests(TestCase):
+
+    def setUp(self):
+        self.scratch_dir = TemporaryDirectory()
+        self.addCleanup(self.scratch_dir.cleanup)
+        self.submission_list = []
+        for name in ('a.xml', 'b.xml', 'c.xml'):
+            pathname = os.path.join(self.scratch_dir.name, name)
+            with open(pathname, 'wt', encoding='UTF-8') as stream:
+                stream.write('<{}/>'.format(name))
+            self.submission_list.append(pathname)
+        patcher = mock.patch(
+            'checkbox_ng.commands.submit.CertificationTransport')
+        self.transport_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.transport = self.transport_cls.return_value
+
+    def _make_ns(self, submission_list):
+        return Namespace(
+            secure_id='abcdefg0001234567', url='https://example.com/',
+            submission=submission_list)
+
+    def _run(self, submission_list):
+        with TestIO() as io:
+            SubmitInvocation(self._make_ns(submission_list)).run()
+        return io.stdout
+
+    def test_run__one(self):
+        self.transport.send.return_value = {'url': 'https://example.com/1'}
+        stdout = self._run(self.submission_list[:1])
+        self.assertEqual(stdout, (
+            "Successfully sent, submission status at"
+            " https://example.com/1\n"))
+        self.transport_cls.assert_called_once_with(
+            'https://example.com/', 'secure_id=abcdefg0001234567')
+
+    def test_run__many(self):
+        barrier = threading.Barrier(len(self.submission_list), timeout=5)
+
+        def send(stream):
+            # Each send waits for all of them to be in progress
+            barrier.wait()
+            return {'url': 'https://example.com/' + stream.read()}
+
+        self.transport.send.side_effect = send
+        stdout = self._run(self.submission_list)
+        self.assertEqual(stdout, ''.join(
+            "{0}: Successfully sent, submission status at"
+            " https://example.com/<{1}/>\n".format(
+                pathname, os.path.basename(pathname))
+            for pathname in self.submission_list))
+        self.assertEqual(self.transport.send.call_count, 3)
+
+    def test_run__many_with_error(self):
+        def send(stream):
+            data = stream.read()
+            if data == '<b.xml/>':
+                raise TransportError('server said no')
+            return {'id': data}
+
+        self.transport.send.side_effect = send
+        with TestIO() as io:
+            with self.assertRaises(SystemExit) as call:
+                SubmitInvocation(self._make_ns(self.submission_list)).run()
+        self.assertEqual(call.exception.args, (1,))
+        # The other files are still sent and each one is reported
+        self.assertEqual(self.transport.send.call_count, 3)
+        a_xml, b_xml, c_xml = self.submission_list
+        self.assertEqual(io.stdout, (
+            "{0}: Successfully sent, server response: {{'id': '<a.xml/>'}}\n"
+            "{1}: server said no\n"
+            "{2}: Successfully sent, server response: {{'id': '<c.xml/>'}}\n"
+        ).format(a_xml, b_xml, c_xml))
@@ -37,6 +37,7 @@ import requests
 from checkbox_support.lib.dmi import Dmi
 from plainbox.impl.secure.config import Unset
 from plainbox.impl.transport import TransportBase, TransportError
+from plainbox.impl.transport import get_http_session
 
 logger = getLogger("checkbox.ng.launchpad")
 
@@ -174,10 +175,9 @@ class LaunchpadTransport(TransportBase):
         file.size = len(compressed_payload)
         submission_data = {'field.submission_data': file}
         try:
-            response = requests.post(self.url, data=form_fields,
-                                     files=submission_data,
-                                     headers=lp_headers,
-                                     proxies=proxies)
+            response = get_http_session(self.url).post(
+                self.url, data=form_fields, files=submission_data,
+                headers=lp_headers, proxies=proxies)
         except requests.exceptions.Timeout as exc:
             raise TransportError(
                 _("Request to {0} timed out: {1}").format(self.url, exc))
@@ -35,7 +35,6 @@ from plainbox.impl.transport import TransportError
 from plainbox.vendor import mock
 from plainbox.vendor.mock import MagicMock
 from requests.exceptions import ConnectionError, InvalidSchema, HTTPError
-import requests
 
 from checkbox_ng.certification import CertificationTransport
 
@@ -54,8 +53,10 @@ class CertificationTransportTests(TestCase):
         self.sample_xml = BytesIO(resource_string(
             "plainbox", "test-data/xml-exporter/example-data.xml"
         ))
-        self.patcher = mock.patch('requests.post')
-        self.mock_requests = self.patcher.start()
+        self.patcher = mock.patch(
+            'checkbox_ng.certification.get_http_session')
+        self.mock_requests = self.patcher.start().return_value.post
+        self.addCleanup(self.patcher.stop)
 
     def test_parameter_parsing(self):
         # Makes sense since I'm overriding the base class's constructor.
@@ -86,12 +87,12 @@ class CertificationTransportTests(TestCase):
         transport = CertificationTransport(
             self.invalid_url, self.valid_option_string)
         dummy_data = BytesIO(b"some data to send")
-        requests.post.side_effect = InvalidSchema
+        self.mock_requests.side_effect = InvalidSchema
 
         with self.assertRaises(TransportError):
             result = transport.send(dummy_data)
             self.assertIsNotNone(result)
-        requests.post.assert_called_with(
+        self.mock_requests.assert_called_with(
             self.invalid_url, files={'data': dummy_data},
             headers={'X_HARDWARE_ID': self.valid_secure_id}, proxies=None)
 
@@ -100,15 +101,13 @@ class CertificationTransportTests(TestCase):
         transport = CertificationTransport(
             self.unreachable_url, self.valid_option_string)
         dummy_data = BytesIO(b"some data to send")
-        requests.post.side_effect = ConnectionError
+        self.mock_requests.side_effect = ConnectionError
         with self.assertRaises(TransportError):
             result = transport.send(dummy_data)
             self.assertIsNotNone(result)
-        requests.post.assert_called_with(self.unreachable_url,
-                                         files={'data': dummy_data},
-                                         headers={'X_HARDWARE_ID':
-                                                  self.valid_secure_id},
-                                         proxies=None)
+        self.mock_requests.assert_called_with(
+            self.unreachable_url, files={'data': dummy_data},
+            headers={'X_HARDWARE_ID': self.valid_secure_id}, proxies=None)
 
     @mock.patch('checkbox_ng.certification.logger')
     def test_share_with_hexr_header_sent(self, mock_logger):
@@ -117,32 +116,30 @@ class CertificationTransportTests(TestCase):
         dummy_data = BytesIO(b"some data to send")
         result = transport.send(dummy_data)
         self.assertIsNotNone(result)
-        requests.post.assert_called_with(self.valid_url,
-                                         files={'data': dummy_data},
-                                         headers={'X_HARDWARE_ID':
-                                                  self.valid_secure_id,
-                                                  'X-Share-With-HEXR':
-                                                  True},
-                                         proxies=None)
+        self.mock_requests.assert_called_with(
+            self.valid_url, files={'data': dummy_data},
+            headers={'X_HARDWARE_ID': self.valid_secure_id,
+                     'X-Share-With-HEXR': True},
+            proxies=None)
 
     def test_send_success(self):
         transport = CertificationTransport(
             self.valid_url, self.valid_option_string)
-        requests.post.return_value = MagicMock(name='response')
-        requests.post.return_value.status_code = 200
-        requests.post.return_value.text = '{"id": 768}'
+        self.mock_requests.return_value = MagicMock(name='response')
+        self.mock_requests.return_value.status_code = 200
+        self.mock_requests.return_value.text = '{"id": 768}'
         result = transport.send(self.sample_xml)
         self.assertTrue(result)
 
     def test_send_failure(self):
         transport = CertificationTransport(
             self.valid_url, self.valid_option_string)
-        requests.post.return_value = MagicMock(name='response')
-        requests.post.return_value.status_code = 412
-        requests.post.return_value.text = 'Some error'
+        self.mock_requests.return_value = MagicMock(name='response')
+        self.mock_requests.return_value.status_code = 412
+        self.mock_requests.return_value.text = 'Some error'
         # Oops, raise_for_status doesn't get fooled by my mocking,
         # so I have to mock *that* method as well..
-        requests.post.return_value.raise_for_status = MagicMock(
+        self.mock_requests.return_value.raise_for_status = MagicMock(
             side_effect=HTTPError)
         with self.assertRaises(TransportError):
             transport.send(self.sample_xml)
@@ -157,12 +154,12 @@ class CertificationTransportTests(TestCase):
             self.valid_url, self.valid_option_string)
         dummy_data = BytesIO(b"some data to send")
 
-        requests.post.return_value = MagicMock(name='response')
-        requests.post.return_value.status_code = 200
-        requests.post.return_value.text = '{"id": 768}'
+        self.mock_requests.return_value = MagicMock(name='response')
+        self.mock_requests.return_value.status_code = 200
+        self.mock_requests.return_value.text = '{"id": 768}'
         result = transport.send(dummy_data, config=test_config)
         self.assertTrue(result)
-        requests.post.assert_called_with(
+        self.mock_requests.assert_called_with(
             self.valid_url, files={'data': dummy_data},
             headers={'X_HARDWARE_ID': self.valid_secure_id},
             proxies=test_proxies)
@@ -0,0 +1,81 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+checkbox_support.helpers.xml_sanitizer
+======================================
+
+Utility functions for removing characters which are not valid in XML
+"""
+import re
+
+# Everything outside of the Char production of the XML specification
+# http://www.w3.org/TR/xml/#charsets
+INVALID_XML_CHARS_RE = re.compile(
+    '[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]+')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def sanitize_xml_text(text):
+    """
+    Remove characters which are not valid in XML from a piece of text
+
+    :param text:
+        The text to sanitize
+    :returns:
+        The same text without the characters which are not valid in XML
+    """
+    return INVALID_XML_CHARS_RE.sub('', text)
+
+
+def iter_sanitized_xml_chunks(stream, chunk_size=CHUNK_SIZE):
+    """
+    Read a text stream and sanitize it one chunk at a time
+
+    :param stream:
+        A text stream to read from
+    :param chunk_size:
+        The number of characters to read at a time
+    :returns:
+        A generator of sanitized chunks of text. Chunks which end up empty
+        are skipped.
+
+    Validity of a character does not depend on its neighbours so the stream
+    is never kept in memory as a whole.
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk = INVALID_XML_CHARS_RE.sub('', chunk)
+        if chunk:
+            yield chunk
+
+
+def sanitize_xml_stream(in_stream, out_stream, chunk_size=CHUNK_SIZE):
+    """
+    Copy a text stream, removing characters which are not valid in XML
+
+    :param in_stream:
+        A text stream to read from
+    :param out_stream:
+        A text stream to write the sanitized text to
+    :param chunk_size:
+        The number of characters to read at a time
+    """
+    for chunk in iter_sanitized_xml_chunks(in_stream, chunk_size):
+        out_stream.write(chunk)
@@ -992,8 +992,9 @@ class SubmissionResult(object):
 
 class SubmissionParser(object):
 
-    def __init__(self, file):
+    def __init__(self, file, incremental=False):
         self.file = file
+        self.incremental = incremental
         self.logger = getLogger()
 
     def _getClient(self, node):
@@ -1063,48 +1064,58 @@ class SubmissionParser(object):
     def parseContext(self, result, node):
         """Parse the <context> part of a submission."""
         duplicates = set()
-        lsblk_tag = False
         for child in node.getchildren():
-            assert child.tag == "info", \
-                "Unexpected tag <%s>, expected <info>" % child.tag
-            command = child.get("command")
-            if command not in duplicates:
-                duplicates.add(command)
-                text = child.text
-                if text is None:
-                    text = ""
-                result.addContext(text, command)
-                if command == "lsblk_attachment":
-                    lsblk_tag = True
-            else:
-                self.logger.debug(
-                    "Duplicate command found in tag <info>: %s" % command)
-        if not lsblk_tag:
+            self.parseInfo(result, child, duplicates)
+        if "lsblk_attachment" not in duplicates:
             result.addContext("", "lsblk_attachment")
 
+    def parseInfo(self, result, node, duplicates):
+        """
+        Parse an <info> element of the <context> part of a submission.
+
+        :param duplicates: set of the commands of the <info> elements
+        parsed so far, the command of this one is added to it
+        """
+        assert node.tag == "info", \
+            "Unexpected tag <%s>, expected <info>" % node.tag
+        command = node.get("command")
+        if command not in duplicates:
+            duplicates.add(command)
+            text = node.text
+            if text is None:
+                text = ""
+            result.addContext(text, command)
+        else:
+            self.logger.debug(
+                "Duplicate command found in tag <info>: %s" % command)
+
     def parseHardware(self, result, node):
         """Parse the <hardware> section of a submission."""
+        for child in node.getchildren():
+            self.parseHardwareChild(result, child)
+
+    def parseHardwareChild(self, result, node):
+        """Parse an element of the <hardware> section of a submission."""
         parsers = {
             "dmi": DmidecodeParser,
             "processors": self.parseProcessors,
             "udev": result.parseUdevadm,
             }
 
-        for child in node.getchildren():
-            parser = parsers.get(child.tag)
-            if parser:
-                if child.getchildren():
-                    parser(result, child)
-                else:
-                    text = child.text
-                    if hasattr(text, "decode"):
-                        text = text.decode("utf-8")
-                    stream = StringIO(text)
-                    p = parser(stream)
-                    p.run(result)
+        parser = parsers.get(node.tag)
+        if parser:
+            if node.getchildren():
+                parser(result, node)
             else:
-                self.logger.debug(
-                    "Unsupported tag <%s> in <hardware>" % child.tag)
+                text = node.text
+                if hasattr(text, "decode"):
+                    text = text.decode("utf-8")
+                stream = StringIO(text)
+                p = parser(stream)
+                p.run(result)
+        else:
+            self.logger.debug(
+                "Unsupported tag <%s> in <hardware>" % node.tag)
 
     def parseLSBRelease(self, result, node):
         """Parse the <lsbrelease> part of a submission."""
@@ -1114,26 +1125,34 @@ class SubmissionParser(object):
     def parsePackages(self, result, node):
         """Parse the <packages> part of a submission."""
         for child in node.getchildren():
-            assert child.tag == "package", \
-                "Unexpected tag <%s>, expected <package>" % child.tag
+            self.parsePackage(result, child)
 
-            package = {
-                "name": child.get("name"),
-                "properties": self._getProperties(child),
-                }
-            result.addPackage(package)
+    def parsePackage(self, result, node):
+        """Parse a <package> of the <packages> part of a submission."""
+        assert node.tag == "package", \
+            "Unexpected tag <%s>, expected <package>" % node.tag
+
+        package = {
+            "name": node.get("name"),
+            "properties": self._getProperties(node),
+            }
+        result.addPackage(package)
 
     def parseSnapPackages(self, result, node):
         """Parse the <snap_packages> part of a submission."""
         for child in node.getchildren():
-            assert child.tag == "snap_package", \
-                "Unexpected tag <%s>, expected <snap_package>" % child.tag
+            self.parseSnapPackage(result, child)
+
+    def parseSnapPackage(self, result, node):
+        """Parse a <snap_package> of the <snap_packages> part."""
+        assert node.tag == "snap_package", \
+            "Unexpected tag <%s>, expected <snap_package>" % node.tag
 
-            snap_package = {
-                "name": child.get("name"),
-                "properties": self._getProperties(child),
-                }
-            result.addSnapPackage(snap_package)
+        snap_package = {
+            "name": node.get("name"),
+            "properties": self._getProperties(node),
+            }
+        result.addSnapPackage(snap_package)
 
     def parseProcessors(self, result, node):
         """Parse the <processors> part of a submission."""
@@ -1176,70 +1195,78 @@ class SubmissionParser(object):
     def parseQuestions(self, result, node):
         """Parse the <questions> part of a submission."""
         for child in node.getchildren():
-            assert child.tag == "question", \
-                "Unexpected tag <%s>, expected <question>" % child.tag
-            question = {
-                "name": child.get("name"),
-                "targets": [],
-                }
-            plugin = child.get("plugin", None)
-            if plugin is not None:
-                question["plugin"] = plugin
-
-            answer_choices = []
-            for sub_node in child.getchildren():
-                sub_tag = sub_node.tag
-                if sub_tag == "answer":
-                    question["answer"] = answer = {}
-                    answer["type"] = sub_node.get("type")
-                    if answer["type"] == "multiple_choice":
-                        question["answer_choices"] = answer_choices
-                    unit = sub_node.get("unit", None)
-                    if unit is not None:
-                        answer["unit"] = unit
-                    answer["value"] = sub_node.text.strip()
-
-                elif sub_tag == "answer_choices":
-                    for value_node in sub_node.getchildren():
-                        answer_choices.append(
-                            self._getValueAsType(value_node))
-
-                elif sub_tag == "target":
-                    # The Relax NG schema ensures that the attribute
-                    # id exists and that it is an integer
-                    target = {"id": int(sub_node.get("id"))}
-                    target["drivers"] = drivers = []
-                    for driver_node in sub_node.getchildren():
-                        drivers.append(driver_node.text.strip())
-                    question["targets"].append(target)
-
-                elif sub_tag in ("comment", "command",):
-                    text = sub_node.text
-                    if text is None:
-                        text = ""
-                    question[sub_tag] = text.strip()
-
-                else:
-                    raise AssertionError(
-                        "Unexpected tag <%s> in <question>" % sub_tag)
-
-            result.addQuestion(question)
+            self.parseQuestion(result, child)
+
+    def parseQuestion(self, result, node):
+        """Parse a <question> of the <questions> part of a submission."""
+        assert node.tag == "question", \
+            "Unexpected tag <%s>, expected <question>" % node.tag
+        question = {
+            "name": node.get("name"),
+            "targets": [],
+            }
+        plugin = node.get("plugin", None)
+        if plugin is not None:
+            question["plugin"] = plugin
+
+        answer_choices = []
+        for sub_node in node.getchildren():
+            sub_tag = sub_node.tag
+            if sub_tag == "answer":
+                question["answer"] = answer = {}
+                answer["type"] = sub_node.get("type")
+                if answer["type"] == "multiple_choice":
+                    question["answer_choices"] = answer_choices
+                unit = sub_node.get("unit", None)
+                if unit is not None:
+                    answer["unit"] = unit
+                answer["value"] = sub_node.text.strip()
+
+            elif sub_tag == "answer_choices":
+                for value_node in sub_node.getchildren():
+                    answer_choices.append(
+                        self._getValueAsType(value_node))
+
+            elif sub_tag == "target":
+                # The Relax NG schema ensures that the attribute
+                # id exists and that it is an integer
+                target = {"id": int(sub_node.get("id"))}
+                target["drivers"] = drivers = []
+                for driver_node in sub_node.getchildren():
+                    drivers.append(driver_node.text.strip())
+                question["targets"].append(target)
+
+            elif sub_tag in ("comment", "command",):
+                text = sub_node.text
+                if text is None:
+                    text = ""
+                question[sub_tag] = text.strip()
+
+            else:
+                raise AssertionError(
+                    "Unexpected tag <%s> in <question>" % sub_tag)
+
+        result.addQuestion(question)
 
     def parseSoftware(self, result, node):
         """Parse the <software> section of a submission."""
+        for child in node.getchildren():
+            self.parseSoftwareChild(result, child)
+
+    def parseSoftwareChild(self, result, node):
+        """Parse an element of the <software> section of a submission."""
         parsers = {
             "lsbrelease": self.parseLSBRelease,
             "packages": self.parsePackages,
             "snap_packages": self.parseSnapPackages,
             }
 
-        for child in node.getchildren():
-            parser = parsers.get(child.tag)
-            if parser:
-                parser(result, child)
-            else:
-                self.logger.debug(
-                    "Unsupported tag <%s> in <software>" % child.tag)
+        parser = parsers.get(node.tag)
+        if parser:
+            parser(result, node)
+        else:
+            self.logger.debug(
+                "Unsupported tag <%s> in <software>" % node.tag)
 
     def parseSummary(self, result, node):
         """Parse the <summary> section of a submission."""
@@ -1301,7 +1328,16 @@ class SubmissionParser(object):
         :returns: a SubmissionResult instance. This is not really used
         and seems redundant, as the data will be processed and stored by
         the TestRun instance (which is, however, also not returned anywhere).
+
+        In incremental mode the stream is parsed as it is read and each
+        part of the submission is thrown away as soon as it's processed,
+        so that big submissions can be parsed with little memory. Note that
+        in this mode the "test_run" object may see parts of a submission
+        that turns out to be invalid XML further down the stream.
         """
+        if self.incremental:
+            return self._runIncremental(test_run_factory, **kwargs)
+
         parser = etree.XMLParser()
 
         tree = etree.parse(self.file, parser=parser)
@@ -1315,6 +1351,65 @@ class SubmissionParser(object):
 
         return result
 
+    def _runIncremental(self, test_run_factory, **kwargs):
+        """Parse the stream incrementally, see run()."""
+        # The children of these elements (by path from the root) are parsed
+        # as soon as they are complete, the other elements are parsed with
+        # all their children, as in parseRoot().
+        duplicates = set()
+        child_parsers = {
+            ("system", "context"):
+                lambda result, node: self.parseInfo(result, node, duplicates),
+            ("system", "hardware"): self.parseHardwareChild,
+            ("system", "questions"): self.parseQuestion,
+            ("system", "software"): self.parseSoftwareChild,
+            ("system", "software", "packages"): self.parsePackage,
+            ("system", "software", "snap_packages"): self.parseSnapPackage,
+            }
+        result = None
+        context_tag = False
+        path = []
+        node_stack = []
+
+        for event, node in etree.iterparse(self.file, ("start", "end")):
+            if event == "start":
+                if result is None:
+                    if node.tag != "system":
+                        raise AssertionError(
+                            "Unexpected tag <%s> at root, expected <system>"
+                            % node.tag)
+                    result = SubmissionResult(test_run_factory, **kwargs)
+                path.append(node.tag)
+                node_stack.append(node)
+                continue
+
+            path.pop()
+            node_stack.pop()
+            parent_path = tuple(path)
+            if parent_path in child_parsers:
+                child_parsers[parent_path](result, node)
+            elif parent_path == ("system",):
+                if node.tag == "context":
+                    context_tag = True
+                    if "lsblk_attachment" not in duplicates:
+                        result.addContext("", "lsblk_attachment")
+                    duplicates.clear()
+                elif node.tag == "summary":
+                    self.parseSummary(result, node)
+                elif node.tag not in ("hardware", "questions", "software"):
+                    self.logger.debug(
+                        "Unsupported tag <%s> in <system>" % node.tag)
+            else:
+                # Part of an element not parsed yet (or the root)
+                continue
+            # Throw away what was just parsed
+            node_stack[-1].remove(node)
+
+        if not context_tag:
+            result.addContext("", "lsblk_attachment")
+
+        return result
+
 
 def parse_submission_text(text):
     """
@@ -548,3 +548,13 @@ class TestSubmissionParser(TestCase):
             test_result["name"], "audio/alsa_record_playback_external")
         self.assertEqual(test_result["output"], "")
         self.assertEqual(test_result["status"], "pass")
+
+
+class TestIncrementalSubmissionParser(TestSubmissionParser):
+
+    def getResult(self, name, project="test"):
+        result = {}
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", name)
+        parser = SubmissionParser(fixture, incremental=True)
+        parser.run(SubmissionRun, result=result, project=project)
+        return result
@@ -27,6 +27,8 @@ from unittest import TestCase
 
 from pkg_resources import resource_filename
 
+from checkbox_support.parsers import udevadm
+from checkbox_support.parsers.udevadm import DevicePathIndex
 from checkbox_support.parsers.udevadm import UdevadmParser, decode_id
 from checkbox_support.parsers.udevadm import parse_udevadm_output
 
@@ -114,6 +116,18 @@ E: SUBSYSTEM=usb
         device = result.getDevice("CAPTURE")
         self.assertTrue(device)
 
+    def test_records_across_chunks(self):
+        text = self.get_text("DELL_IDRAC").replace("\n", "\r\n")
+        expected = [device.as_json() for device in parse_udevadm_output(
+            self.get_text("DELL_IDRAC"))["device_list"]]
+        old_chunk_size = udevadm.CHUNK_SIZE
+        udevadm.CHUNK_SIZE = 7
+        try:
+            devices = parse_udevadm_output(StringIO(text))["device_list"]
+        finally:
+            udevadm.CHUNK_SIZE = old_chunk_size
+        self.assertEqual([device.as_json() for device in devices], expected)
+
     def test_openfirmware_network(self):
         result = self.getResult("""
 P: /devices/soc.0/ffe64000.ethernet
@@ -923,6 +937,42 @@ E: UDEV_LOG=3
                              "Bad product_id for {}".format(device[0]))
 
 
+class TestDevicePathIndex(TestCase):
+
+    def setUp(self):
+        self.index = DevicePathIndex()
+        self.index.add("/devices/pci0000:00/0000:00:1c.0", "a")
+        self.index.add("/devices/pci0000:00/0000:00:1c.0/net/eth0", "b")
+        self.index.add("/devices/pci0000:00/0000:00:1c.1", "c")
+
+    def test_find_prefix(self):
+        self.assertEqual(
+            sorted(self.index.find_prefix("/devices/pci0000:00/0000:00:1c.0")),
+            ["a", "b"])
+        self.assertEqual(
+            sorted(self.index.find_prefix("/devices/pci0000:00/0000:00:1c")),
+            ["a", "b", "c"])
+        self.assertEqual(
+            sorted(self.index.find_prefix("/devices/pci0000:00/")),
+            ["a", "b", "c"])
+        self.assertEqual(
+            self.index.find_prefix("/devices/pci0000:00/0000:00:1c.0/"),
+            ["b"])
+        self.assertEqual(self.index.find_prefix("/devices/virtual"), [])
+
+    def test_has_prefix(self):
+        self.assertTrue(self.index.has_prefix("/devices/pci0000:00/0000"))
+        self.assertFalse(self.index.has_prefix("/devices/pci0000:00/0001"))
+
+    def test_remove(self):
+        self.index.remove("/devices/pci0000:00/0000:00:1c.0/net/eth0", "b")
+        self.assertFalse(
+            self.index.has_prefix("/devices/pci0000:00/0000:00:1c.0/"))
+        self.assertEqual(
+            self.index.find_prefix("/devices/pci0000:00/0000:00:1c.0"),
+            ["a"])
+
+
 class TestDecodeId(TestCase):
 
     def test_string(self):
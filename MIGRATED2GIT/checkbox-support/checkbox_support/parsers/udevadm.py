@@ -22,6 +22,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from collections import OrderedDict
+import functools
 import re
 import string
 
@@ -85,6 +86,40 @@ CARD_READER_RE = re.compile(r"SD|MMC|CF|MS(?!ata)|SM|xD|Card", re.I)
 GENERIC_RE = re.compile(r"Generic", re.I)
 FLASH_RE = re.compile(r"Flash", re.I)
 FLASH_DISK_RE = re.compile(r"Mass|Storage|Disk", re.I)
+# Records are separated by empty lines
+RECORD_SEPARATOR_RE = re.compile(r"\n{2,}")
+# Size of the chunks of text read from udevadm output streams
+CHUNK_SIZE = 64 * 1024
+
+# Generation of the cached device properties, see memoized_property()
+_cache_generation = 0
+
+
+def memoized_property(func):
+    """
+    Cache the value computed by a property of a :class:`UdevadmDevice`.
+
+    Properties of a device also depend on the properties of the devices in
+    its stack, so the cached values of all the devices are thrown away
+    whenever a property of any device is set, see invalidate_properties().
+    """
+    @functools.wraps(func)
+    def wrapper(self):
+        try:
+            generation, value = self._cache[func.__name__]
+        except KeyError:
+            generation = None
+        if generation != _cache_generation:
+            value = func(self)
+            self._cache[func.__name__] = (_cache_generation, value)
+        return value
+    return wrapper
+
+
+def invalidate_properties():
+    """Throw away the cached property values of all the devices."""
+    global _cache_generation
+    _cache_generation += 1
 
 
 def slugify(_string):
@@ -131,7 +166,8 @@ class UdevadmDevice(object):
         "_vendor",
         "_vendor_id",
         "_subvendor_id",
-        "_vendor_slug",)
+        "_vendor_slug",
+        "_cache",)
 
     def __init__(self, environment, name, lsblk=None, bits=None, stack=[]):
         self._environment = environment
@@ -149,6 +185,7 @@ class UdevadmDevice(object):
         self._vendor_id = None
         self._subvendor_id = None
         self._vendor_slug = None
+        self._cache = {}
 
     def __repr__(self):
         vid = int(self.vendor_id) if self.vendor_id else 0
@@ -163,6 +200,7 @@ class UdevadmDevice(object):
             return self._name
 
     @property
+    @memoized_property
     def bus(self):
         if self._bus is not None:
             return self._bus
@@ -187,8 +225,10 @@ class UdevadmDevice(object):
     @bus.setter
     def bus(self, value):
         self._bus = value
+        invalidate_properties()
 
     @property
+    @memoized_property
     def category(self):
         if "IFINDEX" in self._environment:
             if "DEVTYPE" in self._environment:
@@ -550,6 +590,7 @@ class UdevadmDevice(object):
     @product_id.setter
     def product_id(self, value):
         self._product_id = value
+        invalidate_properties()
 
     @property
     def vendor_id(self):
@@ -582,6 +623,7 @@ class UdevadmDevice(object):
     @vendor_id.setter
     def vendor_id(self, value):
         self._vendor_id = value
+        invalidate_properties()
 
     @property
     def subproduct_id(self):
@@ -599,6 +641,7 @@ class UdevadmDevice(object):
     @subproduct_id.setter
     def subproduct_id(self, value):
         self._subproduct_id = value
+        invalidate_properties()
 
     @property
     def subvendor_id(self):
@@ -616,6 +659,7 @@ class UdevadmDevice(object):
     @subvendor_id.setter
     def subvendor_id(self, value):
         self._subvendor_id = value
+        invalidate_properties()
 
     @property
     def product_slug(self):
@@ -638,6 +682,7 @@ class UdevadmDevice(object):
         return None
 
     @property
+    @memoized_property
     def product(self):
         if self._product is not None:
             return self._product
@@ -720,8 +765,10 @@ class UdevadmDevice(object):
     @product.setter
     def product(self, value):
         self._product = value
+        invalidate_properties()
 
     @property
+    @memoized_property
     def vendor(self):
         if self._vendor is not None:
             return self._vendor
@@ -777,6 +824,7 @@ class UdevadmDevice(object):
     @vendor.setter
     def vendor(self, value):
         self._vendor = value
+        invalidate_properties()
 
     @property
     def interface(self):
@@ -801,9 +849,78 @@ class UdevadmDevice(object):
         return {a: getattr(self, a) for a in attributes if getattr(self, a)}
 
 
+class DevicePathIndex(object):
+    """
+    Index of devices by their sysfs path.
+
+    The index is a tree with one node for each component of the paths, so
+    all the devices with paths starting with a given text can be found
+    without looking at the other devices.
+    """
+
+    __slots__ = ("_children", "_devices", "_size")
+
+    def __init__(self):
+        self._children = {}
+        self._devices = []
+        self._size = 0
+
+    def add(self, path, device):
+        """Add a device with the given path."""
+        node = self
+        node._size += 1
+        for component in path.split("/"):
+            child = node._children.get(component)
+            if child is None:
+                child = node._children[component] = DevicePathIndex()
+            node = child
+            node._size += 1
+        node._devices.append(device)
+
+    def remove(self, path, device):
+        """Remove a device previously added with the given path."""
+        node = self
+        node._size -= 1
+        for component in path.split("/"):
+            node = node._children[component]
+            node._size -= 1
+        node._devices.remove(device)
+
+    def _get_prefix_nodes(self, prefix):
+        """Get the nodes of all the paths starting with the given text."""
+        component_list = prefix.split("/")
+        node = self
+        for component in component_list[:-1]:
+            node = node._children.get(component)
+            if node is None or not node._size:
+                return []
+        # The last component may be the beginning of a longer one
+        return [
+            child for component, child in node._children.items()
+            if child._size and component.startswith(component_list[-1])]
+
+    def has_prefix(self, prefix):
+        """Check if there are devices with paths starting with prefix."""
+        return bool(self._get_prefix_nodes(prefix))
+
+    def find_prefix(self, prefix):
+        """Get the devices with paths starting with the given text."""
+        device_list = []
+        node_list = self._get_prefix_nodes(prefix)
+        while node_list:
+            node = node_list.pop()
+            device_list.extend(node._devices)
+            node_list.extend(
+                child for child in node._children.values() if child._size)
+        return device_list
+
+
 class UdevadmParser(object):
     """Parser for the udevadm command."""
 
+    # Categories of devices looked up by path when parsing
+    indexed_categories = ("BLUETOOTH", "CAPTURE", "NETWORK", "WIRELESS")
+
     device_factory = UdevadmDevice
 
     def __init__(self, stream_or_string, lsblk=None, bits=None):
@@ -811,6 +928,13 @@ class UdevadmParser(object):
         self.lsblk = lsblk
         self.bits = bits
         self.devices = OrderedDict()
+        self._index_map = {
+            category: DevicePathIndex()
+            for category in self.indexed_categories}
+        # Position of each path in self.devices
+        self._position_map = {}
+        # Indexed (category, device) pair of each path in self.devices
+        self._indexed_map = {}
 
     def _ignoreDevice(self, device):
         # See http://pad.lv/1559189
@@ -887,6 +1011,51 @@ class UdevadmParser(object):
     def getAttributes(self, path):
         return {}
 
+    def _iter_records(self):
+        """Iterate over the text of each record of the udevadm output."""
+        if isinstance(self.stream_or_string, type("")):
+            chunks = [self.stream_or_string]
+        else:
+            chunks = iter(
+                functools.partial(self.stream_or_string.read, CHUNK_SIZE), "")
+        tail = ""
+        for chunk in chunks:
+            record_list = RECORD_SEPARATOR_RE.split(
+                tail + chunk.replace('\r', ''))  # Just in case...
+            # The last record may continue in the next chunk
+            tail = record_list.pop()
+            for record in record_list:
+                yield record
+        yield tail
+
+    def _has_device(self, category, path_prefix):
+        """Check if a device of a category has a path with the prefix."""
+        return self._index_map[category].has_prefix(path_prefix)
+
+    def _set_device(self, device):
+        """Add or replace a device in self.devices."""
+        path = device._raw_path
+        if path in self.devices:
+            self._unindex_device(path)
+        else:
+            self._position_map[path] = len(self._position_map)
+        self.devices[path] = device
+        category = device.category
+        if category in self._index_map:
+            self._index_map[category].add(path, device)
+            self._indexed_map[path] = (category, device)
+
+    def _pop_device(self, path):
+        """Remove a device from self.devices, if it's there."""
+        if path in self.devices:
+            self._unindex_device(path)
+            del self.devices[path]
+
+    def _unindex_device(self, path):
+        if path in self._indexed_map:
+            category, device = self._indexed_map.pop(path)
+            self._index_map[category].remove(path, device)
+
     def run(self, result):
         # Some attribute lines have a space character after the
         # ':', others don't have it (see udevadm-info.c).
@@ -894,12 +1063,7 @@ class UdevadmParser(object):
         multi_pattern = re.compile(r"(?P<key>[^=]+)=(?P<value>.*)")
 
         stack = []
-        if isinstance(self.stream_or_string, type("")):
-            output = self.stream_or_string
-        else:
-            output = self.stream_or_string.read()
-        output = output.replace('\r', '')  # Just in case...
-        for record in re.split("\n{2,}", output):
+        for record in self._iter_records():
             record = record.strip()
             if not record:
                 continue
@@ -954,52 +1118,47 @@ class UdevadmParser(object):
                             if getattr(device, device_key) is not None
                         ]
                     elif device.category != "OTHER":
-                        self.devices[device._raw_path] = device
+                        self._set_device(device)
                 elif device.category == 'BLUETOOTH':
                     usb_interface_path = USB_SYSFS_CONFIG_RE.sub(
                         '', device._raw_path)
-                    if not [
-                        d for d in self.devices.values()
-                        if d.category == 'BLUETOOTH' and
-                        usb_interface_path in d._raw_path
-                    ]:
-                        self.devices[device._raw_path] = device
+                    if not self._has_device('BLUETOOTH', usb_interface_path):
+                        self._set_device(device)
                 elif device.category == 'CAPTURE':
                     input_id = INPUT_SYSFS_ID.sub('', device._raw_path)
-                    if [
-                        d for d in self.devices.values()
-                        if d.category == 'CAPTURE' and input_id in d._raw_path
-                    ]:
+                    if self._has_device('CAPTURE', input_id):
                         self.devices[input_id].product = device.product
                     else:
                         usb_interface_path = USB_SYSFS_CONFIG_RE.sub(
                             '', device._raw_path)
-                        if not [
-                            d for d in self.devices.values()
-                            if d.category == 'CAPTURE' and
-                            usb_interface_path in d._raw_path
-                        ]:
-                            self.devices[device._raw_path] = device
+                        if not self._has_device(
+                                'CAPTURE', usb_interface_path):
+                            self._set_device(device)
                 else:
-                    self.devices[device._raw_path] = device
+                    self._set_device(device)
             stack.append(device)
 
         for device in list(self.devices.values()):
             if device.category in ("NETWORK", "WIRELESS", "OTHER"):
+                # The network interfaces below this device, as sysfs paths
+                # always start with "/devices/" matching a prefix is the
+                # same as looking for a substring.
                 dev_interface = [
-                    d for d in self.devices.values()
-                    if d.category in ("NETWORK", "WIRELESS") and
-                    device._raw_path != d._raw_path and
-                    device._raw_path in d._raw_path
+                    d for category in ("NETWORK", "WIRELESS")
+                    for d in self._index_map[category].find_prefix(
+                        device._raw_path)
+                    if device._raw_path != d._raw_path
                 ]
                 if dev_interface:
-                    dev_interface = dev_interface.pop()
+                    dev_interface = max(
+                        dev_interface,
+                        key=lambda d: self._position_map[d._raw_path])
                     dev_interface.bus = device.bus
                     dev_interface.product_id = device.product_id
                     dev_interface.vendor_id = device.vendor_id
                     dev_interface.subproduct_id = device.subproduct_id
                     dev_interface.subvendor_id = device.subvendor_id
-                    self.devices.pop(device._raw_path, None)
+                    self._pop_device(device._raw_path)
 
         [result.addDevice(device) for device in self.devices.values()]
 
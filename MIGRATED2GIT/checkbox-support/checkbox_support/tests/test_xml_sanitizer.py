@@ -0,0 +1,70 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+checkbox_support.tests.test_xml_sanitizer
+=========================================
+
+Tests for checkbox_support.helpers.xml_sanitizer module
+"""
+
+import io
+import unittest
+
+from checkbox_support.helpers.xml_sanitizer import iter_sanitized_xml_chunks
+from checkbox_support.helpers.xml_sanitizer import sanitize_xml_stream
+from checkbox_support.helpers.xml_sanitizer import sanitize_xml_text
+
+
+class SanitizeXMLTextTests(unittest.TestCase):
+
+    def test_valid_text(self):
+        text = "tab\tnewline\nreturn\rüñíçødé € \U0001f600"
+        self.assertEqual(sanitize_xml_text(text), text)
+
+    def test_control_characters(self):
+        self.assertEqual(
+            sanitize_xml_text("\x00a\x08b\x0b\x0cc\x1f"), "abc")
+
+    def test_range_boundaries(self):
+        valid = "\x20\ud7ff\ue000\ufffd\U00010000\U0010ffff"
+        self.assertEqual(sanitize_xml_text(valid), valid)
+        self.assertEqual(
+            sanitize_xml_text("\x1f\ud800\udfff\ufffe\uffff"), "")
+
+    def test_matches_xml_specification(self):
+        def is_valid(c):
+            return (c in (0x9, 0xA, 0xD) or 0x20 <= c <= 0xD7FF or
+                    0xE000 <= c <= 0xFFFD or 0x10000 <= c <= 0x10FFFF)
+        text = ''.join(chr(c) for c in range(0x11000))
+        self.assertEqual(
+            sanitize_xml_text(text),
+            ''.join(chr(c) for c in range(0x11000) if is_valid(c)))
+
+
+class SanitizeXMLStreamTests(unittest.TestCase):
+
+    def test_iter_sanitized_xml_chunks(self):
+        stream = io.StringIO("ab\x00\x00cd\x01\x02\x03\x04e")
+        self.assertEqual(
+            list(iter_sanitized_xml_chunks(stream, chunk_size=2)),
+            ["ab", "cd", "e"])
+
+    def test_sanitize_xml_stream(self):
+        text = "\x00line\x07\n" * 1000
+        out_stream = io.StringIO()
+        sanitize_xml_stream(io.StringIO(text), out_stream, chunk_size=7)
+        self.assertEqual(out_stream.getvalue(), "line\n" * 1000)
@@ -302,6 +302,8 @@ man_pages = [
      'log messages at various levels', _authors, 1),
     ('manpages/plainbox-dev-list', 'plainbox-dev-list',
      'list and describe various objects', _authors, 1),
+    ('manpages/plainbox-dev-unit-cache', 'plainbox-dev-unit-cache',
+     'inspect the cache of parsed unit files', _authors, 1),
     ('manpages/plainbox-device', 'plainbox-device',
      'device management commands', _authors, 1),
     ('manpages/plainbox-qml-shell', 'plainbox-qml-shell',
@@ -0,0 +1,44 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+"""
+:mod:`plainbox.impl.commands.cmd_unit_cache` -- unit-cache sub-command
+======================================================================
+"""
+from plainbox.i18n import gettext as _
+from plainbox.impl.commands import PlainBoxCommand
+
+
+class UnitCacheCommand(PlainBoxCommand):
+    """
+    Implementation of ``$ plainbox dev unit-cache``
+    """
+
+    def __init__(self, provider_loader):
+        self.provider_loader = provider_loader
+
+    def invoked(self, ns):
+        from plainbox.impl.commands.inv_unit_cache import (
+            UnitCacheInvocation)
+        return UnitCacheInvocation(self.provider_loader, ns).run()
+
+    def register_parser(self, subparsers):
+        parser = subparsers.add_parser(
+            "unit-cache", help=_("inspect the cache of parsed unit files"),
+            prog="plainbox dev unit-cache")
+        parser.add_argument(
+            '--clear', default=False, action="store_true",
+            help=_("remove all cached data before loading providers"))
+        parser.set_defaults(command=self)
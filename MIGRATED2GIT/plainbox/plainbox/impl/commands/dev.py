@@ -35,6 +35,7 @@ from plainbox.impl.commands.logtest import LogTestCommand
 from plainbox.impl.commands.cmd_parse import ParseCommand
 from plainbox.impl.commands.cmd_script import ScriptCommand
 from plainbox.impl.commands.cmd_special import SpecialCommand
+from plainbox.impl.commands.cmd_unit_cache import UnitCacheCommand
 
 
 logger = getLogger("plainbox.commands.dev")
@@ -68,3 +69,4 @@ class DevCommand(PlainBoxCommand):
         CrashCommand().register_parser(subdev)
         LogTestCommand().register_parser(subdev)
         ListCommand(self.provider_loader).register_parser(subdev)
+        UnitCacheCommand(self.provider_loader).register_parser(subdev)
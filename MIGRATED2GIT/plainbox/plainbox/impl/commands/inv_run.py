@@ -503,14 +503,13 @@ class RunInvocation(CheckBoxInvocationMixIn):
         """
         storage_list = []
         for storage in SessionStorageRepository().get_storage_list():
-            data = storage.load_checkpoint()
-            if len(data) == 0:
-                continue
             try:
-                metadata = SessionPeekHelper().peek(data)
+                metadata = SessionPeekHelper().peek_storage(storage)
             except SessionResumeError as exc:
                 logger.warning(_("Corrupted session %s: %s"), storage.id, exc)
             else:
+                if metadata is None:
+                    continue
                 if (metadata.app_id == self.expected_app_id
                         and metadata.title == self.expected_session_title
                         and SessionMetaData.FLAG_INCOMPLETE in metadata.flags):
@@ -72,9 +72,8 @@ class SessionInvocation:
             if self.ns.only_ids:
                 print(storage.id)
                 continue
-            data = storage.load_checkpoint()
-            if len(data) > 0:
-                metadata = SessionPeekHelper().peek(data)
+            metadata = SessionPeekHelper().peek_storage(storage)
+            if metadata is not None:
                 print(_("session {0} app:{1}, flags:{2!r}, title:{3!r}")
                       .format(storage.id, metadata.app_id,
                               sorted(metadata.flags), metadata.title))
@@ -100,10 +99,9 @@ class SessionInvocation:
             else:
                 print("[{}]".format(session_id))
                 print(_("location:"), storage.location)
-                data = storage.load_checkpoint()
-                if len(data) == 0:
+                metadata = SessionPeekHelper().peek_storage(storage)
+                if metadata is None:
                     continue
-                metadata = SessionPeekHelper().peek(data)
                 print(_("application ID: {0!r}").format(metadata.app_id))
                 print(_("application-specific blob: {0}").format(
                     b64encode(metadata.app_blob).decode('ASCII')
@@ -112,7 +110,8 @@ class SessionInvocation:
                 print(_("session flags: {0!r}").format(sorted(metadata.flags)))
                 print(_("current job ID: {0!r}").format(
                     metadata.running_job_name))
-                print(_("data size: {0}").format(len(data)))
+                print(_("data size: {0}").format(
+                    storage.get_checkpoint_size()))
                 if self.ns.resume:
                     print(_("Resuming session {0} ...").format(storage.id))
                     try:
@@ -0,0 +1,66 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+"""
+:mod:`plainbox.impl.commands.inv_unit_cache` -- unit-cache sub-command
+======================================================================
+"""
+from plainbox.i18n import gettext as _
+from plainbox.impl.secure.plugins import now
+
+
+class UnitCacheInvocation:
+    """
+    Load all of the providers and show how well the unit cache worked.
+
+    Since providers load their content on demand, the hits and misses counted
+    while each provider is loading belong to that provider.
+    """
+
+    def __init__(self, provider_loader, ns):
+        self.provider_list = provider_loader()
+        self.clear = ns.clear
+
+    def run(self):
+        cache_list = []
+        for provider in self.provider_list:
+            cache = getattr(provider, 'unit_cache', None)
+            if cache is not None and cache not in cache_list:
+                cache_list.append(cache)
+        if self.clear:
+            for cache in cache_list:
+                cache.clear()
+        for provider in self.provider_list:
+            cache = getattr(provider, 'unit_cache', None)
+            if cache is None:
+                hit_count = miss_count = 0
+            else:
+                hit_count, miss_count = cache.hit_count, cache.miss_count
+            start = now()
+            provider.unit_list
+            load_time = now() - start
+            if cache is not None:
+                hit_count = cache.hit_count - hit_count
+                miss_count = cache.miss_count - miss_count
+                print(_("{}: {} hit(s), {} miss(es), {:.3f}s").format(
+                    provider.name, hit_count, miss_count, load_time))
+            else:
+                print(_("{}: not cached, {:.3f}s").format(
+                    provider.name, load_time))
+        for cache in cache_list:
+            print(_("{}: {} hit(s), {} miss(es)").format(
+                cache.location or _("(disabled)"),
+                cache.hit_count, cache.miss_count))
+        return 0
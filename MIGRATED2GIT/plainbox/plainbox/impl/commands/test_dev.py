@@ -60,7 +60,7 @@ class TestDevCommand(TestCase):
                 usage: plainbox dev <subcommand> ...
 
                 positional arguments:
-                  {script,special,analyze,parse,crash,logtest,list}
+                  {script,special,analyze,parse,crash,logtest,list,unit-cache}
                     script              run a command from a job
                     special             special/internal commands
                     analyze             analyze how selected jobs would be executed
@@ -68,6 +68,7 @@ class TestDevCommand(TestCase):
                     crash               crash the application
                     logtest             log messages at various levels
                     list                list and describe various objects
+                    unit-cache          inspect the cache of parsed unit files
 
                 optional arguments:
                   -h, --help            show this help message and exit
@@ -0,0 +1,88 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+plainbox.impl.commands.test_inv_session
+=======================================
+
+Test definitions for plainbox.impl.commands.inv_session module
+"""
+
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import argparse
+import os
+
+from plainbox.impl.commands.inv_session import SessionInvocation
+from plainbox.impl.session import SessionManager
+from plainbox.impl.session import SessionStorageRepository
+from plainbox.impl.testing_utils import make_job
+from plainbox.vendor import mock
+
+
+class SessionInvocationTests(TestCase):
+
+    def setUp(self):
+        self.scratch_dir = TemporaryDirectory()
+        self.addCleanup(self.scratch_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {
+            'PLAINBOX_SESSION_REPOSITORY': self.scratch_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Create and suspend a session with a job in it
+        self.manager = SessionManager.create(SessionStorageRepository())
+        self.manager.add_local_device_context()
+        self.manager.default_device_context.add_unit(make_job('job-a'))
+        metadata = self.manager.state.metadata
+        metadata.title = 'title'
+        metadata.flags = {'incomplete'}
+        metadata.app_id = 'app-id'
+        metadata.running_job_name = 'job-a'
+        self.manager.checkpoint()
+
+    def _show(self, session_id, resume=False):
+        ns = argparse.Namespace(
+            session_cmd='show', default_session_cmd='list',
+            session_id_list=[session_id],
+            resume=resume, flag=[])
+        provider = mock.Mock(unit_list=[make_job('job-a')])
+        provider_loader = mock.Mock(return_value=[provider])
+        with mock.patch('sys.stdout', new_callable=StringIO) as stdout:
+            SessionInvocation(ns, provider_loader).run()
+        return stdout.getvalue()
+
+    def test_show_session(self):
+        storage = self.manager.storage
+        output = self._show(storage.id)
+        self.assertEqual(output.splitlines(), [
+            "[{}]".format(storage.id),
+            "location: {}".format(storage.location),
+            "application ID: 'app-id'",
+            "application-specific blob: None",
+            "session title: 'title'",
+            "session flags: ['incomplete']",
+            "current job ID: 'job-a'",
+            "data size: {}".format(storage.get_checkpoint_size()),
+        ])
+        self.assertNotEqual(storage.get_checkpoint_size(), 0)
+
+    def test_show_session__missing(self):
+        self.assertEqual(self._show('missing'), "No such session missing\n")
+
+    def test_show_session__resume(self):
+        output = self._show(self.manager.storage.id, resume=True)
+        self.assertIn("session resumed successfully", output)
@@ -40,7 +40,6 @@ try:
     import grp
 except ImportError:
     grp = None
-import itertools
 import json
 import logging
 import os
@@ -57,11 +56,8 @@ from plainbox.abc import IJobResult
 from plainbox.abc import ISessionStateController
 from plainbox.i18n import gettext as _
 from plainbox.impl import get_plainbox_dir
-from plainbox.impl.depmgr import DependencyDuplicateError
-from plainbox.impl.depmgr import DependencyMissingError
 from plainbox.impl.resource import ExpressionCannotEvaluateError
 from plainbox.impl.resource import ExpressionFailedError
-from plainbox.impl.resource import ResourceProgramError
 from plainbox.impl.resource import Resource
 from plainbox.impl.secure.config import Unset
 from plainbox.impl.secure.origin import JobOutputTextSource
@@ -124,21 +120,10 @@ class CheckBoxSessionStateController(ISessionStateController):
         dependencies of the specified job. The first element in the pair,
         dep_type, is either DEP_TYPE_DIRECT, DEP_TYPE_ORDERING or
         DEP_TYPE_RESOURCE. The second element is the id of the job.
+
+        The set is a frozenset, computed once for each job.
         """
-        direct = DependencyMissingError.DEP_TYPE_DIRECT
-        ordering = DependencyMissingError.DEP_TYPE_ORDERING
-        resource = DependencyMissingError.DEP_TYPE_RESOURCE
-        direct_deps = job.get_direct_dependencies()
-        after_deps = job.get_after_dependencies()
-        try:
-            resource_deps = job.get_resource_dependencies()
-        except ResourceProgramError:
-            resource_deps = ()
-        result = set(itertools.chain(
-            zip(itertools.repeat(direct), direct_deps),
-            zip(itertools.repeat(resource), resource_deps),
-            zip(itertools.repeat(ordering), after_deps)))
-        return result
+        return job.get_dependencies().dependency_set
 
     def get_inhibitor_list(self, session_state, job):
         """
@@ -197,7 +182,8 @@ class CheckBoxSessionStateController(ISessionStateController):
                         related_expression=exc.expression)
                     inhibitors.append(inhibitor)
         # Check if all job dependencies ran successfully
-        for dep_id in sorted(job.get_direct_dependencies()):
+        dependencies = job.get_dependencies()
+        for dep_id in sorted(dependencies.direct):
             dep_job_state = session_state.job_state_map[dep_id]
             # If the dependency did not have a chance to run yet add the
             # PENDING_DEP inhibitor.
@@ -217,7 +203,7 @@ class CheckBoxSessionStateController(ISessionStateController):
                     related_job=dep_job_state.job)
                 inhibitors.append(inhibitor)
         # Check if all "after" dependencies ran yet
-        for dep_id in sorted(job.get_after_dependencies()):
+        for dep_id in sorted(dependencies.after):
             dep_job_state = session_state.job_state_map[dep_id]
             # If the dependency did not have a chance to run yet add the
             # PENDING_DEP inhibitor.
@@ -309,6 +295,7 @@ class CheckBoxSessionStateController(ISessionStateController):
         for unit in session_state.unit_list:
             if isinstance(unit, TemplateUnit) and unit.resource_id == job.id:
                 logger.info(_("Instantiating unit: %s"), unit)
+                new_unit_list = []
                 for new_unit in unit.instantiate_all(
                         session_state.resource_map[job.id]):
                     check_result = new_unit.check()
@@ -318,11 +305,14 @@ class CheckBoxSessionStateController(ISessionStateController):
                         logger.error(_("Ignoring invalid generated job %s"),
                                      new_unit.id)
                     else:
-                        session_state.add_unit(new_unit)
-                        if new_unit.Meta.name == 'job':
-                            job_state = session_state.job_state_map[
-                                new_unit.id]
-                            job_state.via_job = job
+                        new_unit_list.append(new_unit)
+                # Add all the units generated by this template at once so that
+                # job readiness is only recomputed once.
+                session_state.add_units(new_unit_list)
+                for new_unit in new_unit_list:
+                    if new_unit.Meta.name == 'job':
+                        job_state = session_state.job_state_map[new_unit.id]
+                        job_state.via_job = job
 
     def _process_local_result(self, session_state, job, result):
         """
@@ -345,49 +335,49 @@ class CheckBoxSessionStateController(ISessionStateController):
                              new_job.id)
             else:
                 new_job_list.append(new_job)
-        # Then for each new job, add it to the job_list, unless it collides
-        # with another job with the same id.
-        for new_job in new_job_list:
-            try:
-                added_unit = session_state.add_unit(new_job, recompute=False)
-            except DependencyDuplicateError as exc:
-                # XXX: there should be a channel where such errors could be
-                # reported back to the UI layer. Perhaps update_job_result()
-                # could simply return a list of problems in a similar manner
-                # how update_desired_job_list() does.
-                logger.warning(
-                    # TRANSLATORS: keep the word "local" untranslated. It is a
-                    # special type of job that needs to be distinguished.
-                    _("Local job %s produced job %s that collides with"
-                      " an existing job %s (from %s), the new job was"
-                      " discarded"),
-                    job.id, exc.duplicate_job.id, exc.job.id, exc.job.origin)
-            else:
-                # Set the via_job attribute of the newly added job to point to
-                # the generator job. This way it can be traced back to the old
-                # __category__-style local jobs or to their corresponding
-                # generator job in general.
-                #
-                # NOTE: this is the only place where we assign via_job so as
-                # long as that holds true, we can detect and break via cycles.
-                #
-                # Via cycles occur whenever a job can reach itself again
-                # through via associations. Note that the chain may be longer
-                # than one link (A->A) and can include other jobs in the list
-                # (A->B->C->A)
-                #
-                # To detect a cycle we must iterate back the via chain (and we
-                # must do it here because we have access to job_state_map that
-                # allows this iteration to happen) and break the cycle if we
-                # see the job being added.
-                job_state_map = session_state.job_state_map
-                job_state_map[added_unit.id].via_job = job
-                via_cycle = get_via_cycle(job_state_map, added_unit)
-                if via_cycle:
-                    logger.warning(_("Automatically breaking via-cycle: %s"),
-                                   ' -> '.join(str(cycle_job)
-                                               for cycle_job in via_cycle))
-                    job_state_map[added_unit.id].via_job = None
+        # Then add all the new jobs to the job_list, unless they collide with
+        # other jobs with the same id.
+        problem_list = []
+        added_unit_list = session_state.add_units(
+            new_job_list, recompute=False, problem_list=problem_list)
+        for exc in problem_list:
+            # XXX: there should be a channel where such errors could be
+            # reported back to the UI layer. Perhaps update_job_result()
+            # could simply return a list of problems in a similar manner
+            # how update_desired_job_list() does.
+            logger.warning(
+                # TRANSLATORS: keep the word "local" untranslated. It is a
+                # special type of job that needs to be distinguished.
+                _("Local job %s produced job %s that collides with"
+                  " an existing job %s (from %s), the new job was"
+                  " discarded"),
+                job.id, exc.duplicate_job.id, exc.job.id, exc.job.origin)
+        job_state_map = session_state.job_state_map
+        for added_unit in added_unit_list:
+            # Set the via_job attribute of the newly added job to point to
+            # the generator job. This way it can be traced back to the old
+            # __category__-style local jobs or to their corresponding
+            # generator job in general.
+            #
+            # NOTE: this is the only place where we assign via_job so as
+            # long as that holds true, we can detect and break via cycles.
+            #
+            # Via cycles occur whenever a job can reach itself again
+            # through via associations. Note that the chain may be longer
+            # than one link (A->A) and can include other jobs in the list
+            # (A->B->C->A)
+            #
+            # To detect a cycle we must iterate back the via chain (and we
+            # must do it here because we have access to job_state_map that
+            # allows this iteration to happen) and break the cycle if we
+            # see the job being added.
+            job_state_map[added_unit.id].via_job = job
+            via_cycle = get_via_cycle(job_state_map, added_unit)
+            if via_cycle:
+                logger.warning(_("Automatically breaking via-cycle: %s"),
+                               ' -> '.join(str(cycle_job)
+                                           for cycle_job in via_cycle))
+                job_state_map[added_unit.id].via_job = None
 
 
 def get_via_cycle(job_state_map, job):
@@ -279,7 +279,9 @@ class DependencySolver:
     Dependency solver for Jobs.
 
     Uses a simple depth-first search to discover the sequence of jobs that can
-    run. Use the resolve_dependencies() class method to get the solution.
+    run. Use the resolve_dependencies() class method to get the solution or
+    the resolve_dependencies_with_recovery() class method to get the solution
+    along with all of the problems that had to be worked around to find it.
     """
 
     COLOR_WHITE = Color.WHITE
@@ -307,23 +309,61 @@ class DependencySolver:
         """
         return cls(job_list)._solve(visit_list)
 
-    def __init__(self, job_list):
+    @classmethod
+    def resolve_dependencies_with_recovery(cls, job_list, visit_list=None):
+        """
+        Solve the dependency graph, working around any problems found.
+
+        :param list job_list: list of known jobs
+        :param list visit_list: (optional) list of jobs to solve
+        :returns:
+            A tuple (solution, problem_list, visit_list) with the solution (a
+            list of jobs to execute in order), the list of problems (all
+            instances of DependencyError) and what is left of the visit list
+            once the jobs affected by those problems are removed from it.
+
+        This method never raises DependencyError. Instead, the job affected by
+        each problem is removed from both lists, along with all the jobs that
+        depend on it (each such job is reported with a separate
+        DependencyMissingError). The outcome is the same as calling
+        :meth:`resolve_dependencies()` in a loop, removing the affected job of
+        each error that is raised, until no more errors are raised but the
+        solver never has to start over.
+        """
+        problem_list = []
+        solver = cls(job_list, problem_list)
+        solution, visit_list = solver._solve_with_recovery(
+            visit_list, problem_list)
+        return solution, problem_list, visit_list
+
+    def __init__(self, job_list, problem_list=None):
         """
         Instantiate a new dependency solver with the specified list of jobs.
 
+        :param job_list:
+            List of known jobs
+        :param problem_list:
+            (optional) List where duplicate jobs are recorded, as
+            DependencyDuplicateError instances, instead of being raised
         :raises DependencyDuplicateError:
             if the initial job_list has any duplicate jobs
         """
         # Remember the jobs that were passed
         self._job_list = job_list
         # Build a map of jobs (by id)
-        self._job_map = self._get_job_map(job_list)
+        self._job_map = self._get_job_map(job_list, problem_list)
         # Job colors, maps from job.id to COLOR_xxx
-        self._job_color_map = {job.id: self.COLOR_WHITE for job in job_list}
+        self._job_color_map = {
+            job_id: self.COLOR_WHITE for job_id in self._job_map}
         # The computed solution, made out of job instances. This is not
         # necessarily the only solution but the algorithm computes the same
         # value each time, given the same input.
         self._solution = []
+        # The path of jobs that are being visited (from the job on the visit
+        # list to the deepest dependency) and the type of each dependency on
+        # that path.
+        self._trail = []
+        self._trail_dep_types = []
 
     def _solve(self, visit_list=None):
         """
@@ -345,76 +385,181 @@ class DependencySolver:
         # Return the solution
         return self._solution
 
-    def _visit(self, job, trail=None):
+    def _solve_with_recovery(self, visit_list, problem_list):
+        """
+        Internal method of DependencySolver.
+
+        Solves the dependency graph, recording and working around each
+        problem, and returns the solution along with the remaining part of the
+        visit list.
+
+        Calls _visit() on each of the initial nodes/jobs. When that fails
+        everything that was done while visiting that job is undone, the
+        affected jobs are forgotten and the solver moves on to the next job.
+        This gives the same solution as starting from scratch would.
+        """
+        logger.debug(_("Starting solve"))
+        logger.debug(_("Solver job list: %r"), self._job_list)
+        logger.debug(_("Solver visit list: %r"), visit_list)
+        if visit_list is None:
+            visit_list = self._job_list
+        remaining_visit_list = []
+        # Number of upcoming occurrences of each job that must be dropped
+        # from the visit list as the job was removed because of a problem.
+        drop_count_map = {}
+        for problem in problem_list:
+            self._count_drop(drop_count_map, problem.affected_job)
+        for job in visit_list:
+            if drop_count_map and drop_count_map.get(job):
+                drop_count_map[job] -= 1
+                continue
+            solution_len = len(self._solution)
+            try:
+                self._visit(job)
+            except DependencyError as exc:
+                for problem in self._get_problems(exc):
+                    logger.debug(_("Recovering from problem: %s"), problem)
+                    problem_list.append(problem)
+                    self._forget(problem.affected_job)
+                    if problem.affected_job is not job:
+                        self._count_drop(drop_count_map, problem.affected_job)
+                # Anything visited by now needs to be visited again, if it is
+                # reachable from some other job.
+                for other_job in self._trail + self._solution[solution_len:]:
+                    if other_job.id in self._job_color_map:
+                        self._job_color_map[other_job.id] = self.COLOR_WHITE
+                del self._solution[solution_len:]
+            else:
+                remaining_visit_list.append(job)
+        logger.debug(_("Done solving"))
+        return self._solution, remaining_visit_list
+
+    def _get_problems(self, exc):
+        """
+        Internal method of DependencySolver.
+
+        Computes the list of problems caused by the given error. Apart from
+        the error itself each job on the trail that leads to the affected job
+        is now missing a dependency.
+        """
+        problem_list = [exc]
+        if isinstance(exc, DependencyMissingError):
+            index = len(self._trail) - 1
+        elif isinstance(exc, DependencyCycleError):
+            index = len(self._trail) - len(exc.job_list) + 1
+        else:
+            index = 0
+        for index in range(index, 0, -1):
+            problem_list.append(DependencyMissingError(
+                self._trail[index - 1], self._trail[index].id,
+                self._trail_dep_types[index - 1]))
+        return problem_list
+
+    def _forget(self, job):
         """
         Internal method of DependencySolver.
 
-        Called each time a node is visited. Nodes already seen in _visited are
-        skipped. Attempts to enumerate all dependencies (both direct and
-        resource) and resolve them. Missing jobs cause DependencyMissingError
-        to be raised. Calls _visit recursively on all dependencies.
+        Removes a job from the graph, if it is there.
         """
+        known_job = self._job_map.get(job.id)
+        if known_job is job or (known_job is not None and known_job == job):
+            del self._job_map[job.id]
+            del self._job_color_map[job.id]
+
+    @staticmethod
+    def _count_drop(drop_count_map, job):
+        drop_count_map[job] = drop_count_map.get(job, 0) + 1
+
+    def _visit(self, job):
+        """
+        Internal method of DependencySolver.
+
+        Called each time a node is visited. Nodes already seen are skipped.
+        Attempts to enumerate all dependencies (both direct and resource) and
+        resolve them, depth first. Missing jobs cause DependencyMissingError
+        to be raised.
+
+        The graph is traversed with an explicit stack so that long chains of
+        dependencies are not limited by the recursion limit. The path to the
+        node that is being visited is kept in _trail.
+        """
+        self._trail = trail = []
+        self._trail_dep_types = trail_dep_types = []
+        job_map = self._job_map
+        color_map = self._job_color_map
         try:
-            color = self._job_color_map[job.id]
+            color = color_map[job.id]
         except KeyError:
             logger.debug(_("Visiting job that's not on the job_list: %r"), job)
             raise DependencyUnknownError(job)
         logger.debug(_("Visiting job %s (color %s)"), job.id, color)
-        if color == self.COLOR_WHITE:
-            # This node has not been visited yet. Let's mark it as GRAY (being
-            # visited) and iterate through the list of dependencies
-            self._job_color_map[job.id] = self.COLOR_GRAY
-            # If the trail was not specified start a trail for this node
-            if trail is None:
-                trail = [job]
-            for dep_type, job_id in job.controller.get_dependency_set(job):
+        if color is not self.COLOR_WHITE:
+            # This node has been visited and is fully traced.
+            # We can just skip it and go back
+            return
+        # This node has not been visited yet. Let's mark it as GRAY (being
+        # visited) and iterate through the list of dependencies
+        color_map[job.id] = self.COLOR_GRAY
+        trail.append(job)
+        dep_iter_stack = [iter(job.controller.get_dependency_set(job))]
+        while dep_iter_stack:
+            for dep_type, job_id in dep_iter_stack[-1]:
                 # Dependency is just an id, we need to resolve it
                 # to a job instance. This can fail (missing dependencies)
                 # so let's guard against that.
                 try:
-                    next_job = self._job_map[job_id]
+                    next_job = job_map[job_id]
                 except KeyError:
                     logger.debug(_("Found missing dependency: %r from %r"),
-                                 job_id, job)
-                    raise DependencyMissingError(job, job_id, dep_type)
-                else:
-                    # For each dependency that we visit let's reuse the trail
-                    # to give proper error messages if a dependency loop exists
+                                 job_id, trail[-1])
+                    raise DependencyMissingError(trail[-1], job_id, dep_type)
+                color = color_map[job_id]
+                if color is self.COLOR_WHITE:
+                    # Visit this dependency before looking at the remaining
+                    # dependencies of the current node.
                     logger.debug(_("Visiting dependency: %r"), next_job)
-                    # Update the trail as we visit that node
+                    color_map[job_id] = self.COLOR_GRAY
                     trail.append(next_job)
-                    self._visit(next_job, trail)
-                    trail.pop()
-            # We've visited (recursively) all dependencies of this node,
-            # let's color it black and append it to the solution list.
-            logger.debug(_("Appending %r to solution"), job)
-            self._job_color_map[job.id] = self.COLOR_BLACK
-            self._solution.append(job)
-        elif color == self.COLOR_GRAY:
-            # This node is not fully traced yet but has been visited already
-            # so we've found a dependency loop. We need to cut the initial
-            # part of the trail so that we only report the part that actually
-            # forms a loop
-            trail = trail[trail.index(job):]
-            logger.debug(_("Found dependency cycle: %r"), trail)
-            raise DependencyCycleError(trail)
-        else:
-            assert color == self.COLOR_BLACK
-            # This node has been visited and is fully traced.
-            # We can just skip it and go back
+                    trail_dep_types.append(dep_type)
+                    dep_iter_stack.append(iter(
+                        next_job.controller.get_dependency_set(next_job)))
+                    break
+                elif color is self.COLOR_GRAY:
+                    # This node is not fully traced yet but has been visited
+                    # already so we've found a dependency loop. We need to
+                    # cut the initial part of the trail so that we only
+                    # report the part that actually forms a loop
+                    cycle = trail[trail.index(next_job):]
+                    cycle.append(next_job)
+                    logger.debug(_("Found dependency cycle: %r"), cycle)
+                    raise DependencyCycleError(cycle)
+            else:
+                # We've visited all dependencies of this node, let's color it
+                # black and append it to the solution list.
+                dep_iter_stack.pop()
+                done_job = trail.pop()
+                if trail_dep_types:
+                    trail_dep_types.pop()
+                logger.debug(_("Appending %r to solution"), done_job)
+                color_map[done_job.id] = self.COLOR_BLACK
+                self._solution.append(done_job)
 
     @staticmethod
-    def _get_job_map(job_list):
+    def _get_job_map(job_list, problem_list=None):
         """
         Internal method of DependencySolver.
 
         Computes a map of job.id => job
-        Raises DependencyDuplicateError if a collision is found
+        Raises DependencyDuplicateError if a collision is found, unless a list
+        of problems is provided. In that case the error is appended to it and
+        the job that was seen later replaces the earlier one.
         """
         job_map = {}
         for job in job_list:
             if job.id in job_map:
-                raise DependencyDuplicateError(job_map[job.id], job)
-            else:
-                job_map[job.id] = job
+                exc = DependencyDuplicateError(job_map[job.id], job)
+                if problem_list is None:
+                    raise exc
+                problem_list.append(exc)
+            job_map[job.id] = job
         return job_map
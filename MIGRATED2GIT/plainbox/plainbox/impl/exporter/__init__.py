@@ -27,12 +27,15 @@
 """
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import RawIOBase
 from logging import getLogger
 import base64
+import time
 
 from plainbox.i18n import gettext as _
 from plainbox.abc import ISessionStateExporter
+from plainbox.impl.result import IOLogCache
 
 logger = getLogger("plainbox.exporter")
 
@@ -293,17 +296,8 @@ class SessionStateExporterBase(ISessionStateExporter):
 
             # Add IO log if requested
             if self.OPTION_WITH_IO_LOG in self._option_list:
-                # If requested, squash the IO log so that only textual data is
-                # saved, discarding stream name and the relative timestamp.
-                if self.OPTION_SQUASH_IO_LOG in self._option_list:
-                    io_log_data = self._squash_io_log(
-                        job_state.result.get_io_log())
-                elif self.OPTION_FLATTEN_IO_LOG in self._option_list:
-                    io_log_data = self._flatten_io_log(
-                        job_state.result.get_io_log())
-                else:
-                    io_log_data = self._io_log(job_state.result.get_io_log())
-                data['result_map'][job_id]['io_log'] = io_log_data
+                data['result_map'][job_id]['io_log'] = self._get_io_log_data(
+                    job_state.result)
 
             # Add certification status if requested
             if self.OPTION_WITH_CERTIFICATION_STATUS in self._option_list:
@@ -311,6 +305,16 @@ class SessionStateExporterBase(ISessionStateExporter):
                     job_state.effective_certification_status)
         return data
 
+    def _get_io_log_data(self, result):
+        # If requested, squash the IO log so that only textual data is
+        # saved, discarding stream name and the relative timestamp.
+        if self.OPTION_SQUASH_IO_LOG in self._option_list:
+            return self._squash_io_log(result.get_io_log())
+        elif self.OPTION_FLATTEN_IO_LOG in self._option_list:
+            return self._flatten_io_log(result.get_io_log())
+        else:
+            return self._io_log(result.get_io_log())
+
     def _build_attachment_map(self, data, job_id, job_state):
         raw_bytes = b''.join(
             (record[2] for record in
@@ -343,6 +347,47 @@ class SessionStateExporterBase(ISessionStateExporter):
                 for record in io_log]
 
 
+def dump_many_from_session_manager(session_manager, exporter_stream_list):
+    """
+    Dump a session with several exporters at once.
+
+    :param session_manager:
+        SessionManager instance that manages session to be exported
+    :param exporter_stream_list:
+        A list of (exporter, stream) pairs. Each exporter writes its report
+        to the byte stream it is paired with.
+    :returns:
+        A list with the time, in seconds, each exporter took to render its
+        report, in the same order as ``exporter_stream_list``.
+
+    All the exporters run concurrently, each one in its own thread. The I/O
+    log of each job is read from disk only once and shared by all of them
+    (see :class:`~plainbox.impl.result.IOLogCache`). The cache is only active
+    in those threads and it is released when they are done. If any of the
+    exporters fails, the exception is raised once all of them are done.
+    """
+    io_log_cache = IOLogCache()
+
+    def dump(exporter, stream):
+        with io_log_cache.activated():
+            start = time.perf_counter()
+            exporter.dump_from_session_manager(session_manager, stream)
+            render_time = time.perf_counter() - start
+        logger.debug(_("%s rendered the session in %.2fs"),
+                     type(exporter).__name__, render_time)
+        return render_time
+
+    try:
+        with ThreadPoolExecutor(
+                max(1, len(exporter_stream_list))) as executor:
+            future_list = [
+                executor.submit(dump, exporter, stream)
+                for exporter, stream in exporter_stream_list]
+    finally:
+        io_log_cache.clear()
+    return [future.result() for future in future_list]
+
+
 class ByteStringStreamTranslator(RawIOBase):
     """
     This is a sort of "impedance matcher" that bridges the gap between
@@ -25,6 +25,7 @@
     THIS MODULE DOES NOT HAVE STABLE PUBLIC API
 """
 
+import base64
 import json
 
 from plainbox.impl.exporter import SessionStateExporterBase
@@ -33,6 +34,12 @@ from plainbox.impl.exporter import SessionStateExporterBase
 class JSONSessionStateExporter(SessionStateExporterBase):
     """
     Session state exporter creating JSON documents
+
+    I/O logs and attachments are never loaded into memory as a whole. The
+    session data subset computed by this exporter refers to them and they are
+    read, base64-encoded and written in fixed-size chunks by :meth:`dump()`.
+    The resulting document is identical to one created out of fully loaded
+    data.
     """
 
     OPTION_MACHINE_JSON = 'machine-json'
@@ -43,13 +50,147 @@ class JSONSessionStateExporter(SessionStateExporterBase):
 
     def dump(self, data, stream):
         if self.OPTION_MACHINE_JSON in self._option_list:
-            encoder = json.JSONEncoder(
+            encoder = _StreamingJSONEncoder(
                 ensure_ascii=False,
                 indent=None,
                 separators=(',', ':'))
         else:
-            encoder = json.JSONEncoder(
+            encoder = _StreamingJSONEncoder(
                 ensure_ascii=False,
                 indent=4)
-        for chunk in encoder.iterencode(data):
-            stream.write(chunk.encode('UTF-8'))
+        for chunk in encoder.iterencode_bytes(data):
+            stream.write(chunk)
+
+    def _get_io_log_data(self, result):
+        if self.OPTION_SQUASH_IO_LOG in self._option_list:
+            return _LazyList(lambda: (
+                base64.standard_b64encode(record.data).decode('ASCII')
+                for record in result.get_io_log()))
+        elif self.OPTION_FLATTEN_IO_LOG in self._option_list:
+            return _Base64Text(lambda: (
+                record.data for record in result.get_io_log()))
+        else:
+            return _LazyList(lambda: (
+                (record.delay, record.stream_name,
+                 base64.standard_b64encode(record.data).decode('ASCII'))
+                for record in result.get_io_log()))
+
+    def _build_attachment_map(self, data, job_id, job_state):
+        result = job_state.result
+        data['attachment_map'][job_id] = _Base64Text(lambda: (
+            record[2] for record in result.get_io_log()
+            if record[1] == 'stdout'))
+
+
+class _LazyList(list):
+    """
+    List with items computed each time it is iterated over.
+
+    This is how the JSON encoder sees lists of I/O log records without having
+    all of them in memory.
+    """
+
+    def __init__(self, gen_fn):
+        super().__init__()
+        self._gen_fn = gen_fn
+
+    def __iter__(self):
+        return iter(self._gen_fn())
+
+    def __bool__(self):
+        for item in self:
+            return True
+        return False
+
+    def __eq__(self, other):
+        return list(self) == other
+
+    def __repr__(self):
+        return "<{} {!r}>".format(self.__class__.__name__, list(self))
+
+
+class _Base64Text:
+    """
+    Base64 text of a sequence of bytes computed in fixed-size chunks.
+
+    :attr CHUNK_SIZE:
+        Number of bytes encoded at a time, it is a multiple of three so that
+        the encoded chunks can be concatenated.
+    """
+
+    CHUNK_SIZE = 3 * 2 ** 14
+
+    def __init__(self, gen_fn):
+        """
+        Initialize a new text.
+
+        :param gen_fn:
+            A function that returns an iterable of bytes that are the data to
+            encode. It is called each time the text is computed.
+        """
+        self._gen_fn = gen_fn
+
+    def iter_chunks(self):
+        """
+        Compute the text, chunk by chunk.
+
+        :returns:
+            A generator of bytes that are subsequent chunks of the text.
+        """
+        buf = bytearray()
+        for data in self._gen_fn():
+            buf += data
+            if len(buf) < self.CHUNK_SIZE:
+                continue
+            size = len(buf) - len(buf) % 3
+            for start in range(0, size, self.CHUNK_SIZE):
+                yield base64.standard_b64encode(
+                    buf[start:min(start + self.CHUNK_SIZE, size)])
+            del buf[:size]
+        if buf:
+            yield base64.standard_b64encode(buf)
+
+    def __str__(self):
+        return b''.join(self.iter_chunks()).decode('ASCII')
+
+    def __eq__(self, other):
+        return str(self) == other
+
+    def __repr__(self):
+        return "<{} {!r}>".format(self.__class__.__name__, str(self))
+
+
+class _StreamingJSONEncoder(json.JSONEncoder):
+    """JSON encoder that can write :class:`_Base64Text` values in chunks."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._text = None
+
+    def default(self, o):
+        if isinstance(o, _Base64Text):
+            # Stand in with an empty string, see iterencode_bytes()
+            self._text = o
+            return ''
+        return super().default(o)
+
+    def iterencode_bytes(self, o):
+        """
+        Encode the given object to UTF-8 encoded JSON, chunk by chunk.
+
+        :param o:
+            The object to encode
+        :returns:
+            A generator of bytes that are subsequent chunks of the document.
+        """
+        for chunk in self.iterencode(o):
+            if self._text is None:
+                yield chunk.encode('UTF-8')
+                continue
+            # This is the encoded form of the string returned by default(),
+            # the text goes inside the quotes.
+            assert chunk == '""'
+            text, self._text = self._text, None
+            yield b'"'
+            yield from text.iter_chunks()
+            yield b'"'
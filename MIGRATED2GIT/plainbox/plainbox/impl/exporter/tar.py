@@ -25,9 +25,11 @@
     THIS MODULE DOES NOT HAVE STABLE PUBLIC API
 """
 
-import io
+import concurrent.futures
 import os
+import re
 import tarfile
+import tempfile
 import time
 
 from plainbox.impl.exporter import SessionStateExporterBase
@@ -50,8 +52,34 @@ class TARSessionStateExporter(SessionStateExporterBase):
         :param stream:
             Byte stream to write to.
 
+        The JSON and XLSX reports are produced, one after another, in a worker
+        thread while the standard output and standard error files of each job
+        are compressed. They are spooled to temporary files and added to the
+        archive after all of those files.
         """
-        json_stream = io.BytesIO()
+        with tempfile.TemporaryFile() as json_stream, \
+                tempfile.TemporaryFile() as xlsx_stream, \
+                concurrent.futures.ThreadPoolExecutor(1) as executor:
+            # NOTE: both reports hold all of the I/O logs in memory while they
+            # are produced, producing them at the same time doubles that.
+            json_future = executor.submit(
+                self._dump_json, manager, json_stream)
+            xlsx_future = executor.submit(
+                self._dump_xlsx, manager, xlsx_stream)
+            with tarfile.TarFile.open(None, 'w|xz', stream) as tar:
+                self._add_std_streams(manager, tar)
+                for name, future, member_stream in (
+                        ("submission.json", json_future, json_stream),
+                        ("submission.xlsx", xlsx_future, xlsx_stream)):
+                    # Re-raise any exception raised by the worker
+                    future.result()
+                    tarinfo = tarfile.TarInfo(name=name)
+                    tarinfo.size = member_stream.seek(0, os.SEEK_END)
+                    tarinfo.mtime = time.time()
+                    member_stream.seek(0)  # Need to rewind the file, puagh
+                    tar.addfile(tarinfo, member_stream)
+
+    def _dump_json(self, manager, stream):
         options_list = [
             SessionStateExporterBase.OPTION_WITH_COMMENTS,
             SessionStateExporterBase.OPTION_WITH_IO_LOG,
@@ -62,13 +90,9 @@ class TARSessionStateExporter(SessionStateExporterBase):
             SessionStateExporterBase.OPTION_WITH_CERTIFICATION_STATUS
         ]
         json_exporter = JSONSessionStateExporter(options_list)
-        json_exporter.dump_from_session_manager(manager, json_stream)
-        json_tarinfo = tarfile.TarInfo(name="submission.json")
-        json_tarinfo.size = json_stream.tell()
-        json_tarinfo.mtime = time.time()
-        json_stream.seek(0)  # Need to rewind the file, puagh
+        json_exporter.dump_from_session_manager(manager, stream)
 
-        xlsx_stream = io.BytesIO()
+    def _dump_xlsx(self, manager, stream):
         options_list = [
             XLSXSessionStateExporter.OPTION_WITH_SYSTEM_INFO,
             XLSXSessionStateExporter.OPTION_WITH_SUMMARY,
@@ -77,29 +101,26 @@ class TARSessionStateExporter(SessionStateExporterBase):
             XLSXSessionStateExporter.OPTION_WITH_UNIT_CATEGORIES
         ]
         xlsx_exporter = XLSXSessionStateExporter(options_list)
-        xlsx_exporter.dump_from_session_manager(manager, xlsx_stream)
-        xlsx_tarinfo = tarfile.TarInfo(name="submission.xlsx")
-        xlsx_tarinfo.size = xlsx_stream.tell()
-        xlsx_tarinfo.mtime = time.time()
-        xlsx_stream.seek(0)  # Need to rewind the file, puagh
+        xlsx_exporter.dump_from_session_manager(manager, stream)
 
+    def _add_std_streams(self, manager, tar):
         job_state_map = manager.default_device_context.state.job_state_map
-        with tarfile.TarFile.open(None, 'w|xz', stream) as tar:
-            tar.addfile(json_tarinfo, json_stream)
-            tar.addfile(xlsx_tarinfo, xlsx_stream)
-            for job_id in manager.default_device_context.state.job_state_map:
-                job_state = job_state_map[job_id]
-                try:
-                    recordname = job_state.result.io_log_filename
-                except AttributeError:
-                    continue
-                for stdstream in ('stdout', 'stderr'):
-                    filename = recordname.replace('record.gz', stdstream)
-                    if os.path.exists(filename) and os.path.getsize(filename):
-                        arcname = os.path.basename(filename)
-                        if stdstream == 'stdout':
-                            arcname = os.path.splitext(arcname)[0]
-                        tar.add(filename, arcname, recursive=False)
+        for job_id in manager.default_device_context.state.job_state_map:
+            job_state = job_state_map[job_id]
+            try:
+                recordname = job_state.result.io_log_filename
+            except AttributeError:
+                continue
+            # Both the current (.record.bin) and the legacy (.record.gz)
+            # I/O log records live next to the stdout and stderr files.
+            basename = re.sub(r'record\.(gz|bin)$', '', recordname)
+            for stdstream in ('stdout', 'stderr'):
+                filename = basename + stdstream
+                if os.path.exists(filename) and os.path.getsize(filename):
+                    arcname = os.path.basename(filename)
+                    if stdstream == 'stdout':
+                        arcname = os.path.splitext(arcname)[0]
+                    tar.add(filename, arcname, recursive=False)
 
     def dump(self, session, stream):
         pass
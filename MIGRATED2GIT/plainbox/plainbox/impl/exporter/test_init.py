@@ -29,12 +29,15 @@ from collections import OrderedDict
 from io import StringIO, BytesIO
 from tempfile import TemporaryDirectory
 from unittest import TestCase
+import threading
 
 from plainbox.abc import IJobResult
 from plainbox.impl.exporter import ByteStringStreamTranslator
 from plainbox.impl.exporter import SessionStateExporterBase
 from plainbox.impl.exporter import classproperty
+from plainbox.impl.exporter import dump_many_from_session_manager
 from plainbox.impl.job import JobDefinition
+from plainbox.impl.result import IOLogCache
 from plainbox.impl.result import MemoryJobResult, IOLogRecord
 from plainbox.impl.session import SessionState
 from plainbox.impl.session.manager import SessionManager
@@ -331,6 +334,95 @@ class SessionStateExporterBaseTests(TestCase):
         })
 
 
+class DumpManyFromSessionManagerTests(TestCase):
+
+    def test_smoke(self):
+        session_manager = mock.Mock(name='session_manager')
+
+        def dump(manager, stream):
+            self.assertIs(manager, session_manager)
+            self.assertIsNotNone(IOLogCache.get_active())
+            stream.write(b'data')
+
+        exporter_stream_list = [
+            (mock.Mock(**{'dump_from_session_manager.side_effect': dump}),
+             BytesIO())
+            for i in range(3)]
+        render_time_list = dump_many_from_session_manager(
+            session_manager, exporter_stream_list)
+        self.assertEqual(len(render_time_list), 3)
+        for render_time in render_time_list:
+            self.assertGreaterEqual(render_time, 0)
+        for exporter, stream in exporter_stream_list:
+            self.assertEqual(stream.getvalue(), b'data')
+        self.assertIsNone(IOLogCache.get_active())
+
+    def test_error(self):
+        good_exporter = mock.Mock()
+        bad_exporter = mock.Mock()
+        bad_exporter.dump_from_session_manager.side_effect = IOError
+        with self.assertRaises(IOError):
+            dump_many_from_session_manager(mock.Mock(), [
+                (bad_exporter, BytesIO()), (good_exporter, BytesIO())])
+        self.assertEqual(
+            good_exporter.dump_from_session_manager.call_count, 1)
+
+    def test_no_exporters(self):
+        self.assertEqual(
+            dump_many_from_session_manager(mock.Mock(), []), [])
+
+    def test_overlapping_exports(self):
+        # Export A starts first but finishes before export B
+        a_started = threading.Event()
+        a_finished = threading.Event()
+        b_started = threading.Event()
+        cache_map = {}
+        b_cache_after_a_list = []
+
+        def dump_a(manager, stream):
+            cache_map['a'] = IOLogCache.get_active()
+            a_started.set()
+            self.assertTrue(b_started.wait(5))
+
+        def dump_b(manager, stream):
+            cache_map['b'] = IOLogCache.get_active()
+            b_started.set()
+            self.assertTrue(a_finished.wait(5))
+            b_cache_after_a_list.append(IOLogCache.get_active())
+
+        def export(dump):
+            exporter = mock.Mock(
+                **{'dump_from_session_manager.side_effect': dump})
+            dump_many_from_session_manager(
+                mock.Mock(), [(exporter, BytesIO())])
+
+        thread_a = threading.Thread(target=export, args=(dump_a,))
+        thread_b = threading.Thread(target=export, args=(dump_b,))
+        thread_a.start()
+        self.assertTrue(a_started.wait(5))
+        thread_b.start()
+        # Unrelated threads don't use the caches of running exports
+        self.assertIsNone(IOLogCache.get_active())
+        thread_a.join()
+        a_finished.set()
+        thread_b.join()
+        self.assertIsNotNone(cache_map['a'])
+        self.assertIsNotNone(cache_map['b'])
+        self.assertIsNot(cache_map['a'], cache_map['b'])
+        # Export B still had its own cache after export A finished
+        self.assertEqual(b_cache_after_a_list, [cache_map['b']])
+        # No cache is left behind, in this thread or in any other one
+        self.assertIsNone(IOLogCache.get_active())
+        active_list = []
+        thread = threading.Thread(
+            target=lambda: active_list.append(IOLogCache.get_active()))
+        thread.start()
+        thread.join()
+        self.assertEqual(active_list, [None])
+        self.assertEqual(cache_map['a']._record_map, {})
+        self.assertEqual(cache_map['b']._record_map, {})
+
+
 class ByteStringStreamTranslatorTests(TestCase):
 
     def test_smoke(self):
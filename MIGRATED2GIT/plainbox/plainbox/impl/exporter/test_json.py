@@ -26,8 +26,17 @@ Test definitions for plainbox.impl.exporter.json module
 
 from unittest import TestCase
 from io import BytesIO
+import base64
+import json
 
+from plainbox.impl.exporter import SessionStateExporterBase
 from plainbox.impl.exporter.json import JSONSessionStateExporter
+from plainbox.impl.exporter.json import _Base64Text
+from plainbox.impl.exporter.json import _LazyList
+from plainbox.impl.result import MemoryJobResult
+from plainbox.impl.session import SessionState
+from plainbox.impl.testing_utils import make_job
+from plainbox.vendor import mock
 
 
 class JSONSessionStateExporterTests(TestCase):
@@ -35,6 +44,12 @@ class JSONSessionStateExporterTests(TestCase):
     # It's kind of long to type over and over
     exporter_cls = JSONSessionStateExporter
 
+    class LoadingExporter(SessionStateExporterBase):
+        """Exporter that loads all of the session data subset."""
+
+        def dump(self, data, stream):
+            """Dummy implementation of a method required by the base class."""
+
     def test_supported_option_list(self):
         self.assertIn(self.exporter_cls.OPTION_MACHINE_JSON,
                       self.exporter_cls.supported_option_list)
@@ -61,3 +76,66 @@ class JSONSessionStateExporterTests(TestCase):
             '{"foo":"bar"}'
         ).encode('UTF-8')
         self.assertEqual(stream.getvalue(), expected_bytes)
+
+    def test_dump_lazy_values(self):
+        exporter = self.exporter_cls(option_list=[
+            self.exporter_cls.OPTION_MACHINE_JSON])
+        data = {
+            'text': _Base64Text(lambda: [b'foo', b'bar']),
+            'list': _LazyList(lambda: iter(['a', 'b'])),
+            'empty': _LazyList(lambda: iter([])),
+            'nested': [_Base64Text(lambda: [])],
+        }
+        stream = BytesIO()
+        exporter.dump(data, stream)
+        self.assertEqual(json.loads(stream.getvalue().decode('UTF-8')), {
+            'text': 'Zm9vYmFy',
+            'list': ['a', 'b'],
+            'empty': [],
+            'nested': [''],
+        })
+
+    def test_base64_text_chunks(self):
+        chunk_size = _Base64Text.CHUNK_SIZE
+        for data_list in ([b'x' * (chunk_size - 1), b'yy', b'z'],
+                          [b'x' * (chunk_size * 3 + 1)],
+                          [b'x'] * (chunk_size + 2)):
+            text = _Base64Text(lambda: data_list)
+            chunk_list = list(text.iter_chunks())
+            self.assertEqual(
+                b''.join(chunk_list),
+                base64.standard_b64encode(b''.join(data_list)))
+            self.assertLessEqual(
+                max(len(chunk) for chunk in chunk_list),
+                chunk_size // 3 * 4)
+
+    def test_dump_from_session_manager(self):
+        job_a = make_job('a', plugin='shell')
+        job_b = make_job('b', plugin='attachment')
+        session = SessionState([job_a, job_b])
+        session.update_job_result(job_a, MemoryJobResult({
+            'outcome': 'pass',
+            'io_log': [(0, 'stdout', b'foo'), (1, 'stderr', b'bar')],
+        }))
+        session.update_job_result(job_b, MemoryJobResult({
+            'outcome': 'pass',
+            'io_log': [(0, 'stdout', b'att'), (1, 'stderr', b'bar')],
+        }))
+        manager = mock.Mock(state=session)
+        for option in (None,
+                       self.exporter_cls.OPTION_SQUASH_IO_LOG,
+                       self.exporter_cls.OPTION_FLATTEN_IO_LOG):
+            option_list = [self.exporter_cls.OPTION_WITH_IO_LOG,
+                           self.exporter_cls.OPTION_WITH_ATTACHMENTS]
+            if option is not None:
+                option_list.append(option)
+            exporter = self.exporter_cls(option_list)
+            stream = BytesIO()
+            exporter.dump_from_session_manager(manager, stream)
+            # The document is the same as one made out of fully loaded data
+            data = self.LoadingExporter(
+                option_list).get_session_data_subset(manager)
+            self.assertEqual(
+                stream.getvalue(),
+                json.dumps(data, ensure_ascii=False, indent=4).encode(
+                    'UTF-8'))
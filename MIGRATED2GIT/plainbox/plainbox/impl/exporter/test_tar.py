@@ -0,0 +1,99 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+plainbox.impl.exporter.test_tar
+===============================
+
+Test definitions for plainbox.impl.exporter.tar module
+"""
+
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+import tarfile
+
+from plainbox.impl.exporter.tar import TARSessionStateExporter
+from plainbox.impl.result import MemoryJobResult
+from plainbox.vendor import mock
+
+
+class TARSessionStateExporterTests(TestCase):
+
+    def setUp(self):
+        self.scratch_dir = TemporaryDirectory()
+        self.addCleanup(self.scratch_dir.cleanup)
+        # Create the files that running a job leaves behind
+        basename = os.path.join(self.scratch_dir.name, 'job-a.')
+        with open(basename + 'stdout', 'wb') as stream:
+            stream.write(b'standard output\n')
+        with open(basename + 'stderr', 'wb') as stream:
+            stream.write(b'')
+        result_a = mock.Mock(io_log_filename=basename + 'record.gz')
+        # A result without an I/O log
+        result_b = MemoryJobResult({})
+        self.manager = mock.Mock(name='manager')
+        self.manager.default_device_context.state.job_state_map = {
+            'job-a': mock.Mock(result=result_a),
+            'job-b': mock.Mock(result=result_b),
+        }
+
+    def _dump(self):
+        def dump_json(manager, stream):
+            self.assertIs(manager, self.manager)
+            stream.write(b'{}')
+
+        def dump_xlsx(manager, stream):
+            self.assertIs(manager, self.manager)
+            stream.write(b'xlsx' * 1000)
+            # Move back like a zip file does when it writes headers
+            stream.seek(0)
+
+        stream = BytesIO()
+        with mock.patch('plainbox.impl.exporter.tar.JSONSessionStateExporter'
+                        ) as json_cls, \
+                mock.patch('plainbox.impl.exporter.tar.'
+                           'XLSXSessionStateExporter') as xlsx_cls:
+            json_cls().dump_from_session_manager.side_effect = dump_json
+            xlsx_cls().dump_from_session_manager.side_effect = dump_xlsx
+            TARSessionStateExporter().dump_from_session_manager(
+                self.manager, stream)
+        stream.seek(0)
+        return stream
+
+    def test_dump_from_session_manager(self):
+        with tarfile.open(fileobj=self._dump(), mode='r:xz') as tar:
+            self.assertEqual(
+                sorted(tar.getnames()),
+                ['job-a', 'submission.json', 'submission.xlsx'])
+            self.assertEqual(
+                tar.extractfile('job-a').read(), b'standard output\n')
+            self.assertEqual(
+                tar.extractfile('submission.json').read(), b'{}')
+            self.assertEqual(
+                tar.extractfile('submission.xlsx').read(), b'xlsx' * 1000)
+
+    def test_dump_from_session_manager__worker_error(self):
+        with mock.patch('plainbox.impl.exporter.tar.JSONSessionStateExporter'
+                        ), \
+                mock.patch('plainbox.impl.exporter.tar.'
+                           'XLSXSessionStateExporter') as xlsx_cls:
+            xlsx_cls().dump_from_session_manager.side_effect = IOError
+            with self.assertRaises(IOError):
+                TARSessionStateExporter().dump_from_session_manager(
+                    self.manager, BytesIO())
@@ -0,0 +1,221 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+:mod:`plainbox.impl.providers.cache` -- cache of parsed provider files
+======================================================================
+
+Loading a provider means reading and parsing every unit file it ships. This
+module implements an on-disk cache of the RFC822 records parsed from each of
+those files so that subsequent loads can skip parsing entirely.
+
+Each file gets a separate cache entry, a small JSON document that holds the
+normalized and raw data of each record, the origin of each record and the
+field offset map. An entry is valid only as long as the path, size and
+modification time of the original file, as well as the version of plainbox,
+are unchanged. Anything else is treated as a cache miss and the entry is
+rebuilt.
+
+.. note::
+    The cache lives in a per-user directory so it must never be used by the
+    trusted launcher. Only the insecure provider collection uses it.
+
+.. warning::
+
+    THIS MODULE DOES NOT HAVE STABLE PUBLIC API
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from plainbox import __version__ as plainbox_version
+from plainbox.i18n import gettext as _
+from plainbox.impl.secure.origin import FileTextSource
+from plainbox.impl.secure.origin import Origin
+from plainbox.impl.secure.rfc822 import RFC822Record
+from plainbox.impl.secure.rfc822 import load_rfc822_records
+
+
+logger = logging.getLogger("plainbox.providers.cache")
+
+# Version of the format of each cache entry
+_CACHE_FORMAT = 1
+
+
+class RFC822RecordCache:
+    """
+    On-disk cache of RFC822 records loaded from provider files.
+
+    The cache can be shared by providers that are loaded concurrently.
+
+    :attr hit_count:
+        Number of files that were loaded from the cache
+    :attr miss_count:
+        Number of files that had to be parsed
+    """
+
+    def __init__(self, location=None):
+        """
+        Initialize a new cache.
+
+        :param location:
+            Pathname of the cache directory. If omitted then it is computed
+            with :meth:`get_default_location()`, the first time it is needed.
+        """
+        self._location = location
+        self._lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def __repr__(self):
+        return "<{} location:{!r}>".format(
+            self.__class__.__name__, self._location)
+
+    @property
+    def location(self):
+        """
+        pathname of the cache directory or None if caching is disabled
+        """
+        if self._location is None:
+            self._location = self.get_default_location()
+        return self._location or None
+
+    @classmethod
+    def get_default_location(cls):
+        """
+        Get the default location of the cache.
+
+        The default location is defined by ``$PLAINBOX_UNIT_CACHE``. If that
+        variable is set to an empty string then caching is disabled. The
+        default location, if the environment variable is not provided, is
+        ``${XDG_CACHE_HOME:-$HOME/.cache}/plainbox/units``
+        """
+        location = os.environ.get('PLAINBOX_UNIT_CACHE')
+        if location is not None:
+            return os.path.abspath(location) if location else ''
+        xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+        if not xdg_cache_home:
+            xdg_cache_home = os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(xdg_cache_home, 'plainbox', 'units')
+
+    def load_rfc822_records(self, filename, text):
+        """
+        Load RFC822 records from a provider file, using the cache if possible.
+
+        :param filename:
+            Name of the file that is being loaded
+        :param text:
+            Full text of the file (possibly lazy, it is not accessed if the
+            records can be loaded from the cache)
+        :returns:
+            A list of :class:`RFC822Record` instances, same as
+            :func:`plainbox.impl.secure.rfc822.load_rfc822_records()` would.
+        :raises RFC822SyntaxError:
+            If the file has to be parsed and is not correct. Such files are
+            never cached.
+        """
+        key = self._get_key(filename)
+        if key is not None:
+            records = self._load_entry(filename, key)
+            if records is not None:
+                with self._lock:
+                    self.hit_count += 1
+                return records
+        with self._lock:
+            self.miss_count += 1
+        # NOTE: the key is computed before the text is read. If the file
+        # changes in between the entry is stale from the start and will never
+        # match again. It will be replaced the next time the file is loaded.
+        records = load_rfc822_records(text, source=FileTextSource(filename))
+        if key is not None:
+            self._save_entry(filename, key, records)
+        return records
+
+    def clear(self):
+        """
+        Remove all of the entries from the cache.
+        """
+        if self.location is not None and os.path.isdir(self.location):
+            shutil.rmtree(self.location)
+
+    def _get_key(self, filename):
+        if self.location is None:
+            return None
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return [_CACHE_FORMAT, list(plainbox_version),
+                os.path.abspath(filename), stat.st_size, stat.st_mtime_ns]
+
+    def _get_entry_pathname(self, filename):
+        digest = hashlib.sha1(
+            os.path.abspath(filename).encode('UTF-8', 'surrogateescape')
+        ).hexdigest()
+        return os.path.join(self.location, digest + '.json')
+
+    def _load_entry(self, filename, key):
+        pathname = self._get_entry_pathname(filename)
+        try:
+            with open(pathname, 'rt', encoding='UTF-8') as stream:
+                entry = json.load(stream)
+            if entry['key'] != key:
+                logger.debug(_("Cache entry for %r is stale"), filename)
+                return None
+            source = FileTextSource(filename)
+            return [
+                RFC822Record(
+                    data, Origin(source, line_start, line_end),
+                    raw_data, field_offset_map)
+                for line_start, line_end, data, raw_data, field_offset_map
+                in entry['records']]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, LookupError, TypeError) as exc:
+            logger.warning(
+                _("Ignoring damaged cache entry %r: %s"), pathname, exc)
+            return None
+
+    def _save_entry(self, filename, key, records):
+        entry = {
+            'key': key,
+            'records': [
+                [record.origin.line_start, record.origin.line_end,
+                 record.data, record.raw_data, record.field_offset_map]
+                for record in records]
+        }
+        try:
+            os.makedirs(self.location, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                    'wt', encoding='UTF-8', dir=self.location,
+                    suffix='.tmp', delete=False) as stream:
+                try:
+                    # NOTE: json.dumps() is much faster than json.dump()
+                    stream.write(json.dumps(entry, separators=(',', ':')))
+                    stream.close()
+                    os.replace(
+                        stream.name, self._get_entry_pathname(filename))
+                except BaseException:
+                    os.unlink(stream.name)
+                    raise
+        except (IOError, OSError) as exc:
+            logger.warning(
+                _("Cannot save cache entry for %r: %s"), filename, exc)
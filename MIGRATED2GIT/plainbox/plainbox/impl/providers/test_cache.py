@@ -0,0 +1,157 @@
+# This file is part of Checkbox.
+#
+# Copyright 2016 Canonical Ltd.
+#
+# Checkbox is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3,
+# as published by the Free Software Foundation.
+#
+# Checkbox is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Checkbox.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+plainbox.impl.providers.test_cache
+==================================
+
+Test definitions for plainbox.impl.providers.cache module
+"""
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+
+from plainbox.impl.providers.cache import RFC822RecordCache
+from plainbox.impl.secure.origin import FileTextSource
+from plainbox.impl.secure.plugins import LazyFileContent
+from plainbox.impl.secure.rfc822 import RFC822SyntaxError
+from plainbox.impl.secure.rfc822 import load_rfc822_records
+from plainbox.vendor import mock
+
+
+class RFC822RecordCacheTests(TestCase):
+
+    TEXT = (
+        "# comment\n"
+        "id: foo\n"
+        "description:\n"
+        " line one\n"
+        " .\n"
+        " line two\n"
+        "\n"
+        "id: bar\n"
+        "plugin: shell\n")
+
+    def setUp(self):
+        self._tmpdir = TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.cache_dir = os.path.join(self._tmpdir.name, 'cache')
+        self.filename = os.path.join(self._tmpdir.name, 'units.pxu')
+        self._write(self.TEXT)
+        self.cache = RFC822RecordCache(self.cache_dir)
+
+    def _write(self, text, mtime_ns=None):
+        with open(self.filename, 'wt', encoding='UTF-8') as stream:
+            stream.write(text)
+        if mtime_ns is not None:
+            os.utime(self.filename, ns=(mtime_ns, mtime_ns))
+
+    def _load(self, cache=None):
+        cache = cache or self.cache
+        return cache.load_rfc822_records(
+            self.filename, LazyFileContent(self.filename))
+
+    def test_get_default_location(self):
+        with mock.patch.dict('os.environ', clear=True):
+            os.environ['XDG_CACHE_HOME'] = '/cache'
+            self.assertEqual(RFC822RecordCache.get_default_location(),
+                             '/cache/plainbox/units')
+            os.environ['PLAINBOX_UNIT_CACHE'] = '/units'
+            self.assertEqual(RFC822RecordCache.get_default_location(),
+                             '/units')
+
+    def test_location__disabled(self):
+        with mock.patch.dict('os.environ', {'PLAINBOX_UNIT_CACHE': ''}):
+            cache = RFC822RecordCache()
+            self.assertIsNone(cache.location)
+            self._load(cache)
+            self._load(cache)
+        self.assertEqual(cache.miss_count, 2)
+        self.assertEqual(cache.hit_count, 0)
+
+    def test_load_rfc822_records__miss_then_hit(self):
+        expected = load_rfc822_records(
+            self.TEXT, source=FileTextSource(self.filename))
+        records = self._load()
+        self.assertEqual(records, expected)
+        self.assertEqual((self.cache.hit_count, self.cache.miss_count), (0, 1))
+        # The second load doesn't even look at the text of the file
+        with mock.patch('plainbox.impl.providers.cache.load_rfc822_records',
+                        side_effect=AssertionError) as mock_load:
+            records = self._load(RFC822RecordCache(self.cache_dir))
+        self.assertFalse(mock_load.called)
+        self.assertEqual(records, expected)
+        for record, expected_record in zip(records, expected):
+            self.assertEqual(record.raw_data, expected_record.raw_data)
+            self.assertEqual(record.field_offset_map,
+                             expected_record.field_offset_map)
+            self.assertEqual(record.origin.line_start,
+                             expected_record.origin.line_start)
+            self.assertEqual(record.origin.line_end,
+                             expected_record.origin.line_end)
+            self.assertEqual(record.origin.source,
+                             expected_record.origin.source)
+
+    def test_load_rfc822_records__modified_file(self):
+        self._write(self.TEXT, 1000000000)
+        self._load()
+        # Same size, different modification time
+        self._write(self.TEXT.replace('bar', 'baz'), 2000000000)
+        records = self._load()
+        self.assertEqual(records[1].data['id'], 'baz')
+        self.assertEqual((self.cache.hit_count, self.cache.miss_count), (0, 2))
+        self._load()
+        self.assertEqual((self.cache.hit_count, self.cache.miss_count), (1, 2))
+
+    def test_load_rfc822_records__other_version(self):
+        self._load()
+        with mock.patch('plainbox.impl.providers.cache.plainbox_version',
+                        (0, 0, 0, "dev", 0)):
+            self._load()
+        self.assertEqual((self.cache.hit_count, self.cache.miss_count), (0, 2))
+
+    def test_load_rfc822_records__damaged_entry(self):
+        self._load()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'wt') as stream:
+                stream.write('{"key": ')
+        with self.assertLogs('plainbox.providers.cache', 'WARNING'):
+            records = self._load()
+        self.assertEqual(len(records), 2)
+        self.assertEqual((self.cache.hit_count, self.cache.miss_count), (0, 2))
+        self._load()
+        self.assertEqual(self.cache.hit_count, 1)
+
+    def test_load_rfc822_records__syntax_error(self):
+        self._write("broken")
+        with self.assertRaises(RFC822SyntaxError):
+            self._load()
+        with self.assertRaises(RFC822SyntaxError):
+            self._load()
+        self.assertEqual(self.cache.miss_count, 2)
+
+    def test_load_rfc822_records__missing_file(self):
+        records = self.cache.load_rfc822_records('/path/to/units.pxu', "a: b")
+        self.assertEqual(records[0].data, {'a': 'b'})
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_clear(self):
+        self._load()
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self._load()
+        self.assertEqual(self.cache.miss_count, 2)
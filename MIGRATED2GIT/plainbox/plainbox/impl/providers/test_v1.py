@@ -28,6 +28,7 @@ from unittest import TestCase
 import os
 
 from plainbox.impl.providers.v1 import InsecureProvider1PlugInCollection
+from plainbox.impl.providers.v1 import get_PROVIDER_WORKERS
 from plainbox.impl.providers.v1 import get_insecure_PROVIDERPATH_list
 from plainbox.impl.providers.v1 import get_user_PROVIDERPATH_entry
 from plainbox.vendor import mock
@@ -88,6 +89,19 @@ class Tests(TestCase):
             get_insecure_PROVIDERPATH_list(),
             ["system-wide", "per-user"])
 
+    def test_get_PROVIDER_WORKERS(self):
+        """
+        verify that get_PROVIDER_WORKERS() honors PLAINBOX_PROVIDER_WORKERS
+        """
+        with mock.patch.dict('os.environ', clear=True):
+            self.assertIsNone(get_PROVIDER_WORKERS())
+            os.environ['PLAINBOX_PROVIDER_WORKERS'] = '4'
+            self.assertEqual(get_PROVIDER_WORKERS(), 4)
+            for value in ('0', '-1', 'many'):
+                os.environ['PLAINBOX_PROVIDER_WORKERS'] = value
+                with self.assertLogs('plainbox.providers.v1', 'WARNING'):
+                    self.assertIsNone(get_PROVIDER_WORKERS())
+
 
 class InsecureProvider1PlugInCollectionTests(TestCase):
     """
@@ -120,3 +134,14 @@ class InsecureProvider1PlugInCollectionTests(TestCase):
         mock_getenv.return_value = os.path.pathsep.join(['/foo', '/bar'])
         obj = InsecureProvider1PlugInCollection()
         self.assertTrue(obj._dir_list, ['/foo', '/bar'])
+
+    def test_init__with_PLAINBOX_PROVIDER_WORKERS_set(self):
+        """
+        validate that InsecureProvider1PlugInCollection() loads providers in
+        parallel if PLAINBOX_PROVIDER_WORKERS is set in the environment
+        """
+        with mock.patch.dict('os.environ', {'PLAINBOX_PROVIDER_WORKERS': '2'}):
+            obj = InsecureProvider1PlugInCollection()
+        self.assertEqual(obj.max_workers, 2)
+        self.assertEqual(
+            InsecureProvider1PlugInCollection(max_workers=3).max_workers, 3)
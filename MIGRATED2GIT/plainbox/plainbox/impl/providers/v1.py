@@ -25,14 +25,15 @@ Most of the implementation is available in
 """
 
 __all__ = ['Provider1', 'InsecureProvider1PlugInCollection', 'all_providers',
-           'get_insecure_PROVIDERPATH_list', ]
+           'get_insecure_PROVIDERPATH_list', 'get_PROVIDER_WORKERS', ]
 
 import logging
 import os
 
-from plainbox.impl.secure.plugins import FsPlugInCollection
+from plainbox.i18n import gettext as _
+from plainbox.impl.providers.cache import RFC822RecordCache
 from plainbox.impl.secure.providers.v1 import Provider1
-from plainbox.impl.secure.providers.v1 import Provider1PlugIn
+from plainbox.impl.secure.providers.v1 import Provider1PlugInCollection
 from plainbox.impl.secure.providers.v1 import get_secure_PROVIDERPATH_list
 
 
@@ -68,17 +69,48 @@ def get_insecure_PROVIDERPATH_list():
     return get_secure_PROVIDERPATH_list() + [get_user_PROVIDERPATH_entry()]
 
 
-class InsecureProvider1PlugInCollection(FsPlugInCollection):
+def get_PROVIDER_WORKERS():
+    """
+    Computes the number of threads used to load providers.
+
+    :returns:
+        The value of ``$PLAINBOX_PROVIDER_WORKERS`` as a positive integer or
+        None if the variable is not set (or incorrect), which means that
+        providers are loaded sequentially.
+    """
+    value = os.environ.get('PLAINBOX_PROVIDER_WORKERS')
+    if not value:
+        return None
+    try:
+        max_workers = int(value)
+    except ValueError:
+        max_workers = 0
+    if max_workers < 1:
+        logger.warning(
+            _("Ignoring incorrect PLAINBOX_PROVIDER_WORKERS: %r"), value)
+        return None
+    return max_workers
+
+
+class InsecureProvider1PlugInCollection(Provider1PlugInCollection):
     """
     A collection of v1 provider plugins.
 
-    This FsPlugInCollection subclass carries proper, built-in defaults, that
-    make loading providers easier.
+    This Provider1PlugInCollection subclass carries proper, built-in defaults,
+    that make loading providers easier.
 
     This particular class loads providers from both the system-wide managed
     locations and per-user location. In addition the list of locations searched
     can be changed by setting the ``PROVIDERPATH``, which behaves just like
     PATH, but is used for looking up providers.
+
+    Unless told otherwise, all of the providers share a per-user
+    :class:`RFC822RecordCache` so that unit files are not parsed again on each
+    start.
+
+    Parallel loading of providers is enabled by setting
+    ``PLAINBOX_PROVIDER_WORKERS`` to the number of threads to use, unless the
+    ``max_workers`` argument is passed explicitly.
     """
 
     def __init__(self, **kwargs):
@@ -87,8 +119,9 @@ class InsecureProvider1PlugInCollection(FsPlugInCollection):
             dir_list = get_insecure_PROVIDERPATH_list()
         else:
             dir_list = PROVIDERPATH.split(os.path.pathsep)
-        super().__init__(
-            dir_list, '.provider', wrapper=Provider1PlugIn, **kwargs)
+        kwargs.setdefault('unit_cache', RFC822RecordCache())
+        kwargs.setdefault('max_workers', get_PROVIDER_WORKERS())
+        super().__init__(dir_list, **kwargs)
 
 
 # Collection of all providers
@@ -190,6 +190,108 @@ class FakeResource:
         return True
 
 
+class ResourceMap(dict):
+    """
+    A mapping from resource id to a list of Resource objects.
+
+    This is a dictionary that keeps a generation number for each resource id.
+    The generation changes each time a resource list is set or removed. The
+    map also memoizes the results of evaluating resource expressions. Cached
+    results are keyed on the text of the expression and on the identifiers of
+    the resources it references and are reused for as long as the generations
+    of all of the referenced resource lists stay the same.
+
+    .. note::
+        Resource lists stored in the map must be replaced, not altered in
+        place, for the changes to be noticed.
+    """
+
+    # Generation numbers are unique across all maps so that a resource list
+    # that is removed and then set again is never mistaken for the old one.
+    _generation_counter = itertools.count(1)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._generation_map = {}
+        self._evaluation_cache = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, resource_id, resource_list):
+        super().__setitem__(resource_id, resource_list)
+        self._generation_map[resource_id] = next(self._generation_counter)
+
+    def __delitem__(self, resource_id):
+        super().__delitem__(resource_id)
+        self._generation_map[resource_id] = next(self._generation_counter)
+
+    def update(self, *args, **kwargs):
+        for resource_id, resource_list in dict(*args, **kwargs).items():
+            self[resource_id] = resource_list
+
+    def setdefault(self, resource_id, resource_list=None):
+        if resource_id not in self:
+            self[resource_id] = resource_list
+        return self[resource_id]
+
+    def pop(self, resource_id, *args):
+        if resource_id in self:
+            self._generation_map[resource_id] = next(
+                self._generation_counter)
+        return super().pop(resource_id, *args)
+
+    def popitem(self):
+        resource_id, resource_list = super().popitem()
+        self._generation_map[resource_id] = next(self._generation_counter)
+        return resource_id, resource_list
+
+    def clear(self):
+        for resource_id in self:
+            self._generation_map[resource_id] = next(
+                self._generation_counter)
+        super().clear()
+
+    def get_generation(self, resource_id):
+        """
+        Get the generation of a resource list with the given id.
+
+        :param resource_id:
+            Identifier of the resource
+        :returns:
+            An integer that changes each time the resource list is changed.
+            Resources that were never set have the generation zero.
+        """
+        return self._generation_map.get(resource_id, 0)
+
+    def evaluate(self, expression):
+        """
+        Evaluate an expression against resources in this map.
+
+        :param expression:
+            A ResourceExpression to evaluate
+        :returns:
+            The result of :meth:`ResourceExpression.evaluate()`, possibly
+            computed earlier.
+        :raises KeyError:
+            If any of the resources referenced by the expression are missing
+        """
+        resource_id_list = expression.resource_id_list
+        key = (expression.text, tuple(resource_id_list))
+        generation = tuple(
+            self._generation_map.get(resource_id, 0)
+            for resource_id in resource_id_list)
+        try:
+            cached_generation, result = self._evaluation_cache[key]
+        except KeyError:
+            pass
+        else:
+            if cached_generation == generation:
+                return result
+        result = expression.evaluate(*[
+            self[resource_id] for resource_id in resource_id_list])
+        self._evaluation_cache[key] = (generation, result)
+        return result
+
+
 class ResourceProgram:
     """
     Class for storing and executing resource programs.
@@ -242,7 +344,8 @@ class ResourceProgram:
         Returns True
 
         Resources must be a dictionary of mapping resource id to a list of
-        Resource objects.
+        Resource objects. If it is a :class:`ResourceMap` then the results of
+        evaluating each expression are cached in the map.
         """
         # First check if we have all required resources
         for expression in self._expression_list:
@@ -252,14 +355,47 @@ class ResourceProgram:
                         expression, resource_id)
         # Then evaluate all expressions
         for expression in self._expression_list:
-            result = expression.evaluate(*[
-                resource_map[resource_id]
-                for resource_id in expression.resource_id_list
-            ])
+            if isinstance(resource_map, ResourceMap):
+                result = resource_map.evaluate(expression)
+            else:
+                result = expression.evaluate(*[
+                    resource_map[resource_id]
+                    for resource_id in expression.resource_id_list
+                ])
             if not result:
                 raise ExpressionFailedError(expression)
         return True
 
+    def select_resources(self, resource_id, resource_list):
+        """
+        Select the resources that make the program evaluate to True.
+
+        :param resource_id:
+            The id of the resources
+        :param resource_list:
+            A list of Resource objects
+        :returns:
+            A list of the resources for which the program evaluates to True,
+            in the original order
+        :raises ExpressionCannotEvaluateError:
+            If the program requires any resource other than resource_id
+
+        This gives the same answer as calling :meth:`evaluate_or_raise()` with
+        ``{resource_id: [resource]}`` for each resource separately, and
+        treating a failing expression as False, but each expression is only
+        analyzed once for the whole list.
+        """
+        # Expressions that need any other resources can never be evaluated
+        for expression in self._expression_list:
+            for other_resource_id in expression.resource_id_list:
+                if other_resource_id != resource_id:
+                    raise ExpressionCannotEvaluateError(
+                        expression, other_resource_id)
+        resource_list = list(resource_list)
+        for expression in self._expression_list:
+            resource_list = expression.select_resources(resource_list)
+        return resource_list
+
 
 class ResourceProgramError(Exception):
     """
@@ -602,6 +738,10 @@ class ResourceExpression:
                 if not isinstance(resource, Resource):
                     raise TypeError(
                         "Each resource must be a Resource instance")
+        if len(resource_list_list) == 1:
+            # Most expressions reference exactly one resource, there is no
+            # need to compute the cartesian product of resource lists then.
+            return self._evaluate_one(resource_list_list[0])
         # Try each resource in sequence.
         for resource_pack in itertools.product(*resource_list_list):
             # Attempt to evaluate the code with the current resource
@@ -625,6 +765,63 @@ class ResourceExpression:
         # documentation side.
         return False
 
+    def _evaluate_one(self, resource_list):
+        """
+        Evaluate the expression against a single list of resources
+
+        This is a variant of :meth:`evaluate()` for expressions that reference
+        only one resource.
+        """
+        fn = self._lambda
+        for resource in resource_list:
+            try:
+                if fn(resource):
+                    return True
+            except Exception as exc:
+                # Treat any exception as a non-fatal error
+                logger.debug(
+                    _("Exception in requirement expression %r (with %s=%r):"
+                      " %r"),
+                    self._text, self._resource_id_list, resource, exc)
+        return False
+
+    def select_resources(self, resource_list):
+        """
+        Select the resources that make the expression evaluate to True.
+
+        :param resource_list:
+            A list of Resource objects
+        :returns:
+            A list of the resources for which the expression evaluates to a
+            true value, in the original order
+
+        This is a variant of :meth:`evaluate()` that gives a separate answer
+        for each resource. Each of the resources referenced by the expression
+        is bound to the same resource object.
+        """
+        for resource in resource_list:
+            if not isinstance(resource, Resource):
+                raise TypeError(
+                    "Each resource must be a Resource instance")
+        if len(self._resource_alias_list) != 1:
+            return [
+                resource for resource in resource_list
+                if self.evaluate(*[[resource]] * len(
+                    self._resource_alias_list))]
+        fn = self._lambda
+        selected = []
+        for resource in resource_list:
+            try:
+                if fn(resource):
+                    selected.append(resource)
+            except Exception as exc:
+                # Treat any exception as a non-fatal error
+                logger.debug(
+                    _("Exception in requirement expression %r (with %s=%r):"
+                      " %r"),
+                    self._text, self._resource_id_list, resource, exc)
+        return selected
+
     @classmethod
     def _analyze(cls, text):
         """
@@ -34,8 +34,13 @@ import inspect
 import io
 import json
 import logging
+import mmap
+import os
 import re
+import struct
+import threading
 from collections import namedtuple
+from contextlib import contextmanager
 
 from plainbox.abc import IJobResult
 from plainbox.i18n import gettext as _
@@ -77,6 +82,23 @@ ANSI_ESCAPE_SEQ_RE_STR = re.compile("(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]")
 #   data - the actual IO seen (bytes)
 IOLogRecord = namedtuple("IOLogRecord", "delay stream_name data".split())
 
+# Binary I/O log format
+#
+# The file starts with a header made out of the magic string and the format
+# version (unsigned 16 bit integer). The header is followed by any number of
+# records. Each record has a fixed-size record header, with the delay (double
+# precision float), stream identifier (unsigned byte) and the size of the data
+# (unsigned 32 bit integer), followed by the raw data bytes. All numbers are
+# stored in little-endian byte order.
+IO_LOG_MAGIC = b'PBIOLOG\n'
+IO_LOG_VERSION = 1
+_IO_LOG_HEADER = struct.Struct('<8sH')
+_IO_LOG_RECORD_HEADER = struct.Struct('<dBI')
+_IO_LOG_STREAM_NAME_LIST = ('stdout', 'stderr')
+_IO_LOG_STREAM_ID_MAP = {
+    stream_name: stream_id
+    for stream_id, stream_name in enumerate(_IO_LOG_STREAM_NAME_LIST)}
+
 
 # Tuple representing meta-data associated with each possible value of "outcome"
 #
@@ -533,8 +555,18 @@ class DiskJobResult(_JobResultBase):
         return self._data.get("io_log_filename")
 
     def get_io_log(self):
+        cache = IOLogCache.get_active()
+        if cache is not None and self.io_log_filename:
+            return iter(cache.get_io_log(self))
+        return self._read_io_log()
+
+    def _read_io_log(self):
         record_path = self.io_log_filename
-        if record_path:
+        if record_path and is_binary_io_log(record_path):
+            with BinaryIOLogRecordReader(record_path) as reader:
+                for record in reader:
+                    yield record
+        elif record_path:
             with GzipFile(record_path, mode='rb') as gzip_stream, \
                     io.TextIOWrapper(gzip_stream, encoding='UTF-8') as stream:
                 for record in IOLogRecordReader(stream):
@@ -550,6 +582,79 @@ class DiskJobResult(_JobResultBase):
         return super(DiskJobResult, self).io_log
 
 
+class IOLogCache:
+
+    """
+    Cache of I/O log records of :class:`DiskJobResult` objects.
+
+    A cache is only used by the threads that activate it (see
+    :meth:`activated()`). The I/O log of each disk job result is then read
+    and decompressed only once, no matter how many times and from how many
+    of those threads it is accessed. This helps when several exporters
+    process the same session, as each of them looks at every I/O log.
+    """
+
+    # The cache activated in each thread
+    _local = threading.local()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._record_map = {}
+        self._lock_map = {}
+
+    @classmethod
+    def get_active(cls):
+        """Get the cache that is active in the calling thread, if any."""
+        return getattr(cls._local, 'cache', None)
+
+    @contextmanager
+    def activated(self):
+        """
+        Context manager that activates the cache in the calling thread.
+
+        Other threads are not affected. The previously active cache, if any,
+        is active again when the ``with`` block ends.
+        """
+        previous = self.get_active()
+        self._local.cache = self
+        try:
+            yield self
+        finally:
+            self._local.cache = previous
+
+    def clear(self):
+        """Release all the cached records."""
+        with self._lock:
+            self._record_map.clear()
+            self._lock_map.clear()
+
+    def get_io_log(self, result):
+        """
+        Get all the I/O log records of a disk job result.
+
+        :param result:
+            A :class:`DiskJobResult` instance
+        :returns:
+            A tuple of :class:`IOLogRecord`
+        """
+        record_path = result.io_log_filename
+        with self._lock:
+            try:
+                return self._record_map[record_path]
+            except KeyError:
+                path_lock = self._lock_map.setdefault(
+                    record_path, threading.Lock())
+        # Only one thread reads a given log, the others wait for it
+        with path_lock:
+            with self._lock:
+                if record_path in self._record_map:
+                    return self._record_map[record_path]
+            record_tuple = tuple(result._read_io_log())
+            with self._lock:
+                self._record_map[record_path] = record_tuple
+        return record_tuple
+
+
 class IOLogRecordWriter:
 
     """Class for writing :class:`IOLogRecord` instances to a text stream."""
@@ -609,3 +714,186 @@ class IOLogRecordReader:
             if record is None:
                 break
             yield record
+
+
+def is_binary_io_log(filename):
+    """
+    Check if a file contains I/O log records in the binary format.
+
+    :param filename:
+        Name of the file to check
+    :returns:
+        True if the file starts with the header of the binary format (as
+        written by :class:`BinaryIOLogRecordWriter`), False otherwise (this
+        includes the older, gzip-compressed, text format)
+    """
+    with open(filename, 'rb') as stream:
+        return stream.read(len(IO_LOG_MAGIC)) == IO_LOG_MAGIC
+
+
+class BinaryIOLogRecordWriter:
+
+    """
+    Class for writing :class:`IOLogRecord` instances to a binary stream.
+
+    The header of the format is written as soon as the writer is created.
+    Unlike :class:`IOLogRecordWriter` the data is stored verbatim, without
+    any encoding.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.stream.write(_IO_LOG_HEADER.pack(IO_LOG_MAGIC, IO_LOG_VERSION))
+
+    def close(self):
+        self.stream.close()
+
+    def write_record(self, record):
+        """
+        Write an :class:`IOLogRecord` to the stream.
+
+        :raises ValueError:
+            If the record uses a stream other than stdout or stderr
+        """
+        try:
+            stream_id = _IO_LOG_STREAM_ID_MAP[record[1]]
+        except KeyError:
+            raise ValueError(
+                _("unsupported I/O log stream: {!r}").format(record[1]))
+        self.stream.write(_IO_LOG_RECORD_HEADER.pack(
+            record[0], stream_id, len(record[2])))
+        self.stream.write(record[2])
+
+
+class BinaryIOLogRecordReader:
+
+    """
+    Class for random access to :class:`IOLogRecord` instances in a file.
+
+    The file (as written by :class:`BinaryIOLogRecordWriter`) is memory-mapped
+    so records can be retrieved by their index without reading or decoding
+    anything that comes before them. Iterating over the reader generates
+    records with a copy of the data (bytes). The :meth:`get_record_view()`
+    and :meth:`iter_record_views()` methods generate records where the data is
+    a memoryview of the mapped file instead.
+
+    A truncated record at the end of the file (for example, when the process
+    writing the log was interrupted) is silently ignored.
+
+    .. note::
+        Memory views are only valid until the reader is closed and must be
+        released before that happens.
+    """
+
+    def __init__(self, filename):
+        """
+        Open a file with I/O log records.
+
+        :raises ValueError:
+            If the file is not in the binary I/O log format or if the format
+            version is not supported.
+        """
+        with open(filename, 'rb') as stream:
+            if os.fstat(stream.fileno()).st_size < _IO_LOG_HEADER.size:
+                raise ValueError(
+                    _("{!r} is not a binary I/O log").format(filename))
+            self._mmap = mmap.mmap(
+                stream.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _IO_LOG_HEADER.unpack_from(self._mmap)
+        if magic != IO_LOG_MAGIC:
+            self._mmap.close()
+            raise ValueError(
+                _("{!r} is not a binary I/O log").format(filename))
+        if version != IO_LOG_VERSION:
+            self._mmap.close()
+            raise ValueError(
+                _("unsupported I/O log version: {}").format(version))
+        self._offset_list = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def _get_offset_list(self):
+        """
+        Get a list of offsets of all the records in the file.
+
+        The list is computed on first use by looking at the record headers
+        alone.
+        """
+        if self._offset_list is None:
+            offset_list = []
+            offset = _IO_LOG_HEADER.size
+            size = len(self._mmap)
+            while offset + _IO_LOG_RECORD_HEADER.size <= size:
+                data_size = _IO_LOG_RECORD_HEADER.unpack_from(
+                    self._mmap, offset)[2]
+                if offset + _IO_LOG_RECORD_HEADER.size + data_size > size:
+                    break
+                offset_list.append(offset)
+                offset += _IO_LOG_RECORD_HEADER.size + data_size
+            self._offset_list = offset_list
+        return self._offset_list
+
+    def __len__(self):
+        """Get the number of records in the file."""
+        return len(self._get_offset_list())
+
+    def _unpack(self, offset):
+        delay, stream_id, data_size = _IO_LOG_RECORD_HEADER.unpack_from(
+            self._mmap, offset)
+        start = offset + _IO_LOG_RECORD_HEADER.size
+        return delay, _IO_LOG_STREAM_NAME_LIST[stream_id], start, data_size
+
+    def get_record(self, index):
+        """
+        Get the record with the given index.
+
+        :returns:
+            An :class:`IOLogRecord` with a copy of the data
+        :raises IndexError:
+            If there is no such record
+        """
+        delay, stream_name, start, size = self._unpack(
+            self._get_offset_list()[index])
+        return IOLogRecord(delay, stream_name, self._mmap[start:start + size])
+
+    def get_record_view(self, index):
+        """
+        Get the record with the given index, without copying the data.
+
+        :returns:
+            An :class:`IOLogRecord` with a memoryview of the data
+        :raises IndexError:
+            If there is no such record
+        """
+        delay, stream_name, start, size = self._unpack(
+            self._get_offset_list()[index])
+        return IOLogRecord(
+            delay, stream_name, memoryview(self._mmap)[start:start + size])
+
+    def iter_record_views(self, start=0):
+        """
+        Iterate over records without copying the data.
+
+        :param start:
+            Index of the first record to generate
+        :returns:
+            A generator of :class:`IOLogRecord` with a memoryview of the data
+        """
+        for index in range(start, len(self)):
+            yield self.get_record_view(index)
+
+    def __iter__(self):
+        """
+        Iterate over all the records.
+
+        This method generates subsequent :class:`IOLogRecord` entries.
+        """
+        for index in range(len(self)):
+            yield self.get_record(index)
@@ -30,8 +30,6 @@ Definition of JobRunner class.
 
 import collections
 import datetime
-import gzip
-import io
 import logging
 import os
 import string
@@ -40,8 +38,8 @@ import time
 
 from plainbox.abc import IJobResult, IJobRunner
 from plainbox.i18n import gettext as _
+from plainbox.impl.result import BinaryIOLogRecordWriter
 from plainbox.impl.result import IOLogRecord
-from plainbox.impl.result import IOLogRecordWriter
 from plainbox.impl.result import JobResultBuilder
 from plainbox.vendor import extcmd
 from plainbox.vendor import morris
@@ -735,10 +733,8 @@ class JobRunner(IJobRunner):
         extcmd_popen = delegate_cls(delegate)
         # Stream all IOLogRecord entries to disk
         record_path = self.get_record_path_for_job(job)
-        with gzip.open(record_path, mode='wb') as gzip_stream, \
-                io.TextIOWrapper(
-                    gzip_stream, encoding='UTF-8') as record_stream:
-            writer = IOLogRecordWriter(record_stream)
+        with open(record_path, mode='wb') as record_stream:
+            writer = BinaryIOLogRecordWriter(record_stream)
             io_log_gen.on_new_record.connect(writer.write_record)
             try:
                 # Start the process and wait for it to finish getting the
@@ -775,7 +771,7 @@ class JobRunner(IJobRunner):
 
     def get_record_path_for_job(self, job):
         return os.path.join(self._jobs_io_log_dir,
-                            "{}.record.gz".format(slugify(job.id)))
+                            "{}.record.bin".format(slugify(job.id)))
 
     def _get_dry_run_result(self, job):
         """
@@ -873,7 +869,7 @@ class JobRunner(IJobRunner):
 
         :returns: (return_code, record_path) where return_code is the number
         returned by the exiting child process while record_path is a pathname
-        of a gzipped content readable with :class:`IOLogRecordReader`
+        of a file readable with :class:`BinaryIOLogRecordReader`
         """
         # Bail early if there is nothing do do
         if job.command is None:
@@ -889,13 +885,9 @@ class JobRunner(IJobRunner):
             flags |= extcmd.CHUNKED_IO
         extcmd_popen = delegate_cls(delegate, flags=flags)
         # Stream all IOLogRecord entries to disk
-        record_path = os.path.join(
-            self._jobs_io_log_dir, "{}.record.gz".format(
-                slugify(job.id)))
-        with gzip.open(record_path, mode='wb') as gzip_stream, \
-                io.TextIOWrapper(
-                    gzip_stream, encoding='UTF-8') as record_stream:
-            writer = IOLogRecordWriter(record_stream)
+        record_path = self.get_record_path_for_job(job)
+        with open(record_path, mode='wb') as record_stream:
+            writer = BinaryIOLogRecordWriter(record_stream)
             io_log_gen.on_new_record.connect(writer.write_record)
             try:
                 # Start the process and wait for it to finish getting the
@@ -22,7 +22,9 @@ plainbox.impl.secure.providers.test_v1
 Test definitions for plainbox.impl.secure.providers.v1 module
 """
 
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+import os
 
 from plainbox.impl.job import JobDefinition
 from plainbox.impl.secure.config import Unset
@@ -35,12 +37,14 @@ from plainbox.impl.secure.providers.v1 import IQNValidator
 from plainbox.impl.secure.providers.v1 import Provider1
 from plainbox.impl.secure.providers.v1 import Provider1Definition
 from plainbox.impl.secure.providers.v1 import Provider1PlugIn
+from plainbox.impl.secure.providers.v1 import Provider1PlugInCollection
 from plainbox.impl.secure.providers.v1 import UnitPlugIn
 from plainbox.impl.secure.providers.v1 import VersionValidator
 from plainbox.impl.secure.providers.v1 import WhiteListPlugIn
 from plainbox.impl.secure.qualifiers import WhiteList
 from plainbox.impl.secure.rfc822 import FileTextSource
 from plainbox.impl.secure.rfc822 import Origin
+from plainbox.impl.secure.rfc822 import load_rfc822_records
 from plainbox.impl.unit.file import FileUnit
 from plainbox.vendor import mock
 
@@ -672,6 +676,22 @@ class UnitPlugInTests(TestCase):
             ("Cannot load job definitions from '/path/to/jobs.txt': "
              "Unexpected non-empty line: 'broken' (line 1)"))
 
+    def test_unit_cache(self):
+        """
+        verify that UnitPlugIn() loads records with the unit cache, if any
+        """
+        text = "id: test/job\nplugin: shell\n"
+        unit_cache = mock.Mock(name="unit_cache")
+        unit_cache.load_rfc822_records.return_value = load_rfc822_records(
+            "id: cached/job\nplugin: shell\ncommand: true\n",
+            source=FileTextSource("/path/to/jobs.txt"))
+        plugin = UnitPlugIn(
+            "/path/to/jobs.txt", text, self.LOAD_TIME, self.provider,
+            unit_cache=unit_cache)
+        unit_cache.load_rfc822_records.assert_called_once_with(
+            "/path/to/jobs.txt", text)
+        self.assertEqual(plugin.plugin_object[0].partial_id, "cached/job")
+
 
 class Provider1Tests(TestCase):
 
@@ -915,3 +935,68 @@ class Provider1Tests(TestCase):
             self.WHITELISTS_DIR, self.DATA_DIR, self.BIN_DIR, locale_dir=None,
             base_dir=self.BASE_DIR)
         self.assertEqual(mock_gettext.bindtextdomain.call_args_list, [])
+
+
+class Provider1PlugInCollectionTests(TestCase):
+
+    def setUp(self):
+        self._tmpdir = TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.location = self._tmpdir.name
+        for name in ('b', 'a', 'c'):
+            provider_dir = os.path.join(self.location, name)
+            os.makedirs(os.path.join(provider_dir, 'whitelists'))
+            with open(os.path.join(provider_dir, 'whitelists',
+                                   name + '.whitelist'), 'wt') as stream:
+                stream.write("job-{}\n".format(name))
+            with open(os.path.join(self.location, name + '.provider'),
+                      'wt') as stream:
+                stream.write(
+                    "[PlainBox Provider]\n"
+                    "name = 2016.org.example:{}\n"
+                    "version = 1.0\n"
+                    "location = {}\n".format(name, provider_dir))
+        with open(os.path.join(self.location, 'broken.provider'),
+                  'wt') as stream:
+            stream.write(
+                "[PlainBox Provider]\n"
+                "name = broken\n"
+                "version = 1.0\n")
+
+    def _load(self, max_workers):
+        collection = Provider1PlugInCollection(
+            [self.location], max_workers=max_workers)
+        collection.load()
+        return collection
+
+    def test_load__sequential(self):
+        collection = self._load(None)
+        self.assertIsNone(collection.max_workers)
+        self.assertEqual(
+            [plugin.plugin_name for plugin in collection.get_all_plugins()],
+            ["2016.org.example:a", "2016.org.example:b",
+             "2016.org.example:c"])
+        # Content is loaded on demand
+        for provider in collection.get_all_plugin_objects():
+            self.assertFalse(provider._loader.is_loaded)
+        self.assertEqual(len(collection.problem_list), 1)
+
+    def test_load__parallel(self):
+        sequential = self._load(None)
+        collection = self._load(4)
+        self.assertEqual(collection.max_workers, 4)
+        # Same providers, in the same order and with the same problems
+        self.assertEqual(
+            collection.get_all_names(), sequential.get_all_names())
+        self.assertEqual(
+            [str(exc) for exc in collection.problem_list],
+            [str(exc) for exc in sequential.problem_list])
+        # Content is loaded eagerly and accounted for in the wrap time
+        for plugin in collection.get_all_plugins():
+            self.assertTrue(plugin.plugin_object._loader.is_loaded)
+            self.assertGreater(plugin.plugin_wrap_time, 0)
+            self.assertGreaterEqual(plugin.plugin_load_time, 0)
+        self.assertEqual(
+            [[whitelist.name for whitelist in provider.whitelist_list]
+             for provider in collection.get_all_plugin_objects()],
+            [['a'], ['b'], ['c']])
@@ -24,6 +24,7 @@
 =========================================================================
 """
 import collections
+import concurrent.futures
 import gettext
 import logging
 import os
@@ -78,8 +79,10 @@ class ProviderContentPlugIn(PlugIn):
 
     def __init__(self, filename, text, load_time, provider, *,
                  validate=False, validation_kwargs=None,
-                 check=True, context=None):
+                 check=True, context=None, unit_cache=None):
         start_time = now()
+        # NOTE: this is used by inspect(), if supported by the subclass
+        self._unit_cache = unit_cache
         try:
             # Inspect the file
             inspect_result = self.inspect(
@@ -212,10 +215,11 @@ class WhiteListPlugIn(ProviderContentPlugIn):
     # default to None. This is still used in some places and must be supported.
     def __init__(self, filename, text, load_time, provider=None, *,
                  validate=False, validation_kwargs=None,
-                 check=True, context=None):
+                 check=True, context=None, unit_cache=None):
         super().__init__(
             filename, text, load_time, provider, validate=validate,
-            validation_kwargs=validation_kwargs, check=check, context=context)
+            validation_kwargs=validation_kwargs, check=check, context=context,
+            unit_cache=unit_cache)
 
     # NOTE: this version of plugin_name() is just for legacy code support
     @property
@@ -263,8 +267,11 @@ class UnitPlugIn(ProviderContentPlugIn):
         """
         logger.debug(_("Loading units from %r..."), filename)
         try:
-            records = load_rfc822_records(
-                text, source=FileTextSource(filename))
+            if self._unit_cache is not None:
+                records = self._unit_cache.load_rfc822_records(filename, text)
+            else:
+                records = load_rfc822_records(
+                    text, source=FileTextSource(filename))
         except RFC822SyntaxError as exc:
             raise PlugInError(
                 _("Cannot load job definitions from {!r}: {}").format(
@@ -737,7 +744,8 @@ class Provider1(IProvider1):
     def __init__(self, name, namespace, version, description, secure,
                  gettext_domain, units_dir, jobs_dir, whitelists_dir, data_dir,
                  bin_dir, locale_dir, base_dir, *, validate=False,
-                 validation_kwargs=None, check=True, context=None):
+                 validation_kwargs=None, check=True, context=None,
+                 unit_cache=None):
         """
         Initialize a provider with a set of meta-data and directories.
 
@@ -798,6 +806,11 @@ class Provider1(IProvider1):
         :param validation_kwargs:
             Keyword arguments to pass to the JobDefinition.validate().  Note,
             this is a single argument. This is a keyword-only argument.
+
+        :param unit_cache:
+            An optional cache of parsed unit files, see
+            :class:`plainbox.impl.providers.cache.RFC822RecordCache`. This is
+            a keyword-only argument.
         """
         # Meta-data
         if namespace is None:
@@ -828,7 +841,9 @@ class Provider1(IProvider1):
             'validation_kwargs': validation_kwargs,
             'check': check,
             'context': context,
+            'unit_cache': unit_cache,
         }
+        self._unit_cache = unit_cache
         # Setup provider specific i18n
         self._setup_translations()
         logger.info("Provider initialized %s", self)
@@ -850,7 +865,7 @@ class Provider1(IProvider1):
     @classmethod
     def from_definition(cls, definition, secure, *,
                         validate=False, validation_kwargs=None, check=True,
-                        context=None):
+                        context=None, unit_cache=None):
         """
         Initialize a provider from Provider1Definition object
 
@@ -887,7 +902,8 @@ class Provider1(IProvider1):
             definition.effective_whitelists_dir, definition.effective_data_dir,
             definition.effective_bin_dir, definition.effective_locale_dir,
             definition.location or None, validate=validate,
-            validation_kwargs=validation_kwargs, check=check, context=context)
+            validation_kwargs=validation_kwargs, check=check, context=context,
+            unit_cache=unit_cache)
 
     def __repr__(self):
         return "<{} name:{!r}>".format(self.__class__.__name__, self.name)
@@ -1205,6 +1221,13 @@ class Provider1(IProvider1):
         """
         return self._enumerator.content_collection
 
+    @property
+    def unit_cache(self):
+        """
+        cache of parsed unit files used by this provider (may be None)
+        """
+        return self._unit_cache
+
     @property
     def fake(self):
         """
@@ -1685,9 +1708,14 @@ class Provider1PlugIn(PlugIn):
     """
 
     def __init__(self, filename, definition_text, load_time, *, validate=None,
-                 validation_kwargs=None, check=None, context=None):
+                 validation_kwargs=None, check=None, context=None,
+                 unit_cache=None, load_content=False):
         """
         Initialize the plug-in with the specified name and external object
+
+        If ``load_content`` is True then all of the content of the provider is
+        loaded right away (it is loaded on demand otherwise) and the time that
+        took is a part of :attr:`plugin_wrap_time`.
         """
         start = now()
         self._load_time = load_time
@@ -1719,7 +1747,10 @@ class Provider1PlugIn(PlugIn):
         # Initialize the provider object
         provider = Provider1.from_definition(
             definition, secure, validate=validate,
-            validation_kwargs=validation_kwargs, check=check, context=context)
+            validation_kwargs=validation_kwargs, check=check, context=context,
+            unit_cache=unit_cache)
+        if load_content:
+            provider._ensure_loaded()
         wrap_time = now() - start
         super().__init__(provider.name, provider, load_time, wrap_time)
 
@@ -1749,7 +1780,77 @@ def get_secure_PROVIDERPATH_list():
                 "/usr/share/plainbox-providers-1"]
 
 
-class SecureProvider1PlugInCollection(FsPlugInCollection):
+class Provider1PlugInCollection(FsPlugInCollection):
+    """
+    A collection of v1 provider plugins, loaded from ``.provider`` files.
+
+    By default each provider is loaded sequentially and the content of each
+    provider is loaded on demand, the first time it is needed. If
+    ``max_workers`` is set then all of the providers, together with their
+    content, are loaded by a pool of that many threads. The set of providers
+    and their order is the same in both cases and so is the meaning of
+    :attr:`Provider1PlugIn.plugin_load_time` and
+    :attr:`Provider1PlugIn.plugin_wrap_time`, the latter includes the time
+    spent loading provider content.
+    """
+
+    def __init__(self, dir_list, *, max_workers=None, **kwargs):
+        self._max_workers = max_workers
+        if max_workers is not None:
+            kwargs['load_content'] = True
+        super().__init__(dir_list, '.provider', wrapper=Provider1PlugIn,
+                         **kwargs)
+
+    @property
+    def max_workers(self):
+        """
+        number of threads used to load providers or None
+        """
+        return self._max_workers
+
+    def load(self):
+        if self._max_workers is None:
+            return super().load()
+        if self._loaded:
+            return
+        self._loaded = True
+        start_time = now()
+        filename_list = list(self._get_plugin_files())
+        filename_list.sort()
+        self._discovery_time = now() - start_time
+        # NOTE: all_units is loaded on demand by UnitPlugIn but loading it is
+        # not thread-safe. Load it now, before any of the workers need it.
+        all_units.load()
+        with concurrent.futures.ThreadPoolExecutor(
+                self._max_workers) as executor:
+            future_list = [
+                executor.submit(self._load_one, filename)
+                for filename in filename_list]
+            # NOTE: the results are collected in the order of filename_list so
+            # that the outcome doesn't depend on the scheduling of workers.
+            for filename, future in zip(filename_list, future_list):
+                try:
+                    wrapper = future.result()
+                except (OSError, IOError) as exc:
+                    logger.error(
+                        _("Unable to load %r: %s"), filename, str(exc))
+                    self._problem_list.append(exc)
+                except PlugInError as exc:
+                    logger.warning(
+                        _("Unable to prepare plugin %s: %s"), filename, exc)
+                    self._problem_list.append(exc)
+                else:
+                    self._plugins[filename] = wrapper
+
+    def _load_one(self, filename):
+        start_time = now()
+        text = self._get_file_text(filename)
+        return self._wrapper(
+            filename, text, now() - start_time,
+            *self._wrapper_args, **self._wrapper_kwargs)
+
+
+class SecureProvider1PlugInCollection(Provider1PlugInCollection):
     """
     A collection of v1 provider plugins.
 
@@ -1767,8 +1868,7 @@ class SecureProvider1PlugInCollection(FsPlugInCollection):
 
     def __init__(self, **kwargs):
         dir_list = get_secure_PROVIDERPATH_list()
-        super().__init__(dir_list, '.provider', wrapper=Provider1PlugIn,
-                         **kwargs)
+        super().__init__(dir_list, **kwargs)
 
 
 # Collection of all providers
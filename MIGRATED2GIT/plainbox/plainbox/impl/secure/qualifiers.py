@@ -26,6 +26,7 @@ some set of rules.
 """
 
 import abc
+import bisect
 import functools
 import itertools
 import logging
@@ -640,6 +641,102 @@ def get_flat_primitive_qualifier_list(qualifier_list):
         for qual in qualifier_list]))
 
 
+# Characters with a special meaning in regular expressions. Patterns without
+# any of them (except for escaped punctuation) match literal text.
+_RE_META_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+# Flags of a pattern compiled without any flags
+_RE_DEFAULT_FLAGS = re.compile('').flags
+
+# Python 3.4 and older can't compile patterns with 100 groups or more
+_RE_MAX_GROUPS = 99
+
+
+def _get_literal(text):
+    """
+    Get the text matched by a regular expression made of literal characters.
+
+    :returns:
+        The matched text or None if the expression is not a literal one
+    """
+    char_list = []
+    escaped = False
+    for char in text:
+        if escaped:
+            # Escaped letters and digits are classes or references
+            if char.isalnum() or char == '_':
+                return None
+            char_list.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char in _RE_META_CHARS:
+            return None
+        else:
+            char_list.append(char)
+    if escaped:
+        return None
+    return ''.join(char_list)
+
+
+def _classify_id_pattern(pattern):
+    """
+    Classify a compiled job id pattern, as used with ``pattern.match()``.
+
+    :returns:
+        A pair (kind, literal). Kind is 'exact' if the pattern matches just
+        the literal text, 'prefix' if it matches text starting with the
+        literal text and 'regex' (with None as literal) otherwise.
+    """
+    text = pattern.pattern
+    if pattern.flags != _RE_DEFAULT_FLAGS:
+        return 'regex', None
+    if text.startswith('^'):
+        text = text[1:]
+    if text.endswith('.*$'):
+        kind, literal = 'prefix', _get_literal(text[:-3])
+    elif text.endswith('.*'):
+        kind, literal = 'prefix', _get_literal(text[:-2])
+    elif text.endswith('$'):
+        kind, literal = 'exact', _get_literal(text[:-1])
+    else:
+        kind, literal = 'prefix', _get_literal(text)
+    if literal is None:
+        return 'regex', None
+    return kind, literal
+
+
+def _get_id_pattern(qualifier):
+    """Get the compiled pattern a qualifier matches job ids with, if any."""
+    if isinstance(qualifier, RegExpJobQualifier):
+        return qualifier._pattern
+    if (isinstance(qualifier, FieldQualifier) and
+            qualifier.field == 'id' and
+            isinstance(qualifier.matcher, PatternMatcher)):
+        return qualifier.matcher._pattern
+
+
+def _get_combined_patterns(pattern_list):
+    """
+    Combine (qualifier index, pattern) pairs into alternations.
+
+    :returns:
+        A list of (qualifier index list, compiled pattern) pairs. Matching a
+        job id against the compiled pattern tells if any of the patterns
+        matches it and which one is the first one that does: it's the one
+        at ``qualifier_index_list[match.lastindex - 1]``.
+    """
+    combined_list = []
+    for start in range(0, len(pattern_list), _RE_MAX_GROUPS):
+        chunk = pattern_list[start:start + _RE_MAX_GROUPS]
+        combined_list.append((
+            [q_index for q_index, pattern in chunk],
+            re.compile('|'.join(
+                '({})'.format(pattern.pattern) for q_index, pattern in chunk))
+        ))
+    return combined_list
+
+
 def select_jobs(job_list, qualifier_list):
     """
     Select desired jobs.
@@ -654,8 +751,7 @@ def select_jobs(job_list, qualifier_list):
     # Flatten the qualifier list, so that we can see the fine structure of
     # composite objects, such as whitelists.
     flat_qualifier_list = get_flat_primitive_qualifier_list(qualifier_list)
-    # Short-circuit if there are no jobs to select. Min is used later and this
-    # will allow us to assume that the matrix is not empty.
+    # Short-circuit if there are no jobs to select.
     if not flat_qualifier_list:
         return []
     # Vote matrix, encodes the vote cast by a particular qualifier for a
@@ -680,74 +776,107 @@ def select_jobs(job_list, qualifier_list):
     #
     # The result of the select_job() function is a list of jobs that have at
     # least one inclusion and no exclusions. The resulting list is ordered by
-    # increasing qualifier index.
-    #
-    # The algorithm implemented below is composed of two steps.
+    # increasing qualifier index (and then by increasing job index).
     #
-    # The first step iterates over the vote matrix (row-major, meaning that we
-    # visit all columns for each visit of one row) and constructs two
-    # structures: a set of jobs that got VOTE_INCLUDE and a list of those jobs,
-    # in the order of discovery. All VOTE_EXCLUDE votes are collected in
-    # another set.
+    # So all that is needed is, for each job, the index of the first
+    # qualifier that includes it and whether any qualifier excludes it. The
+    # whole matrix doesn't have to be visited to find that out. Qualifiers
+    # that match job ids are sorted into three classes:
     #
-    # The second step filters-out all items from the excluded job set from the
-    # selected job list. For extra efficiency the algorithm operates on
-    # integers representing the index of a particular job in job_list.
+    # - exact ids (and patterns without any special characters), that may
+    #   select at most one job, are looked up in a map of job ids,
+    # - patterns that match a literal prefix ("foo/.*"), which may select
+    #   a range of job ids, are looked up in a sorted list of job ids,
+    # - all the other regular expressions are combined into a few big
+    #   alternations, so that each job id is matched once, instead of once
+    #   for each pattern.
     #
-    # The final complexity is O(N x M) + O(M), where N is the number of
-    # qualifiers (flattened) and M is the number of jobs. The algorithm assumes
-    # that set lookup is a O(1) operation which is true enough for python.
-    #
-    # A possible optimization would differentiate qualifiers that may select
-    # more than one job and fall-back to the current implementation while
-    # short-circuiting qualifiers that may select at most one job with a
-    # separate set lookup. That would make the algorithm "mostly" linear in the
-    # common case.
+    # Any other qualifier still has to vote on each job. For extra efficiency
+    # the algorithm operates on integers representing the index of
+    # a particular job in job_list.
     #
     # As a separate feature, we might return a list of qualifiers that never
     # matched anything. That may be helpful for debugging.
-    included_list = []
-    id_to_index_map = {job.id: index for index, job in enumerate(job_list)}
-    included_set = set()
+    id_list = [job.id for job in job_list]
+    id_to_index_list_map = {}
+    for j_index, job_id in enumerate(id_list):
+        id_to_index_list_map.setdefault(job_id, []).append(j_index)
+    sorted_id_list = None
+    # Index of the first qualifier that included each job
+    included_map = {}
     excluded_set = set()
-    for qualifier in flat_qualifier_list:
+    include_pattern_list = []
+    exclude_pattern_list = []
+    for q_index, qualifier in enumerate(flat_qualifier_list):
+        j_index_list = None
+        pattern = _get_id_pattern(qualifier)
         if (isinstance(qualifier, FieldQualifier) and
                 qualifier.field == 'id' and
                 isinstance(qualifier.matcher, OperatorMatcher) and
                 qualifier.matcher.op == operator.eq):
-            # optimize the super-common case where a qualifier refers to
-            # a specific job by using the id_to_index_map to instantly
-            # perform the requested operation on a single job
-            try:
-                j_index = id_to_index_map[qualifier.matcher.value]
-            except KeyError:
-                # The lookup can fail if the pattern is a constant reference to
-                # a generated job that doens't exist yet. To maintain
-                # correctness we should just ignore it, as it would not
-                # match anything yet.
+            # The lookup can fail if the pattern is a constant reference to
+            # a generated job that doens't exist yet. To maintain
+            # correctness we should just ignore it, as it would not
+            # match anything yet.
+            j_index_list = id_to_index_list_map.get(
+                qualifier.matcher.value, ())
+        elif isinstance(qualifier, JobIdQualifier):
+            j_index_list = id_to_index_list_map.get(qualifier.id, ())
+        elif pattern is not None:
+            kind, literal = _classify_id_pattern(pattern)
+            if kind == 'exact':
+                # '$' matches before a trailing newline as well
+                j_index_list = (
+                    id_to_index_list_map.get(literal, []) +
+                    id_to_index_list_map.get(literal + '\n', []))
+            elif kind == 'prefix':
+                if sorted_id_list is None:
+                    sorted_id_list = sorted(id_to_index_list_map)
+                j_index_list = []
+                pos = bisect.bisect_left(sorted_id_list, literal)
+                while (pos < len(sorted_id_list) and
+                       sorted_id_list[pos].startswith(literal)):
+                    j_index_list.extend(
+                        id_to_index_list_map[sorted_id_list[pos]])
+                    pos += 1
+            elif pattern.groups == 0 and pattern.flags == _RE_DEFAULT_FLAGS:
+                if qualifier.inclusive:
+                    include_pattern_list.append((q_index, pattern))
+                else:
+                    exclude_pattern_list.append((q_index, pattern))
                 continue
-            job = job_list[j_index]
-            vote = qualifier.get_vote(job)
+        if j_index_list is None:
+            j_index_list = range(len(job_list))
+        # The candidate jobs found above may still not match (e.g. prefix
+        # patterns don't match ids with newlines), let the qualifier vote.
+        for j_index in j_index_list:
+            vote = qualifier.get_vote(job_list[j_index])
             if vote == IJobQualifier.VOTE_INCLUDE:
-                if j_index in included_set:
-                    continue
-                included_set.add(j_index)
-                included_list.append(j_index)
+                if j_index not in included_map:
+                    included_map[j_index] = q_index
             elif vote == IJobQualifier.VOTE_EXCLUDE:
                 excluded_set.add(j_index)
             elif vote == IJobQualifier.VOTE_IGNORE:
                 pass
-        else:
-            for j_index, job in enumerate(job_list):
-                vote = qualifier.get_vote(job)
-                if vote == IJobQualifier.VOTE_INCLUDE:
-                    if j_index in included_set:
-                        continue
-                    included_set.add(j_index)
-                    included_list.append(j_index)
-                elif vote == IJobQualifier.VOTE_EXCLUDE:
+    if include_pattern_list:
+        combined_list = _get_combined_patterns(include_pattern_list)
+        for j_index, job_id in enumerate(id_list):
+            for q_index_list, combined_pattern in combined_list:
+                match = combined_pattern.match(job_id)
+                if match is not None:
+                    q_index = q_index_list[match.lastindex - 1]
+                    if q_index < included_map.get(j_index, q_index + 1):
+                        included_map[j_index] = q_index
+                    break
+    if exclude_pattern_list:
+        combined_list = _get_combined_patterns(exclude_pattern_list)
+        for j_index, job_id in enumerate(id_list):
+            for q_index_list, combined_pattern in combined_list:
+                if combined_pattern.match(job_id) is not None:
                     excluded_set.add(j_index)
-                elif vote == IJobQualifier.VOTE_IGNORE:
-                    pass
-    return [job_list[index] for index in included_list
-            if index not in excluded_set]
+                    break
+    return [job_list[j_index]
+            for j_index in sorted(
+                included_map, key=lambda j_index: (included_map[j_index],
+                                                   j_index))
+            if j_index not in excluded_set]
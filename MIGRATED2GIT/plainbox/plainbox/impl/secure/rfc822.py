@@ -41,9 +41,14 @@ from plainbox.impl.secure.origin import UnknownTextSource
 logger = logging.getLogger("plainbox.secure.rfc822")
 
 
+# Pattern matching the multi-line dot marker
+_DOT_MARKER_RE = re.compile(r'^(\s*)\.$', flags=re.M)
+
+
 def normalize_rfc822_value(value):
     # Remove the multi-line dot marker
-    value = re.sub('^(\s*)\.$', '\\1', value, flags=re.M)
+    if '.' in value:
+        value = _DOT_MARKER_RE.sub('\\1', value)
     # Remove consistent indentation
     value = textwrap.dedent(value)
     # Strip the remaining whitespace
@@ -51,6 +56,19 @@ def normalize_rfc822_value(value):
     return value
 
 
+def _normalize_value(raw_value):
+    """
+    Same as :func:`normalize_rfc822_value()`, for use by the parser.
+
+    Most values fit on one line. For those the result is just the stripped
+    value, unless the value is the multi-line dot marker.
+    """
+    value = raw_value.strip()
+    if '\n' in value or value == '.':
+        value = normalize_rfc822_value(raw_value)
+    return value
+
+
 class RFC822Record:
     """
     Class for tracking RFC822 records.
@@ -259,11 +277,10 @@ def gen_rfc822_records(stream, data_cls=dict, source=None):
     the optional data_cls argument is collections.OrderedDict then the values
     retain their original ordering.
     """
-    record = None
-    key = None
-    value_list = None
-    origin = None
-    field_offset_map = None
+    # NOTE: this function is called for every unit file and for the output of
+    # every resource job. It is written as one flat loop, with all of the
+    # state in local variables, as that is considerably faster than a set of
+    # small helper functions sharing the state.
     # If the source was not provided then try constructing a FileTextSource
     # from the name of the stream. If that fails, keep using None.
     if source is None:
@@ -271,108 +288,80 @@ def gen_rfc822_records(stream, data_cls=dict, source=None):
             source = FileTextSource(stream.name)
         except AttributeError:
             source = UnknownTextSource()
-
-    def _syntax_error(msg):
-        """
-        Report a syntax error in the current line
-        """
-        try:
-            filename = stream.name
-        except AttributeError:
-            filename = None
-        return RFC822SyntaxError(filename, lineno, msg)
-
-    def _new_record():
-        """
-        Reset local state to track new record
-        """
-        nonlocal key
-        nonlocal value_list
-        nonlocal record
-        nonlocal origin
-        nonlocal field_offset_map
-        key = None
-        value_list = None
-        if source is not None:
-            origin = Origin(source, None, None)
-        field_offset_map = {}
-        record = RFC822Record(data_cls(), origin, data_cls(), field_offset_map)
-
-    def _commit_key_value_if_needed():
-        """
-        Finalize the most recently seen key: value pair
-        """
-        nonlocal key
-        if key is not None:
-            raw_value = ''.join(value_list)
-            normalized_value = normalize_rfc822_value(raw_value)
-            record.raw_data[key] = raw_value
-            record.data[key] = normalized_value
-            logger.debug(_("Committed key/value %r=%r"), key, normalized_value)
-            key = None
-
-    def _set_start_lineno_if_needed():
-        """
-        Remember the line number of the record start unless already set
-        """
-        if origin and record.origin.line_start is None:
-            record.origin.line_start = lineno
-
-    def _update_end_lineno():
-        """
-        Update the line number of the record tail
-        """
-        if origin:
-            record.origin.line_end = lineno
-
-    # Start with an empty record
-    _new_record()
     # Support simple text strings
     if isinstance(stream, str):
         # keepends=True (python3.2 has no keyword for this)
         stream = iter(stream.splitlines(True))
+    # Per-line debug messages are expensive, even if they are not shown
+    debug = logger.isEnabledFor(logging.DEBUG)
+    # The record being built, it is created when the first key is seen
+    record = None
+    data = raw_data = origin = field_offset_map = None
+    # The most recently seen key and the list of lines of its value
+    key = None
+    value_list = None
     # Iterate over subsequent lines of the stream
     for lineno, line in enumerate(stream, start=1):
-        logger.debug(_("Looking at line %d:%r"), lineno, line)
+        if debug:
+            logger.debug(_("Looking at line %d:%r"), lineno, line)
         # Treat # as comments
         if line.startswith("#"):
-            pass
+            continue
         # Treat empty lines as record separators
-        elif line.strip() == "":
+        if not line.strip():
+            if record is None:
+                continue
             # Commit the current record so that the multi-line value of the
             # last key, if any, is saved as a string
-            _commit_key_value_if_needed()
-            # If data is non-empty, yield the record, this allows us to safely
-            # use newlines for formatting
-            if record.data:
+            if key is not None:
+                raw_value = ''.join(value_list)
+                raw_data[key] = raw_value
+                data[key] = _normalize_value(raw_value)
+                if debug:
+                    logger.debug(
+                        _("Committed key/value %r=%r"), key, data[key])
+                key = None
+            # The record is non-empty (it was created for its first key) so
+            # yield it. This allows us to safely use newlines for formatting
+            if debug:
                 logger.debug(_("yielding record: %r"), record)
-                yield record
+            yield record
             # Reset local state so that we can build a new record
-            _new_record()
+            record = None
         # Treat lines staring with whitespace as multi-line continuation of the
         # most recently seen key-value
         elif line.startswith(" "):
             if key is None:
                 # If we have not seen any keys yet then this is a syntax error
-                raise _syntax_error(_("Unexpected multi-line value"))
+                raise RFC822SyntaxError(
+                    getattr(stream, 'name', None), lineno,
+                    _("Unexpected multi-line value"))
             # Strip the initial space. This matches the behavior of xgettext
-            # scanning our job definitions with multi-line values.
-            line = line[1:]
-            # Append the current line to the list of values of the most recent
-            # key. This prevents quadratic complexity of string concatenation
-            value_list.append(line)
+            # scanning our job definitions with multi-line values. Append the
+            # current line to the list of values of the most recent key. This
+            # prevents quadratic complexity of string concatenation
+            value_list.append(line[1:])
             # Update the end line location of this record
-            _update_end_lineno()
+            origin.line_end = lineno
         # Treat lines with a colon as new key-value pairs
         elif ":" in line:
-            # Since this is actual data let's try to remember where it came
-            # from. This may be a no-operation if there were any preceding
-            # key-value pairs.
-            _set_start_lineno_if_needed()
-            # Since we have a new, key-value pair we need to commit any
-            # previous key that we may have (regardless of multi-line or
-            # single-line values).
-            _commit_key_value_if_needed()
+            if record is None:
+                # Since this is actual data let's remember where it came from
+                data = data_cls()
+                raw_data = data_cls()
+                origin = Origin(source, lineno, None)
+                field_offset_map = {}
+                record = RFC822Record(data, origin, raw_data, field_offset_map)
+            elif key is not None:
+                # Since we have a new, key-value pair we need to commit any
+                # previous key that we may have (regardless of multi-line or
+                # single-line values).
+                raw_value = ''.join(value_list)
+                raw_data[key] = raw_value
+                data[key] = _normalize_value(raw_value)
+                if debug:
+                    logger.debug(
+                        _("Committed key/value %r=%r"), key, data[key])
             # Parse the line by splitting on the colon, getting rid of
             # all surrounding whitespace from the key and getting rid of the
             # leading whitespace from the value.
@@ -380,11 +369,12 @@ def gen_rfc822_records(stream, data_cls=dict, source=None):
             key = key.strip()
             value = value.lstrip()
             # Check if the key already exist in this message
-            if key in record.data:
-                raise _syntax_error(_(
-                    "Job has a duplicate key {!r} "
-                    "with old value {!r} and new value {!r}"
-                ).format(key, record.raw_data[key], value))
+            if key in data:
+                raise RFC822SyntaxError(
+                    getattr(stream, 'name', None), lineno, _(
+                        "Job has a duplicate key {!r} "
+                        "with old value {!r} and new value {!r}"
+                    ).format(key, raw_data[key], value))
             if value.strip() != "":
                 # Construct initial value list out of the (only) value that we
                 # have so far. Additional multi-line values will just append to
@@ -404,14 +394,21 @@ def gen_rfc822_records(stream, data_cls=dict, source=None):
                 # the following line.
                 field_offset_map[key] = lineno - origin.line_start + 1
             # Update the end-line location
-            _update_end_lineno()
+            origin.line_end = lineno
         # Treat all other lines as syntax errors
         else:
-            raise _syntax_error(
+            raise RFC822SyntaxError(
+                getattr(stream, 'name', None), lineno,
                 _("Unexpected non-empty line: {!r}").format(line))
-    # Make sure to commit the last key from the record
-    _commit_key_value_if_needed()
     # Once we've seen the whole file return the last record, if any
-    if record.data:
-        logger.debug(_("yielding record: %r"), record)
+    if record is not None:
+        # Make sure to commit the last key from the record
+        if key is not None:
+            raw_value = ''.join(value_list)
+            raw_data[key] = raw_value
+            data[key] = _normalize_value(raw_value)
+            if debug:
+                logger.debug(_("Committed key/value %r=%r"), key, data[key])
+        if debug:
+            logger.debug(_("yielding record: %r"), record)
         yield record
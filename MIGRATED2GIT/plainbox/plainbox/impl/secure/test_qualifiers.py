@@ -756,3 +756,47 @@ class FunctionTests(TestCase):
             self.assertEqual(
                 select_jobs(job_list, [qual_all, qual_not_c]),
                 [job_a, job_b])
+
+    def test_select_jobs__patterns(self):
+        """
+        verify that select_jobs() orders jobs selected by all kinds of
+        patterns by the first qualifier that selected them
+        """
+        job_list = [JobDefinition({'id': job_id}) for job_id in [
+            'foo/a', 'bar/b', 'foo/c', 'baz', 'bar/d']]
+        qualifier_list = [
+            RegExpJobQualifier('baz', self.origin),
+            RegExpJobQualifier('.*/d', self.origin),
+            RegExpJobQualifier('foo/.*', self.origin),
+            RegExpJobQualifier('bar/.*', self.origin),
+            RegExpJobQualifier('^foo/a$', self.origin),
+        ]
+        self.assertEqual(
+            [job.id for job in select_jobs(job_list, qualifier_list)],
+            ['baz', 'bar/d', 'foo/a', 'foo/c', 'bar/b'])
+
+    def test_select_jobs__pattern_exclusion(self):
+        """
+        verify that select_jobs() honors patterns that exclude jobs
+        """
+        job_list = [JobDefinition({'id': job_id}) for job_id in [
+            'foo/a', 'foo/b', 'foo/c']]
+        qualifier_list = [
+            RegExpJobQualifier('foo/.*', self.origin),
+            RegExpJobQualifier('.*/[ab]', self.origin, inclusive=False),
+        ]
+        self.assertEqual(
+            select_jobs(job_list, qualifier_list), [job_list[2]])
+
+    def test_select_jobs__many_patterns(self):
+        """
+        verify that select_jobs() handles more patterns than a regular
+        expression can have groups
+        """
+        job_list = [JobDefinition({'id': 'job-{}'.format(i)})
+                    for i in range(300)]
+        qualifier_list = [
+            RegExpJobQualifier('.*-{}'.format(i), self.origin)
+            for i in reversed(range(300))]
+        self.assertEqual(
+            select_jobs(job_list, qualifier_list), job_list[::-1])
@@ -568,6 +568,40 @@ class RFC822ParserTests(TestCase):
             'd': 0,
         })
 
+    def test_whitespace_only_line_separates_records(self):
+        text = (
+            "key: value1\n"
+            "   \n"
+            "key: value2\n"
+        )
+        with StringIO(text) as stream:
+            records = type(self).loader(stream)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].data, {'key': 'value1'})
+        self.assertEqual(records[0].origin.line_end, 1)
+        self.assertEqual(records[1].data, {'key': 'value2'})
+        self.assertEqual(records[1].origin.line_start, 3)
+
+    def test_single_line_dot_value(self):
+        text = "key: ."
+        with StringIO(text) as stream:
+            records = type(self).loader(stream)
+        self.assertEqual(records[0].data, {'key': ''})
+        self.assertEqual(records[0].raw_data, {'key': '.'})
+
+    def test_comment_inside_multiline_value(self):
+        text = (
+            "key:\n"
+            " line one\n"
+            "# comment\n"
+            " line two\n"
+        )
+        with StringIO(text) as stream:
+            records = type(self).loader(stream)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].data, {'key': 'line one\nline two'})
+        self.assertEqual(records[0].origin.line_end, 4)
+
 
 class NamedStringIO(StringIO):
     """
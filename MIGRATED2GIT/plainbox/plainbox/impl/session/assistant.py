@@ -25,6 +25,7 @@ Session Assistant.
 """
 
 import collections
+import contextlib
 import datetime
 import fnmatch
 import io
@@ -41,6 +42,7 @@ from plainbox.impl.applogic import PlainBoxConfig
 from plainbox.impl.decorators import raises
 from plainbox.impl.developer import UnexpectedMethodCall
 from plainbox.impl.developer import UsageExpectation
+from plainbox.impl.exporter import dump_many_from_session_manager
 from plainbox.impl.result import JobResultBuilder
 from plainbox.impl.runner import JobRunner
 from plainbox.impl.runner import JobRunnerUIDelegate
@@ -75,6 +77,11 @@ InternalResumeCandidate = collections.namedtuple(
 ResumeCandidate = collections.namedtuple(
     'ResumeCandidate', ['id', 'metadata'])
 
+# Report written by SessionAssistant.export_to_file_list(), along with the time
+# (in seconds) it took to render it.
+ExportedFile = collections.namedtuple(
+    'ExportedFile', ['exporter_id', 'path', 'render_time'])
+
 
 SA_RESTARTABLE = "restartable"
 
@@ -503,11 +510,10 @@ class SessionAssistant:
         """
         UsageExpectation.of(self).enforce()
         for storage in self._repo.get_storage_list():
-            data = storage.load_checkpoint()
-            if len(data) == 0:
-                continue
             try:
-                metadata = SessionPeekHelper().peek(data)
+                metadata = SessionPeekHelper().peek_storage(storage)
+                if metadata is None:
+                    continue
                 if (metadata.app_id == self._app_id):
                     if ((allow_not_flagged and not metadata.flags) or
                             (metadata.flags & flags)):
@@ -665,15 +671,14 @@ class SessionAssistant:
         # let's keep resume_candidates, so we don't have to load data again
         self._resume_candidates = {}
         for storage in self._repo.get_storage_list():
-            data = storage.load_checkpoint()
-            if len(data) == 0:
-                continue
             try:
-                metadata = SessionPeekHelper().peek(data)
+                metadata = SessionPeekHelper().peek_storage(storage)
             except SessionResumeError:
                 _logger.info("Exception raised when trying to resume"
                              "session: %s", str(storage.id))
             else:
+                if metadata is None:
+                    continue
                 if (metadata.app_id == self._app_id and
                         SessionMetaData.FLAG_INCOMPLETE in metadata.flags):
                     self._resume_candidates[storage.id] = (
@@ -1343,6 +1348,7 @@ class SessionAssistant:
             self.finalize_session: "to finalize session",
             self.export_to_transport: "to export the results and send them",
             self.export_to_file: "to export the results to a file",
+            self.export_to_file_list: "to export the results to many files",
             self.export_to_stream: "to export the results to a stream",
             self.get_resumable_sessions: "to get resume candidates",
             self.start_new_session: "to create a new session",
@@ -1429,16 +1435,70 @@ class SessionAssistant:
         UsageExpectation.of(self).enforce()
         exporter = self._manager.create_exporter(exporter_id, option_list,
                                                  strict=False)
+        path = self._get_export_path(exporter, dir_path)
+        with open(path, 'wb') as stream:
+            exporter.dump_from_session_manager(self._manager, stream)
+        return path
+
+    @raises(KeyError, OSError)
+    def export_to_file_list(
+        self, exporter_id_list: 'list[str]', option_list: 'list[str]',
+        dir_path: str
+    ) -> 'list[ExportedFile]':
+        """
+        Export the session to files using all of the given exporter IDs.
 
+        :param exporter_id_list:
+            The identifiers of the exporter units to use. See
+            :meth:`export_to_file()` for details.
+        :param option_list:
+            List of options customary to the exporters that are being created.
+            Each exporter silently ignores the options it doesn't support.
+        :param dir_path:
+            Path to the directory where session files should be written to.
+        :returns:
+            A list of ``ExportedFile`` tuples, one for each exporter, with the
+            exporter ID, the path to the written file and the time (in
+            seconds) it took to render it.
+        :raises KeyError:
+            When any of the exporter units cannot be found.
+        :raises OSError:
+            When there is a problem when writing the output.
+
+        This is equivalent to calling :meth:`export_to_file()` for each
+        exporter but faster: all the reports are rendered concurrently and
+        the I/O log of each job is read only once.
+        """
+        UsageExpectation.of(self).enforce()
+        exporter_list = [
+            self._manager.create_exporter(
+                exporter_id, option_list, strict=False)
+            for exporter_id in exporter_id_list]
+        path_list = []
+        for exporter in exporter_list:
+            path = self._get_export_path(exporter, dir_path)
+            # Exporters with the same file extension can get the same
+            # timestamp, wait for the clock to move on.
+            while path in path_list:
+                path = self._get_export_path(exporter, dir_path)
+            path_list.append(path)
+        with contextlib.ExitStack() as stack:
+            stream_list = [
+                stack.enter_context(open(path, 'wb')) for path in path_list]
+            render_time_list = dump_many_from_session_manager(
+                self._manager, list(zip(exporter_list, stream_list)))
+        return [
+            ExportedFile(exporter_id, path, render_time)
+            for exporter_id, path, render_time
+            in zip(exporter_id_list, path_list, render_time_list)]
+
+    def _get_export_path(self, exporter, dir_path):
         # LP:1585326 maintain isoformat but removing ':' chars that cause
         # issues when copying files.
         isoformat = "%Y-%m-%dT%H.%M.%S.%f"
         timestamp = datetime.datetime.utcnow().strftime(isoformat)
-        path = os.path.join(dir_path, ''.join(
+        return os.path.join(dir_path, ''.join(
             ['submission_', timestamp, '.', exporter.unit.file_extension]))
-        with open(path, 'wb') as stream:
-            exporter.dump_from_session_manager(self._manager, stream)
-        return path
 
     @raises(KeyError, OSError)
     def export_to_stream(
@@ -1576,6 +1636,7 @@ class SessionAssistant:
             # until all of the mandatory jobs have been executed.
             self.export_to_transport: "to export the results and send them",
             self.export_to_file: "to export the results to a file",
+            self.export_to_file_list: "to export the results to many files",
             self.export_to_stream: "to export the results to a stream",
             self.finalize_session: "to mark the session as complete",
             self.get_session_id: "to get the id of currently running session",
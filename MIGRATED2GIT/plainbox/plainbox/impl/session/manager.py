@@ -45,6 +45,7 @@ from plainbox.impl.session.state import SessionState
 from plainbox.impl.session.storage import LockedStorageError
 from plainbox.impl.session.storage import SessionStorage
 from plainbox.impl.session.storage import SessionStorageRepository
+from plainbox.impl.session.suspend import SessionDeltaSuspendHelper
 from plainbox.impl.session.suspend import SessionSuspendHelper
 from plainbox.impl.unit.testplan import TestPlanUnit
 from plainbox.public import get_providers
@@ -111,8 +112,14 @@ class SessionManager(pod.POD):
     the :meth:`checkpoint()` method applications can create persistent
     snapshots of the :class:`~plainbox.impl.session.state.SessionState`
     associated with each :class:`SessionManager`.
+
+    Most checkpoints are stored as small records appended to the checkpoint
+    journal. A full snapshot is saved on the first checkpoint and then each
+    time the journal has grown to :attr:`CHECKPOINT_JOURNAL_LIMIT` records.
     """
 
+    CHECKPOINT_JOURNAL_LIMIT = 100
+
     device_context_list = pod.Field(
         doc="""
         A list of session device context objects
@@ -160,6 +167,12 @@ class SessionManager(pod.POD):
         assign_filter_list=[
             pod.typed, pod.typed.sequence(TestPlanUnit), pod.unique])
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._delta_helper = None
+        self._journal_length = 0
+        self._header = None
+
     @property
     def default_device_context(self):
         """
@@ -339,6 +352,7 @@ class SessionManager(pod.POD):
         logger.debug("SessionManager.load_session()")
         try:
             data = storage.load_checkpoint()
+            journal = storage.load_journal(data)
         except IOError as exc:
             if exc.errno == errno.ENOENT:
                 state = SessionState(unit_list)
@@ -347,7 +361,7 @@ class SessionManager(pod.POD):
         else:
             state = SessionResumeHelper(
                 unit_list, flags, storage.location
-            ).resume(data, early_cb)
+            ).resume(data, early_cb, journal)
         context = SessionDeviceContext(state)
         return cls([context], storage)
 
@@ -357,8 +371,34 @@ class SessionManager(pod.POD):
 
         After calling this method you can later reopen the same session with
         :meth:`SessionManager.load_session()`.
+
+        Unless this is the first checkpoint made by this manager or the
+        checkpoint journal is full, only the changes made since the previous
+        checkpoint are saved.
         """
         logger.debug("SessionManager.checkpoint()")
+        if (self._delta_helper is not None
+                and self._journal_length < self.CHECKPOINT_JOURNAL_LIMIT
+                and not self._delta_helper.needs_snapshot(self.state)):
+            try:
+                record = self._delta_helper.suspend_delta(
+                    self.state, self.storage.location)
+                if record is None:
+                    return
+                logger.debug(
+                    ngettext(
+                        "Appending %d byte of checkpoint data to %r",
+                        "Appending %d bytes of checkpoint data to %r",
+                        len(record)
+                    ), len(record), self.storage.location)
+                self.storage.append_journal(record)
+            except BaseException:
+                # Fall back to a full snapshot on the next checkpoint
+                self._delta_helper = None
+                raise
+            self._journal_length += 1
+            self._save_header()
+            return
         data = SessionSuspendHelper().suspend(
             self.state, self.storage.location)
         logger.debug(
@@ -366,11 +406,30 @@ class SessionManager(pod.POD):
                 "Saving %d byte of checkpoint data to %r",
                 "Saving %d bytes of checkpoint data to %r", len(data)
             ), len(data), self.storage.location)
+        self._delta_helper = None
         try:
             self.storage.save_checkpoint(data)
         except LockedStorageError:
             self.storage.break_lock()
             self.storage.save_checkpoint(data)
+        self.storage.reset_journal(data)
+        self._delta_helper = SessionDeltaSuspendHelper(
+            self.state, self.storage.location)
+        self._journal_length = 0
+        self._save_header()
+
+    def _save_header(self):
+        """
+        Save the session header if the meta-data has changed.
+
+        The header allows to peek at the meta-data of the session without
+        loading the whole checkpoint.
+        """
+        header = SessionSuspendHelper().suspend_header(
+            self.state, self.storage.location)
+        if header != self._header:
+            self.storage.save_header(header)
+            self._header = header
 
     def destroy(self):
         """
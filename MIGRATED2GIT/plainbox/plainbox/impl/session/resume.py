@@ -54,6 +54,7 @@ import logging
 import os
 import re
 
+from plainbox.abc import IJobResult
 from plainbox.i18n import gettext as _
 from plainbox.impl.result import DiskJobResult
 from plainbox.impl.result import IOLogRecord
@@ -146,6 +147,19 @@ class EnvelopeUnpackMixIn:
             data = gzip.decompress(data)
         except IOError:
             raise CorruptedSessionError(_("Cannot decompress session data"))
+        return self.unpack_json(data)
+
+    def unpack_json(self, data):
+        """
+        Get access to a JSON object stored without any envelope.
+
+        :param data:
+            Bytes representing UTF-8 encoded JSON text
+        :returns:
+            the JSON representation of a session
+        :raises CorruptedSessionError:
+            if the representation of the session is corrupted in any way
+        """
         try:
             text = data.decode("UTF-8")
         except UnicodeDecodeError:
@@ -155,17 +169,60 @@ class EnvelopeUnpackMixIn:
         except ValueError:
             raise CorruptedSessionError(_("Cannot interpret session JSON"))
 
+    def replay_journal(self, json_repr, journal):
+        """
+        Apply records from the checkpoint journal to a session.
+
+        :param json_repr:
+            The JSON representation of a session, as returned by
+            :meth:`unpack_envelope()`. It is modified in place.
+        :param journal:
+            List of bytes representing journal records, as returned by
+            :meth:`~plainbox.impl.session.storage.SessionStorage.
+            load_journal()`
+        :returns:
+            json_repr
+        :raises CorruptedSessionError:
+            if any of the records is corrupted in any way
+
+        The format of each record is described in
+        :mod:`plainbox.impl.session.suspend`.
+        """
+        if not journal:
+            return json_repr
+        _validate(json_repr, value_type=dict)
+        session_repr = _validate(json_repr, key="session", value_type=dict)
+        for record in journal:
+            try:
+                delta_repr = json.loads(record.decode("UTF-8"))
+            except (UnicodeDecodeError, ValueError):
+                raise CorruptedSessionError(
+                    _("Cannot interpret session journal"))
+            _validate(delta_repr, value_type=dict)
+            if "jobs" in delta_repr:
+                session_repr["jobs"] = delta_repr["jobs"]
+            session_repr.setdefault("jobs", {}).update(
+                delta_repr.get("checksums", {}))
+            session_repr.setdefault("results", {}).update(
+                delta_repr.get("results", {}))
+            for key in ("desired_job_list", "mandatory_job_list", "metadata"):
+                if key in delta_repr:
+                    session_repr[key] = delta_repr[key]
+        return json_repr
+
 
 class SessionPeekHelper(EnvelopeUnpackMixIn):
 
     """A helper class to peek at session state meta-data quickly."""
 
-    def peek(self, data):
+    def peek(self, data, journal=None):
         """
         Peek at the meta-data of a dormant session.
 
         :param data:
             Bytes representing the dormant session
+        :param journal:
+            (optional) List of records from the checkpoint journal
         :returns:
             a SessionMetaData object
         :raises CorruptedSessionError:
@@ -174,8 +231,51 @@ class SessionPeekHelper(EnvelopeUnpackMixIn):
             if session serialization format is not supported
         """
         json_repr = self.unpack_envelope(data)
+        self.replay_journal(json_repr, journal)
         return self._peek_json(json_repr)
 
+    def peek_header(self, data):
+        """
+        Peek at the meta-data stored in a session header.
+
+        :param data:
+            Bytes representing the session header, as computed by
+            :meth:`~plainbox.impl.session.suspend.SessionSuspendHelper.
+            suspend_header()`
+        :returns:
+            a SessionMetaData object
+        :raises CorruptedSessionError:
+            if the representation of the header is corrupted in any way
+        :raises IncompatibleSessionError:
+            if session serialization format is not supported
+        """
+        json_repr = self.unpack_json(data)
+        return self._peek_json(json_repr)
+
+    def peek_storage(self, storage):
+        """
+        Peek at the meta-data of a session kept in the given storage.
+
+        :param storage:
+            A :class:`~plainbox.impl.session.storage.SessionStorage` object
+        :returns:
+            a SessionMetaData object or None if the storage holds no session
+        :raises CorruptedSessionError:
+            if the representation of the session is corrupted in any way
+        :raises IncompatibleSessionError:
+            if session serialization format is not supported
+
+        The small session header is used, if available. Otherwise the whole
+        checkpoint (and the checkpoint journal) is loaded.
+        """
+        header = storage.load_header()
+        if header:
+            return self.peek_header(header)
+        data = storage.load_checkpoint()
+        if len(data) == 0:
+            return None
+        return self.peek(data, storage.load_journal(data))
+
     def _peek_json(self, json_repr):
         """
         Resume a SessionMetaData object from the JSON representation.
@@ -184,8 +284,9 @@ class SessionPeekHelper(EnvelopeUnpackMixIn):
         and parsing is done. The only error conditions that can happen
         are related to semantic incompatibilities or corrupted internal state.
         """
-        logger.debug(_("Peeking at json... (see below)"))
-        logger.debug(json.dumps(json_repr, indent=4))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(_("Peeking at json... (see below)"))
+            logger.debug(json.dumps(json_repr, indent=4))
         _validate(json_repr, value_type=dict)
         version = _validate(json_repr, key="version", choice=[1])
         if version == 1:
@@ -235,8 +336,8 @@ class SessionResumeHelper(EnvelopeUnpackMixIn):
             :class:`plainbox.impl.session.storage.SessionStorage` object.
 
         Applicable flags are ``FLAG_FILE_REFERENCE_CHECKS_S``,
-        ``FLAG_REWRITE_LOG_PATHNAMES_S`` and ``FLAG_IGNORE_JOB_CHECKSUMS_S``.
-        Their meaning is described below.
+        ``FLAG_REWRITE_LOG_PATHNAMES_S``, ``FLAG_IGNORE_JOB_CHECKSUMS_S`` and
+        ``FLAG_LAZY_RESULTS_S``. Their meaning is described below.
 
         ``FLAG_FILE_REFERENCE_CHECKS_S``:
             Flag controlling reference checks from within the session file to
@@ -257,13 +358,19 @@ class SessionResumeHelper(EnvelopeUnpackMixIn):
             serialized (nor should they) this integrity check prevents anyone
             from resuming a session if job definitions have changed. Using this
             flag effectively disables that check.
+
+        ``FLAG_LAZY_RESULTS_S``:
+            Flag controlling how job results are restored. If enabled the I/O
+            log and comments of each result are decoded only when they are
+            accessed for the first time (see :class:`LazyJobResultMixIn`).
+            Problems with the representation of those are only reported then.
         """
         self.job_list = job_list
         logger.debug("Session Resume Helper started with jobs: %r", job_list)
         self.flags = flags
         self.location = location
 
-    def resume(self, data, early_cb=None):
+    def resume(self, data, early_cb=None, journal=None):
         """
         Resume a dormant session.
 
@@ -275,6 +382,9 @@ class SessionResumeHelper(EnvelopeUnpackMixIn):
             be used to register signal listeners on the new session before this
             method call returns. The callback accepts one argument, session,
             which is being resumed.
+        :param journal:
+            (optional) List of records from the checkpoint journal. Records
+            are replayed on top of the dormant session before it is resumed.
         :returns:
             resumed session instance
         :rtype:
@@ -296,6 +406,7 @@ class SessionResumeHelper(EnvelopeUnpackMixIn):
             if serialized jobs are not the same as current jobs
         """
         json_repr = self.unpack_envelope(data)
+        self.replay_journal(json_repr, journal)
         return self._resume_json(json_repr, early_cb)
 
     def _resume_json(self, json_repr, early_cb=None):
@@ -306,8 +417,9 @@ class SessionResumeHelper(EnvelopeUnpackMixIn):
         and parsing is done. The only error conditions that can happen
         are related to semantic incompatibilities or corrupted internal state.
         """
-        logger.debug(_("Resuming from json... (see below)"))
-        logger.debug(json.dumps(json_repr, indent=4))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(_("Resuming from json... (see below)"))
+            logger.debug(json.dumps(json_repr, indent=4))
         _validate(json_repr, value_type=dict)
         version = _validate(json_repr, key="version", choice=[1])
         if version == 1:
@@ -334,6 +446,82 @@ class SessionResumeHelper(EnvelopeUnpackMixIn):
         return helper.resume_json(json_repr, early_cb)
 
 
+class LazyJobResultMixIn:
+
+    """
+    Mix-in class for job results that are restored lazily.
+
+    Outcome, return code and execution duration (and the name of the I/O log
+    file of disk results) are restored eagerly as they are needed while the
+    session is being resumed. The remaining data, typically the I/O log and
+    comments, is computed by a callback the first time it is accessed.
+    """
+
+    def __init__(self, data, lazy_data_fn):
+        """
+        Initialize a new result with the specified data.
+
+        :param data:
+            Dictionary with the data that is available right away.
+        :param lazy_data_fn:
+            Function that returns a dictionary with the remaining data.
+        """
+        self._lazy_data_fn = None
+        super().__init__(data)
+        self._lazy_data_fn = lazy_data_fn
+
+    @property
+    def _data(self):
+        if self._lazy_data_fn is not None:
+            lazy_data_fn = self._lazy_data_fn
+            self._lazy_data_fn = None
+            data = dict(self._eager_data)
+            data.update(lazy_data_fn())
+            super().__init__(data)
+        return self._eager_data
+
+    @_data.setter
+    def _data(self, value):
+        self._eager_data = value
+
+    def __eq__(self, other):
+        # Don't restore anything if the outcome alone is enough to tell
+        if (isinstance(other, IJobResult)
+                and self.outcome != other.outcome):
+            return False
+        return super().__eq__(other)
+
+    @property
+    def outcome(self):
+        return self._eager_data.get('outcome', self.OUTCOME_NONE)
+
+    @property
+    def execution_duration(self):
+        return self._eager_data.get('execution_duration')
+
+    @property
+    def return_code(self):
+        return self._eager_data.get('return_code')
+
+    @property
+    def is_hollow(self):
+        return not self._eager_data and super().is_hollow
+
+
+class LazyMemoryJobResult(LazyJobResultMixIn, MemoryJobResult):
+
+    """A :class:`MemoryJobResult` that restores the I/O log lazily."""
+
+
+class LazyDiskJobResult(LazyJobResultMixIn, DiskJobResult):
+
+    """A :class:`DiskJobResult` that restores comments lazily."""
+
+    @property
+    def io_log_filename(self):
+        return self._eager_data.get('io_log_filename')
+
+
 class ResumeDiscardQualifier(SimpleQualifier):
 
     """
@@ -589,6 +777,11 @@ class SessionResumeHelper1(MetaDataHelper1MixIn):
     # that check.
     FLAG_IGNORE_JOB_CHECKSUMS_S = 'ignore-job-checksums'
     FLAG_IGNORE_JOB_CHECKSUMS_F = 0x04
+    # Flag controlling lazy restoration of job results. If enabled the I/O log
+    # and comments of each result are restored on first access. This makes
+    # resume much cheaper when most of the results are never looked at.
+    FLAG_LAZY_RESULTS_S = 'lazy-results'
+    FLAG_LAZY_RESULTS_F = 0x08
 
     def __init__(
         self, job_list: 'List[JobDefinition]',
@@ -623,6 +816,8 @@ class SessionResumeHelper1(MetaDataHelper1MixIn):
                 self.flags |= self.FLAG_REWRITE_LOG_PATHNAMES_F
             if self.FLAG_IGNORE_JOB_CHECKSUMS_S in flags:
                 self.flags |= self.FLAG_IGNORE_JOB_CHECKSUMS_F
+            if self.FLAG_LAZY_RESULTS_S in flags:
+                self.flags |= self.FLAG_LAZY_RESULTS_F
 
     def resume_json(self, json_repr, early_cb=None):
         """
@@ -884,7 +1079,8 @@ class SessionResumeHelper1(MetaDataHelper1MixIn):
         Reconstruct a single job result.
 
         Convert the representation of MemoryJobResult or DiskJobResult
-        back into an actual instance.
+        back into an actual instance. If ``FLAG_LAZY_RESULTS_F`` is set then
+        LazyMemoryJobResult or LazyDiskJobResult is returned instead.
         """
         # Load all common attributes...
         outcome = _validate(
@@ -893,8 +1089,6 @@ class SessionResumeHelper1(MetaDataHelper1MixIn):
                 OUTCOME_METADATA_MAP.keys(),
                 key=lambda outcome: outcome or "none"
             ), value_none=True)
-        comments = _validate(
-            result_repr, key='comments', value_type=str, value_none=True)
         return_code = _validate(
             result_repr, key='return_code', value_type=int, value_none=True)
         execution_duration = _validate(
@@ -916,25 +1110,46 @@ class SessionResumeHelper1(MetaDataHelper1MixIn):
                     and not os.path.isfile(io_log_filename)):
                 raise BrokenReferenceToExternalFile(
                     _("cannot access file: {!r}").format(io_log_filename))
-            return DiskJobResult({
+            data = {
                 'outcome': outcome,
-                'comments': comments,
                 'execution_duration': execution_duration,
                 'io_log_filename': io_log_filename,
                 'return_code': return_code
-            })
+            }
+            if flags & cls.FLAG_LAZY_RESULTS_F:
+                return LazyDiskJobResult(data, lambda: {
+                    'comments': cls._build_comments(result_repr),
+                })
+            data['comments'] = cls._build_comments(result_repr)
+            return DiskJobResult(data)
         else:
-            io_log = [
-                cls._build_IOLogRecord(record_repr)
-                for record_repr in _validate(
-                    result_repr, key='io_log', value_type=list)]
-            return MemoryJobResult({
+            data = {
                 'outcome': outcome,
-                'comments': comments,
                 'execution_duration': execution_duration,
-                'io_log': io_log,
                 'return_code': return_code
-            })
+            }
+            if flags & cls.FLAG_LAZY_RESULTS_F:
+                return LazyMemoryJobResult(data, lambda: {
+                    'comments': cls._build_comments(result_repr),
+                    'io_log': cls._build_io_log(result_repr),
+                })
+            data['comments'] = cls._build_comments(result_repr)
+            data['io_log'] = cls._build_io_log(result_repr)
+            return MemoryJobResult(data)
+
+    @classmethod
+    def _build_comments(cls, result_repr):
+        """Reconstruct comments of a single job result."""
+        return _validate(
+            result_repr, key='comments', value_type=str, value_none=True)
+
+    @classmethod
+    def _build_io_log(cls, result_repr):
+        """Reconstruct the I/O log of a single job result."""
+        return [
+            cls._build_IOLogRecord(record_repr)
+            for record_repr in _validate(
+                result_repr, key='io_log', value_type=list)]
 
     @classmethod
     def _load_io_log_filename(cls, result_repr, flags, location):
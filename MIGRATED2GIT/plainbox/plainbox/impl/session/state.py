@@ -29,14 +29,13 @@ from plainbox.abc import IJobResult
 from plainbox.i18n import gettext as _
 from plainbox.impl import deprecated
 from plainbox.impl.depmgr import DependencyDuplicateError
-from plainbox.impl.depmgr import DependencyError
 from plainbox.impl.depmgr import DependencySolver
+from plainbox.impl.resource import ResourceMap
 from plainbox.impl.secure.qualifiers import select_jobs
 from plainbox.impl.session.jobs import JobState
 from plainbox.impl.session.jobs import UndesiredJobReadinessInhibitor
 from plainbox.impl.unit.job import JobDefinition
 from plainbox.impl.unit.unit_with_id import UnitWithId
-from plainbox.impl.unit.testplan import TestPlanUnitSupport
 from plainbox.vendor import morris
 
 
@@ -420,6 +419,40 @@ class SessionDeviceContext:
         # NOTE: no need to fire the on_unit_added() signal because the state
         # object and we've connected it to will fire our version.
 
+    def add_units(self, units, recompute=True, problem_list=None):
+        """
+        Add a number of units to the context.
+
+        :param units:
+            An iterable of :class:`Unit` objects to add.
+        :param recompute:
+            If True, recompute readiness inhibitors for all affected jobs,
+            once, after all the units are added.
+        :param problem_list:
+            (optional) A list to which clashing job definitions are reported,
+            see :meth:`SessionState.add_units()`
+        :returns:
+            The list returned by :meth:`SessionState.add_units()`
+        :raises ValueError:
+            If any of the units is already in the context. No units are added
+            in that case.
+
+        This is equivalent to calling :meth:`add_unit()` for each unit but it
+        is much faster for large numbers of units.
+
+        This method fires the :meth:`on_unit_added()` signal for each unit
+        """
+        units = list(units)
+        known_unit_set = set(self._unit_list)
+        for unit in units:
+            if unit in known_unit_set:
+                raise ValueError(
+                    _("attempting to add the same unit twice: %s" % unit.id))
+            known_unit_set.add(unit)
+        # NOTE: no need to fire the on_unit_added() signal because the state
+        # object and we've connected it to will fire our version.
+        return self.state.add_units(units, recompute, problem_list)
+
     def remove_unit(self, unit):
         """
         Remove an unit from the context.
@@ -578,7 +611,7 @@ class SessionDeviceContext:
         """Compute the map of field overrides."""
         override_map = collections.defaultdict(list)
         for test_plan in self._test_plan_list:
-            support = TestPlanUnitSupport(test_plan)
+            support = test_plan.get_support()
             for pattern, override_list in support.override_list:
                 override_map[pattern].extend(override_list)
         return override_map
@@ -592,16 +625,18 @@ class SessionDeviceContext:
         # complicated than I was able to write without a hard-copy reference
         # that describes it. I will improve this method once I complete the
         # required research.
-        for job_state in self.state.job_state_map.values():
-            job = job_state.job
-            for pattern, override_list in self.override_map.items():
-                if re.match(pattern, job.id):
+        override_map = self.override_map
+        for job_id, job_state in self.state.job_state_map.items():
+            for pattern, override_list in override_map.items():
+                if re.match(pattern, job_id):
                     job_state.apply_overrides(override_list)
 
     def _override_update(self, job):
-        job_state = self.state.job_state_map[job.id]
+        # NOTE: job.id is computed each time it is accessed, look it up once
+        job_id = job.id
+        job_state = self.state.job_state_map[job_id]
         for pattern, override_list in self.override_map.items():
-            if re.match(pattern, job.id):
+            if re.match(pattern, job_id):
                 job_state.apply_overrides(override_list)
 
     def _update_mandatory_job_list(self):
@@ -681,9 +716,9 @@ class SessionState:
 
     :ivar dict resource_map: all known resources
 
-        A mapping from resource id to a list of
-        :class:`plainbox.impl.resource.Resource` objects. This encapsulates all
-        "knowledge" about the system plainbox is running on.
+        A :class:`plainbox.impl.resource.ResourceMap` from resource id to a
+        list of :class:`plainbox.impl.resource.Resource` objects. This
+        encapsulates all "knowledge" about the system plainbox is running on.
 
 
         It is needed to compute job readiness (as it stores resource data
@@ -792,8 +827,16 @@ class SessionState:
         self._desired_job_list = []
         self._mandatory_job_list = []
         self._run_list = []
-        self._resource_map = {}
+        self._resource_map = ResourceMap()
         self._metadata = SessionMetaData()
+        # Reverse dependency index used by the incremental readiness engine.
+        # It maps the id of a job (or a resource) to the set of ids of jobs on
+        # the run list that depend on it in any way (direct, ordering or
+        # resource dependency). It is rebuilt by _recompute_job_readiness()
+        self._readiness_rdep_map = {}
+        # Set of ids of jobs (or resources) that have changed since readiness
+        # was last computed. See _update_job_readiness() for details.
+        self._readiness_changed_set = set()
         super(SessionState, self).__init__()
 
     def trim_job_list(self, qualifier):
@@ -897,40 +940,14 @@ class SessionState:
         self._desired_job_list += list(desired_job_list)
         # Reset run list just in case desired_job_list is empty
         self._run_list = []
-        # Try to solve the dependency graph. This is done in a loop as may need
-        # to remove a problematic job and re-try. The loop provides a stop
-        # condition as we will eventually run out of jobs.
         problems = []
-        # Get a copy of all the jobs as we'll be removing elements from this
-        # list to come to a stable set in the loop below.
-        job_list = self._job_list[:]
-        while self._desired_job_list:
-            # XXX: it might be more efficient to incorporate this 'recovery
-            # mode' right into the solver, this way we'd probably save some
-            # resources or runtime complexity.
-            try:
-                self._run_list = DependencySolver.resolve_dependencies(
-                    job_list, self._desired_job_list)
-            except DependencyError as exc:
-                # When a dependency error is detected remove the affected job
-                # form _desired_job_list and try again.
-                if exc.affected_job in self._desired_job_list:
-                    # The job may have been removed by now:
-                    # https://bugs.launchpad.net/plainbox/+bug/1444126
-                    self._desired_job_list.remove(exc.affected_job)
-                if exc.affected_job in job_list:
-                    # If the affected job is in the job list, remove it from
-                    # the job list we're going to consider in the next run.
-                    # This is done so that if a job depends on a broken but
-                    # existing job, it won't constantly re-add the same broken
-                    # job over and over (so that the algorithm can stop).
-                    job_list.remove(exc.affected_job)
-                # Remember each problem, this can be presented by the UI
-                problems.append(exc)
-                continue
-            else:
-                # Don't iterate the loop if there was no exception
-                break
+        # Try to solve the dependency graph. Each problematic job is removed,
+        # along with everything that depends on it, and reported back to the
+        # caller. This includes removing them from _desired_job_list.
+        if self._desired_job_list:
+            self._run_list, problems, self._desired_job_list = (
+                DependencySolver.resolve_dependencies_with_recovery(
+                    self._job_list, self._desired_job_list))
         # Update all job readiness state
         self._recompute_job_readiness()
         # Return all dependency problems to the caller
@@ -998,7 +1015,8 @@ class SessionState:
         with the same id.
         """
         job.controller.observe_result(self, job, result)
-        self._recompute_job_readiness()
+        self._readiness_changed_set.add(job.id)
+        self._update_job_readiness()
 
     @deprecated('0.9', 'use the add_unit() method instead')
     def add_job(self, new_job, recompute=True):
@@ -1008,10 +1026,10 @@ class SessionState:
         :param new_job:
             The job being added
         :param recompute:
-            If True, recompute readiness inhibitors for all jobs.
+            If True, recompute readiness inhibitors for all affected jobs.
             You should only set this to False if you're adding
             a number of jobs and will otherwise ensure that
-            :meth:`_recompute_job_readiness()` gets called before
+            :meth:`_update_job_readiness()` gets called before
             session state users can see the state again.
         :returns:
             The job that was actually added or an existing, identical
@@ -1030,7 +1048,7 @@ class SessionState:
 
         .. note::
 
-            This method recomputes job readiness for all jobs
+            This method recomputes job readiness of all affected jobs
         """
         return self.add_unit(new_job, recompute)
 
@@ -1041,10 +1059,10 @@ class SessionState:
         :param new_unit:
             The unit being added
         :param recompute:
-            If True, recompute readiness inhibitors for all jobs.
+            If True, recompute readiness inhibitors for all affected jobs.
             You should only set this to False if you're adding
             a number of jobs and will otherwise ensure that
-            :meth:`_recompute_job_readiness()` gets called before
+            :meth:`_update_job_readiness()` gets called before
             session state users can see the state again.
         :returns:
             The unit that was actually added or an existing, identical
@@ -1066,16 +1084,86 @@ class SessionState:
             discarded.
 
         .. note::
-            This method recomputes job readiness for all jobs unless the
-            recompute=False argument is used. Recomputing takes a while so if
-            you want to add a lot of units consider setting that to False and
-            only recompute at the last call.
+            This method recomputes job readiness of all affected jobs unless
+            the recompute=False argument is used. Only jobs on the run list
+            that depend on the added job are re-evaluated.
         """
         if new_unit.Meta.name == 'job':
             return self._add_job_unit(new_unit, recompute)
         else:
             return self._add_other_unit(new_unit)
 
+    def add_units(self, new_units, recompute=True, problem_list=None):
+        """
+        Add a number of new units to the session.
+
+        :param new_units:
+            An iterable of units being added
+        :param recompute:
+            If True, recompute readiness inhibitors for all affected jobs,
+            once, after all the units are added.
+        :param problem_list:
+            (optional) A list to which a DependencyDuplicateError is appended
+            for each clashing job definition. The clashing job is then
+            discarded instead of the exception being raised.
+        :returns:
+            A list of units that were actually added or existing, identical
+            units if perfect clashes were silently ignored, in the order of
+            ``new_units``. Discarded clashing jobs are not included.
+        :raises DependencyDuplicateError:
+            if a duplicate, clashing job definition is detected and
+            ``problem_list`` is None. Units preceding the clashing one stay
+            added.
+
+        This is equivalent to calling :meth:`add_unit()` for each unit but
+        it is much faster for large numbers of units. The
+        :meth:`on_job_state_map_changed()` signal is fired only once and
+        job readiness is recomputed only once for the whole batch. The
+        :meth:`on_unit_added()` and :meth:`on_job_added()` signals are fired
+        for each new unit after all of the units are added.
+        """
+        added_units = []
+        new_unit_list = []
+        try:
+            for new_unit in new_units:
+                if new_unit.Meta.name != 'job':
+                    self._unit_list.append(new_unit)
+                    new_unit_list.append(new_unit)
+                    added_units.append(new_unit)
+                    continue
+                # See if we have a job with the same id already
+                try:
+                    existing_job = self._job_state_map[new_unit.id].job
+                except KeyError:
+                    # Register the new job in our state
+                    self._job_state_map[new_unit.id] = JobState(new_unit)
+                    self._job_list.append(new_unit)
+                    self._unit_list.append(new_unit)
+                    new_unit_list.append(new_unit)
+                    added_units.append(new_unit)
+                else:
+                    # Report clashes only when the hashes are different, just
+                    # like add_unit() does.
+                    if new_unit != existing_job:
+                        exc = DependencyDuplicateError(existing_job, new_unit)
+                        if problem_list is None:
+                            raise exc
+                        problem_list.append(exc)
+                        continue
+                    added_units.append(existing_job)
+                # Update readiness state of all the affected jobs
+                self._readiness_changed_set.add(new_unit.id)
+        finally:
+            if any(unit.Meta.name == 'job' for unit in new_unit_list):
+                self.on_job_state_map_changed()
+            for unit in new_unit_list:
+                self.on_unit_added(unit)
+                if unit.Meta.name == 'job':
+                    self.on_job_added(unit)
+            if recompute:
+                self._update_job_readiness()
+        return added_units
+
     def _add_other_unit(self, new_unit):
         self.unit_list.append(new_unit)
         self.on_unit_added(new_unit)
@@ -1102,9 +1190,10 @@ class SessionState:
                 raise DependencyDuplicateError(existing_job, new_job)
             return existing_job
         finally:
-            # Update all job readiness state
+            # Update readiness state of all the affected jobs
+            self._readiness_changed_set.add(new_job.id)
             if recompute:
-                self._recompute_job_readiness()
+                self._update_job_readiness()
 
     def remove_unit(self, unit, *, recompute=True):
         """
@@ -1113,17 +1202,15 @@ class SessionState:
         :param unit:
             The unit to remove
         :param recompute:
-            If True, recompute readiness inhibitors for all jobs.
+            If True, recompute readiness inhibitors for all affected jobs.
             You should only set this to False if you're adding
             a number of jobs and will otherwise ensure that
-            :meth:`_recompute_job_readiness()` gets called before
+            :meth:`_update_job_readiness()` gets called before
             session state users can see the state again.
 
         .. note::
-            This method recomputes job readiness for all jobs unless the
-            recompute=False argument is used. Recomputing takes a while so if
-            you want to add a lot of units consider setting that to False and
-            only recompute at the last call.
+            This method recomputes job readiness of all affected jobs unless
+            the recompute=False argument is used.
         """
         self._unit_list.remove(unit)
         self.on_unit_removed(unit)
@@ -1134,8 +1221,9 @@ class SessionState:
                 del self._resource_map[unit.id]
             except KeyError:
                 pass
+            self._readiness_changed_set.add(unit.id)
             if recompute:
-                self._recompute_job_readiness()
+                self._update_job_readiness()
             self.on_job_removed(unit)
             self.on_job_state_map_changed()
 
@@ -1144,8 +1232,13 @@ class SessionState:
         Add or change a resource with the given id.
 
         Resources silently overwrite any old resources with the same id.
+
+        .. note::
+            Jobs that depend on this resource are re-evaluated the next time
+            job readiness is updated.
         """
         self._resource_map[resource_id] = resource_list
+        self._readiness_changed_set.add(resource_id)
 
     @property
     def job_list(self):
@@ -1260,6 +1353,10 @@ class SessionState:
 
         Re-computes [job_state.ready
                      for job_state in _job_state_map.values()]
+
+        This also rebuilds the reverse dependency index that is used by
+        :meth:`_update_job_readiness()` to re-evaluate only the jobs affected
+        by a particular change.
         """
         # Reset the state of all jobs to have the undesired inhibitor. Since
         # we maintain a state object for _all_ jobs (including ones not in the
@@ -1268,6 +1365,7 @@ class SessionState:
         for job_state in self._job_state_map.values():
             job_state.readiness_inhibitor_list = [
                 UndesiredJobReadinessInhibitor]
+        rdep_map = collections.defaultdict(set)
         # Take advantage of the fact that run_list is topologically sorted and
         # do a single O(N) pass over _run_list. All "current/update" state is
         # computed before it needs to be observed (thanks to the ordering)
@@ -1279,3 +1377,43 @@ class SessionState:
             # Ask the job controller about inhibitors affecting this job
             for inhibitor in job.controller.get_inhibitor_list(self, job):
                 job_state.readiness_inhibitor_list.append(inhibitor)
+            # Remember which jobs (and resources) this job depends on
+            for dep_type, dep_id in job.controller.get_dependency_set(job):
+                rdep_map[dep_id].add(job.id)
+        self._readiness_rdep_map = rdep_map
+        self._readiness_changed_set.clear()
+
+    def _update_job_readiness(self):
+        """
+        Internal method of SessionState.
+
+        Incrementally re-computes readiness of jobs affected by changes that
+        happened since the last time readiness was computed.
+
+        Readiness inhibitors of a job on the run list depend only on the
+        results of the jobs it depends on and on the resources referenced by
+        its resource program. Using the reverse dependency index built by
+        :meth:`_recompute_job_readiness()` only jobs that depend on a
+        changed job (or resource) are re-evaluated. The cost of presenting
+        a single job result is thus proportional to the number of dependent
+        jobs rather than to the size of the run list.
+
+        The undesired inhibitor is not affected by this method as it only
+        changes when the run list itself changes.
+        """
+        if not self._readiness_changed_set:
+            return
+        rdep_map = self._readiness_rdep_map
+        affected_id_set = set()
+        for changed_id in self._readiness_changed_set:
+            affected_id_set.update(rdep_map.get(changed_id, ()))
+        self._readiness_changed_set.clear()
+        for job_id in affected_id_set:
+            try:
+                job_state = self._job_state_map[job_id]
+            except KeyError:
+                # The dependent job was removed from the session
+                continue
+            job = job_state.job
+            job_state.readiness_inhibitor_list = (
+                job.controller.get_inhibitor_list(self, job))
@@ -30,10 +30,13 @@ associated with a particular session.
 
 import datetime
 import errno
+import hashlib
+import json
 import logging
 import os
 import shutil
 import stat
+import struct
 import sys
 import tempfile
 
@@ -52,10 +55,20 @@ class SessionStorageRepository:
     that are stored there. This allows to create :class:`SessionStorage`
     instances to further manage each session (such as remove them by calling
     :meth:SessionStorage.remove()`)
+
+    The repository keeps an index of session headers (see
+    :meth:`SessionStorage.load_header()`) so that enumerating sessions and
+    peeking at their meta-data doesn't have to open each session. Entries of
+    the index are validated against the header files (using their size and
+    modification time) and refreshed each time the sessions are enumerated.
     """
 
     _LAST_SESSION_SYMLINK = "last-session"
 
+    _INDEX_FILE = ".session-index"
+
+    _INDEX_VERSION = 1
+
     def __init__(self, location=None):
         """
         Initialize new repository at the specified location.
@@ -118,9 +131,7 @@ class SessionStorageRepository:
         logger.debug(_("Enumerating sessions in %s"), self._location)
         try:
             # Try to enumerate the directory
-            item_list = sorted(os.listdir(self._location),
-                key=lambda x: os.stat(os.path.join(
-                    self._location, x)).st_mtime, reverse=True)
+            item_list = os.listdir(self._location)
         except OSError as exc:
             # If the directory does not exist,
             # silently return empty collection
@@ -128,21 +139,122 @@ class SessionStorageRepository:
                 return []
             # Don't silence any other errors
             raise
-        session_list = []
+        candidate_list = []
         # Check each item by looking for directories
         for item in item_list:
             pathname = os.path.join(self.location, item)
             # Make sure not to follow any symlinks here
-            stat_result = os.lstat(pathname)
+            try:
+                stat_result = os.lstat(pathname)
+            except OSError as exc:
+                # The item may be gone (removed by another process) by now
+                if exc.errno == errno.ENOENT:
+                    continue
+                raise
             # Consider non-hidden directories that end with the word .session
             if (not item.startswith(".") and item.endswith(".session")
                     and stat.S_ISDIR(stat_result.st_mode)):
                 logger.debug(_("Found possible session in %r"), pathname)
-                session = SessionStorage(pathname)
-                session_list.append(session)
+                candidate_list.append((stat_result.st_mtime, item, pathname))
+        candidate_list.sort(key=lambda candidate: candidate[0], reverse=True)
+        index = self._load_index()
+        new_index = {}
+        session_list = []
+        for _mtime, item, pathname in candidate_list:
+            header = self._lookup_header(pathname, index.get(item))
+            if header is not None:
+                new_index[item] = header
+            session = SessionStorage(
+                pathname, header[-1] if header is not None else '')
+            session_list.append(session)
+        if new_index != index:
+            self._save_index(new_index)
         # Return the full list
         return session_list
 
+    @staticmethod
+    def _lookup_header(pathname, entry):
+        """
+        Get the index entry describing the header of a session.
+
+        :param pathname:
+            Pathname of the session storage directory.
+        :param entry:
+            The current index entry (or None)
+        :returns:
+            A (inode, size, mtime, header) list, either the entry that was
+            passed, if it is still valid, or a freshly computed one. None is
+            returned if the session has no (readable) header.
+        """
+        header_pathname = os.path.join(pathname, SessionStorage._HEADER_FILE)
+        try:
+            stat_result = os.stat(header_pathname)
+        except OSError as exc:
+            if exc.errno == errno.ENOENT:
+                return None
+            raise
+        stamp = [stat_result.st_ino, stat_result.st_size,
+                 stat_result.st_mtime_ns]
+        if isinstance(entry, list) and entry[:-1] == stamp:
+            return entry
+        try:
+            with open(header_pathname, 'rb') as stream:
+                header = stream.read().decode("UTF-8")
+        except (IOError, OSError, UnicodeDecodeError) as exc:
+            logger.warning(_("Cannot read session header %r: %s"),
+                           header_pathname, exc)
+            return None
+        return stamp + [header]
+
+    def _load_index(self):
+        """
+        Load the index of session headers.
+
+        :returns:
+            Dictionary mapping the name of each session directory to a list
+            with the inode number, size and modification time (in nanoseconds)
+            of the session header followed by the header itself. The
+            dictionary is empty if the index is missing or damaged.
+        """
+        pathname = os.path.join(self._location, self._INDEX_FILE)
+        try:
+            with open(pathname, 'rt', encoding='UTF-8') as stream:
+                index_repr = json.load(stream)
+        except (IOError, OSError, ValueError) as exc:
+            if getattr(exc, 'errno', None) != errno.ENOENT:
+                logger.warning(_("Ignoring damaged session index %r: %s"),
+                               pathname, exc)
+            return {}
+        if (not isinstance(index_repr, dict)
+                or index_repr.get('version') != self._INDEX_VERSION
+                or not isinstance(index_repr.get('sessions'), dict)):
+            return {}
+        return index_repr['sessions']
+
+    def _save_index(self, index):
+        """
+        Save the index of session headers.
+
+        The index is replaced atomically. Failure to save the index is not an
+        error, the index is only an optimization.
+        """
+        pathname = os.path.join(self._location, self._INDEX_FILE)
+        index_repr = {'version': self._INDEX_VERSION, 'sessions': index}
+        try:
+            with tempfile.NamedTemporaryFile(
+                    'wt', encoding='UTF-8', dir=self._location,
+                    prefix=self._INDEX_FILE, delete=False) as stream:
+                try:
+                    json.dump(index_repr, stream, separators=(',', ':'))
+                    stream.close()
+                    os.replace(stream.name, pathname)
+                except BaseException:
+                    os.unlink(stream.name)
+                    raise
+        except (IOError, OSError) as exc:
+            logger.warning(_("Cannot save session index %r: %s"),
+                           pathname, exc)
+
     def __iter__(self):
         """
         Same as :meth:`get_storage_list()`
@@ -216,14 +328,29 @@ class SessionStorage:
 
     _SESSION_FILE_NEXT = 'session.next'
 
-    def __init__(self, location):
+    _JOURNAL_FILE = 'session.journal'
+
+    _HEADER_FILE = 'session.header'
+
+    _HEADER_FILE_NEXT = 'session.header.next'
+
+    _JOURNAL_RECORD_HEADER = struct.Struct('<I')
+
+    def __init__(self, location, header=None):
         """
         Initialize a :class:`SessionStorage` with the given location.
 
         The location is not created. If you want to ensure that it exists
         call :meth:`create()` instead.
+
+        :param header:
+            (optional) The text of the session header, if it is already known
+            (typically from the index maintained by
+            :class:`SessionStorageRepository`). An empty string means that
+            the session has no header.
         """
         self._location = location
+        self._header = header
 
     def __repr__(self):
         return "<{} location:{!r}>".format(
@@ -250,6 +377,20 @@ class SessionStorage:
         """
         return os.path.join(self._location, self._SESSION_FILE)
 
+    @property
+    def journal_file(self):
+        """
+        pathname of the checkpoint journal file
+        """
+        return os.path.join(self._location, self._JOURNAL_FILE)
+
+    @property
+    def header_file(self):
+        """
+        pathname of the session header file
+        """
+        return os.path.join(self._location, self._HEADER_FILE)
+
     @classmethod
     def create(cls, base_dir, legacy_mode=False, prefix='pbox-'):
         """
@@ -382,6 +523,25 @@ class SessionStorage:
             "platform/python combination is not supported: {} + {}".format(
                 sys.version, sys.platform))
 
+    def get_checkpoint_size(self):
+        """
+        Compute the size of the checkpoint data without loading it
+
+        :returns:
+            the number of bytes used by the most recent checkpoint and by the
+            checkpoint journal, zero if no checkpoint was ever saved
+        :raises IOError, OSError:
+            on various problems related to accessing the filesystem
+        """
+        size = 0
+        for pathname in (self.session_file, self.journal_file):
+            try:
+                size += os.stat(pathname).st_size
+            except (IOError, OSError) as exc:
+                if exc.errno != errno.ENOENT:
+                    raise
+        return size
+
     def save_checkpoint(self, data):
         """
         Save checkpoint data to the filesystem.
@@ -421,6 +581,144 @@ class SessionStorage:
             "platform/python combination is not supported: {} + {}".format(
                 sys.version, sys.platform))
 
+    def load_header(self):
+        """
+        Load the session header from the filesystem.
+
+        :returns:
+            data saved by :meth:`save_header()` or an empty bytes object if
+            the header was never saved.
+        :raises IOError, OSError:
+            on various problems related to accessing the filesystem
+        """
+        if self._header is not None:
+            return self._header.encode("UTF-8")
+        try:
+            with open(self.header_file, 'rb') as stream:
+                return stream.read()
+        except (IOError, OSError) as exc:
+            if exc.errno == errno.ENOENT:
+                return b''
+            raise
+
+    def save_header(self, data):
+        """
+        Save the session header to the filesystem.
+
+        :param data:
+            Bytes describing the session in a compact way. The header should be
+            kept small, it is read whenever sessions are enumerated.
+        :raises TypeError:
+            if data is not a bytes object.
+        :raises IOError, OSError:
+            on various problems related to accessing the filesystem.
+        """
+        if not isinstance(data, bytes):
+            raise TypeError("data must be bytes")
+        _next_header_pathname = os.path.join(
+            self._location, self._HEADER_FILE_NEXT)
+        with open(_next_header_pathname, 'wb') as stream:
+            stream.write(data)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(_next_header_pathname, self.header_file)
+        self._header = None
+
+    def reset_journal(self, data):
+        """
+        Start a new, empty checkpoint journal.
+
+        :param data:
+            Checkpoint data that was just saved with :meth:`save_checkpoint()`.
+            The journal is bound to this data (by a digest stored in the first
+            record) so that a journal left behind by an older checkpoint is
+            never replayed on top of a newer one.
+
+        The checkpoint journal is an append-only file with small records that
+        describe changes made to the session since the last checkpoint. See
+        :meth:`append_journal()` and :meth:`load_journal()` for details.
+
+        :raises IOError, OSError:
+            on various problems related to accessing the filesystem.
+        """
+        if not isinstance(data, bytes):
+            raise TypeError("data must be bytes")
+        digest = hashlib.sha1(data).hexdigest().encode("ASCII")
+        logger.debug(
+            _("Starting new checkpoint journal %r"), self.journal_file)
+        with open(self.journal_file, 'wb') as stream:
+            stream.write(self._JOURNAL_RECORD_HEADER.pack(len(digest)))
+            stream.write(digest)
+            stream.flush()
+            os.fsync(stream.fileno())
+
+    def append_journal(self, record):
+        """
+        Append a record to the checkpoint journal.
+
+        :param record:
+            Bytes to append. The content is opaque to the storage layer.
+        :raises TypeError:
+            if record is not a bytes object.
+        :raises IOError, OSError:
+            on various problems related to accessing the filesystem.
+
+        The record is flushed to the disk before this method returns. A record
+        that was only partially written (e.g. because the machine crashed) is
+        silently discarded by :meth:`load_journal()`.
+        """
+        if not isinstance(record, bytes):
+            raise TypeError("record must be bytes")
+        logger.debug(ngettext(
+            "Appending %d byte to checkpoint journal",
+            "Appending %d bytes to checkpoint journal",
+            len(record)), len(record))
+        with open(self.journal_file, 'ab') as stream:
+            stream.write(
+                self._JOURNAL_RECORD_HEADER.pack(len(record)) + record)
+            stream.flush()
+            os.fsync(stream.fileno())
+
+    def load_journal(self, data):
+        """
+        Load records from the checkpoint journal.
+
+        :param data:
+            Checkpoint data, as returned by :meth:`load_checkpoint()`.
+        :returns:
+            list of bytes, one for each record appended with
+            :meth:`append_journal()` since the journal was last reset. The
+            list is empty if there is no journal or if the journal belongs to
+            some other checkpoint data.
+        :raises IOError, OSError:
+            on various problems related to accessing the filesystem.
+        """
+        try:
+            with open(self.journal_file, 'rb') as stream:
+                journal = stream.read()
+        except (IOError, OSError) as exc:
+            if exc.errno == errno.ENOENT:
+                return []
+            raise
+        header_size = self._JOURNAL_RECORD_HEADER.size
+        record_list = []
+        offset = 0
+        while offset + header_size <= len(journal):
+            size, = self._JOURNAL_RECORD_HEADER.unpack_from(journal, offset)
+            offset += header_size
+            if offset + size > len(journal):
+                logger.warning(
+                    _("Discarding truncated record in %r"), self.journal_file)
+                break
+            record_list.append(journal[offset:offset + size])
+            offset += size
+        digest = hashlib.sha1(data).hexdigest().encode("ASCII")
+        if not record_list or record_list[0] != digest:
+            logger.debug(_("Ignoring stale checkpoint journal %r"),
+                         self.journal_file)
+            return []
+        return record_list[1:]
+
     def break_lock(self):
         """
         Forcibly unlock the storage by removing a file created during
@@ -83,6 +83,28 @@ Serialization format versions
 5) Same as '4' but DiskJobResult is stored with a relative pathname to the log
    file if session_dir is provided.
 6) Same as '5' plus store the list of mandatory jobs.
+
+Checkpoint journal
+^^^^^^^^^^^^^^^^^^
+Saving a complete snapshot after each job gets progressively more expensive as
+the session grows. To keep checkpoints cheap
+:class:`~plainbox.impl.session.manager.SessionManager` saves a full snapshot
+only from time to time and, in between, appends small records computed by
+:class:`SessionDeltaSuspendHelper` to a journal kept next to the snapshot.
+Each record is a JSON object with any of the following keys:
+
+``jobs``
+    Replaces the ``jobs`` mapping of the snapshot. Only present when the run
+    list has changed.
+``checksums``
+    Merged into the ``jobs`` mapping of the snapshot.
+``results``
+    Merged into the ``results`` mapping of the snapshot.
+``desired_job_list``, ``mandatory_job_list``, ``metadata``
+    Replace the corresponding item of the snapshot.
+
+The records are replayed, in order, on top of the snapshot by
+:class:`~plainbox.impl.session.resume.SessionResumeHelper`.
 """
 
 import base64
@@ -139,6 +161,37 @@ class SessionSuspendHelper1:
         # NOTE: gzip.compress is not deterministic on python3.2
         return gzip.compress(data)
 
+    def suspend_header(self, session, session_dir=None):
+        """
+        Compute the representation of the session header.
+
+        The header is a small, uncompressed, document that describes just the
+        meta-data of the session. It is saved next to the checkpoint so that
+        :class:`~plainbox.impl.session.resume.SessionPeekHelper` can look at
+        the meta-data without having to load the whole session.
+
+        :param session:
+            The SessionState object to represent.
+        :param session_dir:
+            (optional) The base directory of the session.
+
+        :returns bytes: the serialized data
+        """
+        json_repr = {
+            "version": self.VERSION,
+            "session": {
+                "metadata": self._repr_SessionMetaData(
+                    session.metadata, session_dir),
+            },
+        }
+        return json.dumps(
+            json_repr,
+            ensure_ascii=False,
+            sort_keys=True,
+            indent=None,
+            separators=(',', ':')
+        ).encode("UTF-8")
+
     def _json_repr(self, session, session_dir):
         """
         Compute the representation of all of the data that needs to be saved.
@@ -649,3 +702,144 @@ class SessionSuspendHelper6(SessionSuspendHelper5):
 
 # Alias for the most recent version
 SessionSuspendHelper = SessionSuspendHelper6
+
+
+class SessionDeltaSuspendHelper(SessionSuspendHelper):
+
+    """
+    Helper class for computing incremental representation of a session.
+
+    The helper remembers what the session looked like when it was created (or
+    when :meth:`suspend_delta()` was last called) and computes small records
+    that describe what has changed since then. The records are meant to be
+    appended to the checkpoint journal, using
+    :meth:`~plainbox.impl.session.storage.SessionStorage.append_journal()`,
+    on top of a full snapshot created with :class:`SessionSuspendHelper`.
+    """
+
+    def __init__(self, session, session_dir=None):
+        """
+        Initialize the helper with the session at the time of a snapshot.
+
+        :param session:
+            The SessionState object that was just suspended.
+        :param session_dir:
+            (optional) The base directory of the session, the same as passed
+            to :meth:`suspend()`.
+        """
+        self._session = session
+        self._result_history_map = self._get_result_history_map(session)
+        # NOTE: job lists are compared by identity of their items as
+        # computing job identifiers is relatively expensive.
+        self._run_list = list(session.run_list)
+        self._desired_job_list = list(session.desired_job_list)
+        self._mandatory_job_list = list(session.mandatory_job_list)
+        self._metadata = self._repr_SessionMetaData(
+            session.metadata, session_dir)
+
+    def needs_snapshot(self, session):
+        """
+        Check if changes to the session can be described by a delta record.
+
+        :param session:
+            The SessionState object to represent.
+        :returns:
+            True if a full snapshot has to be created instead
+        """
+        if session is not self._session:
+            return True
+        # Removal of a job that had results cannot be described by a delta
+        return not (
+            self._result_history_map.keys() <= session.job_state_map.keys())
+
+    def suspend_delta(self, session, session_dir=None):
+        """
+        Compute the delta record.
+
+        :param session:
+            The SessionState object to represent.
+        :param session_dir:
+            (optional) The base directory of the session.
+        :returns:
+            The serialized record or None if nothing has changed.
+        """
+        delta_repr = self._repr_SessionState_delta(session, session_dir)
+        if not delta_repr:
+            return None
+        return json.dumps(
+            delta_repr,
+            ensure_ascii=False,
+            sort_keys=True,
+            indent=None,
+            separators=(',', ':')
+        ).encode("UTF-8")
+
+    def _repr_SessionState_delta(self, obj, session_dir):
+        """
+        Compute the representation of changes made to SessionState.
+
+        :returns:
+            JSON-friendly representation
+        :rtype:
+            dict
+
+        The result is a dictionary with the items described in the
+        documentation of this module. Items that didn't change are omitted.
+        """
+        delta_repr = {}
+        result_history_map = {}
+        checksums_repr = {}
+        results_repr = {}
+        for job_id, state in obj.job_state_map.items():
+            result_history = state.result_history
+            if not result_history:
+                continue
+            result_history_map[job_id] = result_history
+            if result_history is not self._result_history_map.get(job_id):
+                checksums_repr[job_id] = state.job.checksum
+                results_repr[job_id] = [
+                    self._repr_JobResult(result, session_dir)
+                    for result in result_history]
+        self._result_history_map = result_history_map
+        if checksums_repr:
+            delta_repr["checksums"] = checksums_repr
+            delta_repr["results"] = results_repr
+        run_list = list(obj.run_list)
+        if not self._is_same_job_list(run_list, self._run_list):
+            self._run_list = run_list
+            id_run_list = frozenset([job.id for job in run_list])
+            delta_repr["jobs"] = {
+                state.job.id: state.job.checksum
+                for state in obj.job_state_map.values()
+                if not state.result.is_hollow or state.job.id in id_run_list
+            }
+        desired_job_list = list(obj.desired_job_list)
+        if not self._is_same_job_list(
+                desired_job_list, self._desired_job_list):
+            self._desired_job_list = desired_job_list
+            delta_repr["desired_job_list"] = [
+                job.id for job in desired_job_list]
+        mandatory_job_list = list(obj.mandatory_job_list)
+        if not self._is_same_job_list(
+                mandatory_job_list, self._mandatory_job_list):
+            self._mandatory_job_list = mandatory_job_list
+            delta_repr["mandatory_job_list"] = [
+                job.id for job in mandatory_job_list]
+        metadata = self._repr_SessionMetaData(obj.metadata, session_dir)
+        if metadata != self._metadata:
+            self._metadata = metadata
+            delta_repr["metadata"] = metadata
+        return delta_repr
+
+    @staticmethod
+    def _get_result_history_map(session):
+        return {
+            job_id: state.result_history
+            for job_id, state in session.job_state_map.items()
+            if state.result_history
+        }
+
+    @staticmethod
+    def _is_same_job_list(job_list, other_job_list):
+        return len(job_list) == len(other_job_list) and all(
+            job is other for job, other in zip(job_list, other_job_list))
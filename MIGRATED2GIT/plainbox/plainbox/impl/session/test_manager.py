@@ -24,14 +24,21 @@ plainbox.impl.test_manager
 Test definitions for plainbox.impl.session.manager module
 """
 
+from tempfile import TemporaryDirectory
+from unittest import TestCase
 from unittest import expectedFailure
 
 from plainbox.abc import IJobDefinition
+from plainbox.abc import IJobResult
+from plainbox.impl.result import MemoryJobResult
 from plainbox.impl.session import SessionManager
 from plainbox.impl.session import SessionState
 from plainbox.impl.session import SessionStorage
+from plainbox.impl.session.resume import SessionPeekHelper
 from plainbox.impl.session.state import SessionDeviceContext
+from plainbox.impl.session.storage import SessionStorageRepository
 from plainbox.impl.session.suspend import SessionSuspendHelper
+from plainbox.impl.testing_utils import make_job
 from plainbox.vendor import mock
 from plainbox.vendor.morris import SignalTestCase
 
@@ -87,7 +94,10 @@ class SessionManagerTests(SignalTestCase):
         """
         # Mock the suspend helper, we don't want to suspend our mock objects
         helper_name = "plainbox.impl.session.manager.SessionSuspendHelper"
-        with mock.patch(helper_name, spec=SessionSuspendHelper) as helper_cls:
+        delta_helper_name = (
+            "plainbox.impl.session.manager.SessionDeltaSuspendHelper")
+        with mock.patch(helper_name, spec=SessionSuspendHelper) as \
+                helper_cls, mock.patch(delta_helper_name):
             # Call the tested method
             self.manager.checkpoint()
             # Ensure that a fresh instance of the suspend helper was used to
@@ -99,6 +109,46 @@ class SessionManagerTests(SignalTestCase):
         # the return value of what the suspend helper produced.
         self.storage.save_checkpoint.assert_called_with(
             helper_cls().suspend(self.context.state))
+        # Ensure that the checkpoint journal was reset
+        self.storage.reset_journal.assert_called_with(
+            helper_cls().suspend(self.context.state))
+
+    def test_checkpoint__journal(self):
+        """
+        verify that subsequent calls to SessionManager.checkpoint() append
+        delta records to the checkpoint journal.
+        """
+        helper_name = "plainbox.impl.session.manager.SessionSuspendHelper"
+        delta_helper_name = (
+            "plainbox.impl.session.manager.SessionDeltaSuspendHelper")
+        with mock.patch(helper_name, spec=SessionSuspendHelper) as \
+                helper_cls, mock.patch(delta_helper_name) as delta_helper_cls:
+            delta_helper_cls().needs_snapshot.return_value = False
+            self.manager.checkpoint()
+            self.manager.checkpoint()
+            self.assertEqual(helper_cls().suspend.call_count, 1)
+            delta_helper_cls().suspend_delta.assert_called_with(
+                self.context.state, self.storage.location)
+        self.storage.append_journal.assert_called_with(
+            delta_helper_cls().suspend_delta())
+
+    def test_checkpoint__compaction(self):
+        """
+        verify that SessionManager.checkpoint() saves a full snapshot once
+        the checkpoint journal is full.
+        """
+        helper_name = "plainbox.impl.session.manager.SessionSuspendHelper"
+        delta_helper_name = (
+            "plainbox.impl.session.manager.SessionDeltaSuspendHelper")
+        with mock.patch(helper_name, spec=SessionSuspendHelper) as \
+                helper_cls, mock.patch(delta_helper_name) as delta_helper_cls:
+            delta_helper_cls().needs_snapshot.return_value = False
+            for i in range(SessionManager.CHECKPOINT_JOURNAL_LIMIT + 2):
+                self.manager.checkpoint()
+            self.assertEqual(helper_cls().suspend.call_count, 2)
+        self.assertEqual(
+            self.storage.append_journal.call_count,
+            SessionManager.CHECKPOINT_JOURNAL_LIMIT)
 
     def test_load_session(self):
         """
@@ -118,13 +168,16 @@ class SessionManagerTests(SignalTestCase):
             with mock.patch.object(SessionManager, '_propagate_test_plans'):
                 manager = SessionManager.load_session(unit_list, self.storage)
         # Ensure that the storage object was used to load the session snapshot
+        # and the checkpoint journal
         self.storage.load_checkpoint.assert_called_with()
+        self.storage.load_journal.assert_called_with(
+            self.storage.load_checkpoint())
         # Ensure that the helper was instantiated with the unit list, flags and
         # location
         helper_cls.assert_called_with(unit_list, flags, self.storage.location)
         # Ensure that the helper instance was asked to recreate session state
         helper_cls().resume.assert_called_with(
-            self.storage.load_checkpoint(), None)
+            self.storage.load_checkpoint(), None, self.storage.load_journal())
         # Ensure that the resulting manager has correct data inside
         self.assertEqual(manager.state, helper_cls().resume())
         self.assertEqual(manager.storage, self.storage)
@@ -306,3 +359,91 @@ class SessionManagerTests(SignalTestCase):
             manager.add_local_device_context()
             self.assertSignalFired(manager.on_device_context_added, sdc())
             self.assertIn(sdc(), manager.device_context_list)
+
+
+class SessionManagerCheckpointJournalTests(TestCase):
+
+    """
+    End-to-end tests of checkpoints stored in the checkpoint journal
+    """
+
+    def setUp(self):
+        self.job_list = [make_job("job-{}".format(i)) for i in range(5)]
+        self._tmp = TemporaryDirectory()
+        self.repo = SessionStorageRepository(self._tmp.name)
+        self.manager = SessionManager.create_with_unit_list(
+            self.job_list, self.repo)
+        self.manager.state.update_desired_job_list(self.job_list)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run_job(self, job):
+        self.manager.state.metadata.running_job_name = job.id
+        self.manager.checkpoint()
+        self.manager.state.update_job_result(job, MemoryJobResult({
+            'outcome': IJobResult.OUTCOME_PASS,
+            'comments': job.id,
+        }))
+        self.manager.state.metadata.running_job_name = None
+        self.manager.checkpoint()
+
+    def _load_session(self):
+        return SessionManager.load_session(
+            self.job_list, self.manager.storage).state
+
+    def test_resume_from_journal(self):
+        for job in self.job_list[:3]:
+            self._run_job(job)
+        # Everything after the first checkpoint was stored in the journal
+        data = self.manager.storage.load_checkpoint()
+        self.assertEqual(len(self.manager.storage.load_journal(data)), 5)
+        state = self._load_session()
+        for job in self.job_list[:3]:
+            self.assertEqual(
+                state.job_state_map[job.id].result.outcome,
+                IJobResult.OUTCOME_PASS)
+            self.assertEqual(
+                state.job_state_map[job.id].result.comments, job.id)
+        for job in self.job_list[3:]:
+            self.assertEqual(
+                state.job_state_map[job.id].result.outcome,
+                IJobResult.OUTCOME_NONE)
+        self.assertEqual(state.metadata.running_job_name, None)
+        self.assertEqual(
+            [job.id for job in state.desired_job_list],
+            [job.id for job in self.job_list])
+
+    def test_resume_lazy_results(self):
+        for job in self.job_list[:3]:
+            self._run_job(job)
+        state = SessionManager.load_session(
+            self.job_list, self.manager.storage, flags=['lazy-results']).state
+        for job in self.job_list[:3]:
+            self.assertEqual(
+                state.job_state_map[job.id].result.outcome,
+                IJobResult.OUTCOME_PASS)
+            self.assertEqual(
+                state.job_state_map[job.id].result.comments, job.id)
+
+    def test_resume_after_compaction(self):
+        with mock.patch.object(SessionManager, 'CHECKPOINT_JOURNAL_LIMIT', 3):
+            for job in self.job_list:
+                self._run_job(job)
+        data = self.manager.storage.load_checkpoint()
+        self.assertEqual(len(self.manager.storage.load_journal(data)), 1)
+        state = self._load_session()
+        for job in self.job_list:
+            self.assertEqual(
+                state.job_state_map[job.id].result.outcome,
+                IJobResult.OUTCOME_PASS)
+
+    def test_header(self):
+        for job in self.job_list[:3]:
+            self._run_job(job)
+        self.manager.state.metadata.title = "title"
+        self.manager.checkpoint()
+        self.assertEqual(
+            SessionPeekHelper().peek_header(
+                self.manager.storage.load_header()).title,
+            "title")
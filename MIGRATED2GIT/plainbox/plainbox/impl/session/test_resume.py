@@ -41,6 +41,7 @@ from plainbox.impl.result import MemoryJobResult
 from plainbox.impl.session.resume import CorruptedSessionError
 from plainbox.impl.session.resume import IncompatibleJobError
 from plainbox.impl.session.resume import IncompatibleSessionError
+from plainbox.impl.session.resume import LazyMemoryJobResult
 from plainbox.impl.session.resume import ResumeDiscardQualifier
 from plainbox.impl.session.resume import SessionPeekHelper
 from plainbox.impl.session.resume import SessionPeekHelper1
@@ -359,6 +360,52 @@ class SessionPeekHelperTests(TestCase):
                              'results': {}},
                  'version': 6})
 
+    def test_peek_header(self):
+        helper6 = SessionPeekHelper6
+        with mock.patch.object(helper6, 'peek_json'):
+            data = (
+                b'{"session":{"metadata":{"app_blob":null,"app_id":null,'
+                b'"flags":[],"running_job_name":null,"title":null}},'
+                b'"version":6}')
+            SessionPeekHelper().peek_header(data)
+            helper6.peek_json.assert_called_once_with(
+                {'session': {'metadata': {'title': None,
+                                          'running_job_name': None,
+                                          'app_blob': None,
+                                          'app_id': None,
+                                          'flags': []}},
+                 'version': 6})
+
+    def test_peek_storage__header(self):
+        storage = mock.Mock(name='storage')
+        storage.load_header.return_value = (
+            b'{"session":{"metadata":{"app_blob":null,"app_id":null,'
+            b'"flags":[],"running_job_name":null,"title":"title"}},'
+            b'"version":6}')
+        metadata = SessionPeekHelper().peek_storage(storage)
+        self.assertEqual(metadata.title, "title")
+        self.assertEqual(storage.load_checkpoint.call_count, 0)
+
+    def test_peek_storage__checkpoint(self):
+        storage = mock.Mock(name='storage')
+        storage.load_header.return_value = b''
+        storage.load_checkpoint.return_value = gzip.compress(
+            b'{"session":{"desired_job_list":[],"jobs":{},'
+            b'"mandatory_job_list":[],"metadata":{"app_blob":null,'
+            b'"app_id":null,"flags":[],"running_job_name":null,'
+            b'"title":"title"},"results":{}},"version":6}')
+        storage.load_journal.return_value = [
+            b'{"metadata":{"app_blob":null,"app_id":null,"flags":[],'
+            b'"running_job_name":null,"title":"new title"}}']
+        metadata = SessionPeekHelper().peek_storage(storage)
+        self.assertEqual(metadata.title, "new title")
+
+    def test_peek_storage__empty(self):
+        storage = mock.Mock(name='storage')
+        storage.load_header.return_value = b''
+        storage.load_checkpoint.return_value = b''
+        self.assertIsNone(SessionPeekHelper().peek_storage(storage))
+
 
 class SessionResumeTests(TestCase):
 
@@ -403,6 +450,47 @@ class SessionResumeTests(TestCase):
             SessionResumeHelper([], None, None).resume(data)
         self.assertIsInstance(boom.exception.__context__, ValueError)
 
+    def test_resume_garbage_journal(self):
+        """
+        verify that CorruptedSessionError is raised when we try to replay
+        a malformed journal record.
+        """
+        data = gzip.compress(b'{"session":{},"version":6}')
+        with self.assertRaises(CorruptedSessionError) as boom:
+            SessionResumeHelper([], None, None).resume(data, None, [b"{"])
+        self.assertIsInstance(boom.exception.__context__, ValueError)
+
+    def test_replay_journal(self):
+        """
+        verify that journal records are applied on top of the snapshot
+        """
+        json_repr = {
+            'session': {
+                'jobs': {'a': 'a-checksum', 'b': 'b-checksum'},
+                'results': {'a': ['a-result']},
+                'desired_job_list': ['a', 'b'],
+                'mandatory_job_list': [],
+                'metadata': {'title': None},
+            },
+            'version': 6
+        }
+        journal = [
+            b'{"checksums":{"b":"b-checksum"},"results":{"b":["b-result"]}}',
+            b'{"desired_job_list":["b"],"jobs":{"b":"b-checksum"}}',
+            b'{"metadata":{"title":"title"}}',
+        ]
+        SessionResumeHelper([], None, None).replay_journal(json_repr, journal)
+        self.assertEqual(json_repr, {
+            'session': {
+                'jobs': {'b': 'b-checksum'},
+                'results': {'a': ['a-result'], 'b': ['b-result']},
+                'desired_job_list': ['b'],
+                'mandatory_job_list': [],
+                'metadata': {'title': 'title'},
+            },
+            'version': 6
+        })
+
 
 class EndToEndTests(TestCaseWithParameters):
 
@@ -981,6 +1069,42 @@ class MemoryJobResultResumeTests(JobResultResumeMixIn, TestCaseWithParameters):
             IOLogRecord(0.0, 'stdout', b'')
         ]))
 
+    def test_build_JobResult_lazy(self):
+        """
+        verify that _build_JobResult() restores the I/O log and comments
+        lazily if FLAG_LAZY_RESULTS_F is set
+        """
+        resume_cls = self.parameters.resume_cls
+        obj_repr = copy.copy(self.good_repr)
+        obj_repr['comments'] = 'comments'
+        obj_repr['io_log'] = [[0.0, 'stdout', 'Zm9v']]
+        with mock.patch.object(resume_cls, '_build_IOLogRecord',
+                               wraps=resume_cls._build_IOLogRecord):
+            obj = resume_cls._build_JobResult(
+                obj_repr, resume_cls.FLAG_LAZY_RESULTS_F, None)
+            self.assertIsInstance(obj, LazyMemoryJobResult)
+            self.assertEqual(obj.outcome, 'pass')
+            self.assertFalse(obj.is_hollow)
+            self.assertEqual(resume_cls._build_IOLogRecord.call_count, 0)
+            self.assertEqual(obj.io_log, (
+                IOLogRecord(0.0, 'stdout', b'foo'),))
+            self.assertEqual(obj.comments, 'comments')
+            self.assertEqual(resume_cls._build_IOLogRecord.call_count, 1)
+        self.assertEqual(
+            obj, resume_cls._build_JobResult(obj_repr, 0, None))
+
+    def test_build_JobResult_lazy_corrupted_io_log(self):
+        """
+        verify that lazily restored results check the I/O log on first access
+        """
+        resume_cls = self.parameters.resume_cls
+        obj_repr = copy.copy(self.good_repr)
+        obj_repr['io_log'] = "text"
+        obj = resume_cls._build_JobResult(
+            obj_repr, resume_cls.FLAG_LAZY_RESULTS_F, None)
+        with self.assertRaises(CorruptedSessionError):
+            obj.io_log
+
 
 class DiskJobResultResumeTestsCommon(JobResultResumeMixIn,
                                      TestCaseWithParameters):
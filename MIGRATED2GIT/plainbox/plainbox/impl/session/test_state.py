@@ -43,6 +43,7 @@ from plainbox.impl.session.state import SessionDeviceContext
 from plainbox.impl.session.state import SessionMetaData
 from plainbox.impl.testing_utils import make_job
 from plainbox.impl.unit.job import JobDefinition
+from plainbox.impl.unit.testplan import TestPlanUnit
 from plainbox.impl.unit.unit import Unit
 from plainbox.impl.unit.unit_with_id import UnitWithId
 from plainbox.vendor import mock
@@ -188,6 +189,60 @@ class SessionStateAPITests(TestCase):
             session.job_state_map[job.id].readiness_inhibitor_list,
             [UndesiredJobReadinessInhibitor])
 
+    def test_add_units(self):
+        # Define a couple of jobs
+        job_a = make_job("A")
+        job_b = make_job("B", depends="A")
+        # Define a session that already knows about one identical job
+        session = SessionState([make_job("A")])
+        signal_list = []
+        session.on_job_state_map_changed.connect(
+            lambda: signal_list.append('changed'))
+        session.on_job_added.connect(
+            lambda job: signal_list.append(job.id))
+        with mock.patch.object(session, '_update_job_readiness') as mocked:
+            added = session.add_units([job_a, job_b])
+        # Identical jobs are silently discarded, like in add_unit()
+        self.assertEqual(added, [session.job_list[0], job_b])
+        self.assertEqual(len(session.job_list), 2)
+        self.assertIs(session.job_state_map['B'].job, job_b)
+        # The state map changed signal was fired once, before the signals
+        # about each of the new jobs
+        self.assertEqual(signal_list, ['changed', 'B'])
+        # Job readiness was computed just once
+        mocked.assert_called_once_with()
+        # The new job is not selected to run
+        self.assertEqual(
+            session.job_state_map['B'].readiness_inhibitor_list,
+            [UndesiredJobReadinessInhibitor])
+
+    def test_add_units_clashing_job(self):
+        job_a = make_job("A")
+        clashing_job = make_job("A", plugin='other')
+        job_b = make_job("B")
+        session = SessionState([job_a])
+        with self.assertRaises(DependencyDuplicateError) as call:
+            session.add_units([clashing_job, job_b])
+        self.assertIs(call.exception.job, job_a)
+        self.assertIs(call.exception.duplicate_job, clashing_job)
+        self.assertEqual(session.job_list, [job_a])
+
+    def test_add_units_clashing_job__problem_list(self):
+        job_a = make_job("A")
+        clashing_job = make_job("A", plugin='other')
+        job_b = make_job("B")
+        session = SessionState([job_a])
+        problem_list = []
+        added = session.add_units(
+            [clashing_job, job_b], problem_list=problem_list)
+        # The clashing job is discarded and reported
+        self.assertEqual(added, [job_b])
+        self.assertEqual(session.job_list, [job_a, job_b])
+        self.assertEqual(len(problem_list), 1)
+        self.assertIsInstance(problem_list[0], DependencyDuplicateError)
+        self.assertIs(problem_list[0].job, job_a)
+        self.assertIs(problem_list[0].duplicate_job, clashing_job)
+
     def test_add_unit_duplicate_job(self):
         # Define a job
         job = make_job("A")
@@ -738,6 +793,108 @@ class SessionStateReactionToJobResultTests(TestCase):
              self.job_Y.id: self.session.job_state_map[self.job_Y.id]})
 
 
+class SessionStateIncrementalReadinessTests(TestCase):
+    # This test checks that presenting a job result to the session only
+    # re-evaluates readiness of the jobs that depend on it.
+
+    def make_session(self, size):
+        # Each job in the plan depends on a pair of independent jobs. Job
+        # "A_<n>" requires a resource from "R_<n>" and "B_<n>" depends on
+        # "A_<n>".
+        job_list = []
+        for index in range(size):
+            job_list.append(make_job(
+                'R_{}'.format(index), plugin='resource'))
+            job_list.append(make_job(
+                'A_{}'.format(index),
+                requires='R_{}.attr == "value"'.format(index)))
+            job_list.append(make_job(
+                'B_{}'.format(index), depends='A_{}'.format(index)))
+        session = SessionState(job_list)
+        session.update_desired_job_list(job_list)
+        return session
+
+    def count_inhibitor_evaluations(self, session, job, result):
+        ctrl = job.controller
+        with mock.patch.object(
+                ctrl, 'get_inhibitor_list',
+                wraps=ctrl.get_inhibitor_list) as mock_get:
+            session.update_job_result(job, result)
+        return mock_get.call_count
+
+    def test_only_dependent_jobs_are_evaluated(self):
+        session = self.make_session(3)
+        job = session.job_state_map['A_1'].job
+        result = MemoryJobResult({'outcome': IJobResult.OUTCOME_PASS})
+        self.assertEqual(
+            self.count_inhibitor_evaluations(session, job, result), 1)
+        self.assertEqual(
+            session.job_state_map['B_1'].readiness_inhibitor_list, [])
+        self.assertEqual(
+            session.job_state_map['B_0'].readiness_inhibitor_list[0].cause,
+            InhibitionCause.PENDING_DEP)
+
+    def test_resource_result_evaluates_resource_dependencies(self):
+        session = self.make_session(3)
+        job = session.job_state_map['R_2'].job
+        result = MemoryJobResult({
+            'outcome': IJobResult.OUTCOME_PASS,
+            'io_log': [(0, 'stdout', b'attr: value\n')],
+        })
+        self.assertEqual(
+            self.count_inhibitor_evaluations(session, job, result), 1)
+        self.assertEqual(
+            session.job_state_map['A_2'].readiness_inhibitor_list, [])
+        self.assertEqual(
+            session.job_state_map['A_1'].readiness_inhibitor_list[0].cause,
+            InhibitionCause.PENDING_RESOURCE)
+
+    def test_set_resource_list_is_observed(self):
+        session = self.make_session(2)
+        session.set_resource_list('R_0', [Resource({'attr': 'value'})])
+        job = session.job_state_map['B_1'].job
+        result = MemoryJobResult({'outcome': IJobResult.OUTCOME_PASS})
+        session.update_job_result(job, result)
+        self.assertEqual(
+            session.job_state_map['A_0'].readiness_inhibitor_list, [])
+
+    def test_same_state_as_full_recompute(self):
+        session = self.make_session(4)
+        for job_id, result in [
+                ('R_0', MemoryJobResult({
+                    'outcome': IJobResult.OUTCOME_PASS,
+                    'io_log': [(0, 'stdout', b'attr: value\n')]})),
+                ('R_1', MemoryJobResult({
+                    'outcome': IJobResult.OUTCOME_PASS,
+                    'io_log': [(0, 'stdout', b'attr: other\n')]})),
+                ('A_0', MemoryJobResult({
+                    'outcome': IJobResult.OUTCOME_FAIL})),
+                ('A_2', MemoryJobResult({
+                    'outcome': IJobResult.OUTCOME_PASS}))]:
+            session.update_job_result(
+                session.job_state_map[job_id].job, result)
+        incremental = {
+            job_id: job_state.readiness_inhibitor_list
+            for job_id, job_state in session.job_state_map.items()}
+        session._recompute_job_readiness()
+        full = {
+            job_id: job_state.readiness_inhibitor_list
+            for job_id, job_state in session.job_state_map.items()}
+        self.assertEqual(incremental, full)
+
+    def test_update_cost_is_flat(self):
+        # The number of readiness evaluations done for a single result must
+        # not depend on the size of the test plan.
+        job_result = MemoryJobResult({'outcome': IJobResult.OUTCOME_PASS})
+        cost_list = []
+        for size in (10, 50, 250):
+            session = self.make_session(size)
+            job = session.job_state_map['A_0'].job
+            cost_list.append(self.count_inhibitor_evaluations(
+                session, job, job_result))
+        self.assertEqual(cost_list, [1, 1, 1])
+
+
 class SessionMetadataTests(TestCase):
 
     def test_smoke(self):
@@ -865,6 +1022,46 @@ class SessionDeviceContextTests(SignalTestCase):
         with self.assertRaises(ValueError):
             self.ctx.add_unit(self.unit)
 
+    def test_add_units(self):
+        """
+        Ensure that adding a number of units works
+        """
+        self.assertEqual(
+            self.ctx.add_units([self.unit, self.job]), [self.unit, self.job])
+        self.assertEqual(self.ctx.unit_list, [self.unit, self.job])
+        self.assertEqual(self.ctx.state.unit_list, [self.unit, self.job])
+        self.assertEqual(self.ctx.state.job_list, [self.job])
+
+    def test_add_units_twice(self):
+        """
+        Ensure that you cannot add an unit twice, nothing is added then
+        """
+        self.ctx.add_unit(self.unit)
+        with self.assertRaises(ValueError):
+            self.ctx.add_units([self.job, self.unit])
+        self.assertEqual(self.ctx.unit_list, [self.unit])
+        with self.assertRaises(ValueError):
+            self.ctx.add_units([self.job, self.job])
+        self.assertEqual(self.ctx.unit_list, [self.unit])
+
+    def test_add_units__applies_overrides(self):
+        """
+        Ensure that test plan overrides are applied to jobs added in bulk
+        """
+        self.ctx.set_test_plan_list([TestPlanUnit({
+            'id': 'tp',
+            'unit': 'test plan',
+            'category_overrides': 'apply cat to job-[ab]',
+        })])
+        job_a, job_c = make_job('job-a'), make_job('job-c')
+        self.ctx.add_units([job_a, job_c])
+        self.assertEqual(
+            self.ctx.state.job_state_map['job-a'].effective_category_id,
+            'cat')
+        self.assertEqual(
+            self.ctx.state.job_state_map['job-c'].effective_category_id,
+            job_c.category_id)
+
     def test_remove_unit(self):
         """
         Ensure that removing an unit works
@@ -953,6 +1150,22 @@ class SessionDeviceContextTests(SignalTestCase):
         sig3 = self.assertSignalFired(self.ctx.state.on_job_added, self.job)
         self.assertSignalOrdering(sig1, sig2, sig3)
 
+    def test_on_job_added__via_ctx_add_units(self):
+        """
+        Ensure that adding job units in bulk produces same/correct signals
+        """
+        self.watchSignal(self.ctx.on_unit_added)
+        self.watchSignal(self.ctx.state.on_unit_added)
+        self.watchSignal(self.ctx.state.on_job_added)
+        self.ctx.add_units([self.unit, self.job])
+        sig1 = self.assertSignalFired(self.ctx.on_unit_added, self.unit)
+        sig2 = self.assertSignalFired(self.ctx.state.on_unit_added, self.unit)
+        sig3 = self.assertSignalFired(self.ctx.on_unit_added, self.job)
+        sig4 = self.assertSignalFired(self.ctx.state.on_unit_added, self.job)
+        sig5 = self.assertSignalFired(self.ctx.state.on_job_added, self.job)
+        self.assertSignalOrdering(sig1, sig2, sig3, sig4, sig5)
+        self.assertSignalNotFired(self.ctx.state.on_job_added, self.unit)
+
     def test_on_unit_removed__via_ctx(self):
         """
         Ensure that removing units produces same/correct signals
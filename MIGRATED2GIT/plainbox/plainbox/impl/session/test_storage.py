@@ -119,6 +119,58 @@ class SessionStorageRepositoryTests(TestCase):
             expected = "HOME/.cache/plainbox/sessions"
             self.assertEqual(measured, expected)
 
+    def test_get_storage_list__index(self):
+        with TemporaryDirectory() as tmp:
+            repo = SessionStorageRepository(tmp)
+            storage1 = SessionStorage.create(tmp, prefix='s1-')
+            storage1.save_header(b'header 1')
+            storage2 = SessionStorage.create(tmp, prefix='s2-')
+            # Sessions without the header are listed as well
+            header_map = {
+                storage.id: storage.load_header()
+                for storage in repo.get_storage_list()}
+            self.assertEqual(
+                header_map, {storage1.id: b'header 1', storage2.id: b''})
+            index_pathname = os.path.join(
+                tmp, SessionStorageRepository._INDEX_FILE)
+            self.assertTrue(os.path.isfile(index_pathname))
+            # Headers are served from the index, only the index is opened
+            with mock.patch('builtins.open', wraps=open) as mock_open:
+                header_map = {
+                    storage.id: storage.load_header()
+                    for storage in repo.get_storage_list()}
+            self.assertEqual(mock_open.call_count, 1)
+            self.assertEqual(header_map[storage1.id], b'header 1')
+            # Stale entries are refreshed
+            storage1.save_header(b'new header 1')
+            storage2.save_header(b'header 2')
+            header_map = {
+                storage.id: storage.load_header()
+                for storage in repo.get_storage_list()}
+            self.assertEqual(
+                header_map,
+                {storage1.id: b'new header 1', storage2.id: b'header 2'})
+            # Removed sessions are dropped from the index
+            storage1.remove()
+            self.assertEqual(
+                [storage.id for storage in repo.get_storage_list()],
+                [storage2.id])
+            self.assertEqual(list(repo._load_index()), [
+                os.path.basename(storage2.location)])
+
+    def test_get_storage_list__damaged_index(self):
+        with TemporaryDirectory() as tmp:
+            repo = SessionStorageRepository(tmp)
+            storage = SessionStorage.create(tmp)
+            storage.save_header(b'header')
+            with open(os.path.join(
+                    tmp, SessionStorageRepository._INDEX_FILE), 'wt') as f:
+                f.write('garbage')
+            storage_list = repo.get_storage_list()
+            self.assertEqual(storage_list[0].load_header(), b'header')
+            self.assertEqual(list(repo._load_index()), [
+                os.path.basename(storage.location)])
+
 
 class SessionStorageTests(TestCase):
 
@@ -187,3 +239,67 @@ class SessionStorageTests(TestCase):
             data_in = storage.load_checkpoint()
             # Check if it's right
             self.assertEqual(data_out, data_in)
+
+    def test_load_journal__missing(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            self.assertEqual(storage.load_journal(b'some data'), [])
+
+    def test_append_load_journal(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            storage.save_checkpoint(b'some data')
+            storage.reset_journal(b'some data')
+            self.assertEqual(storage.load_journal(b'some data'), [])
+            storage.append_journal(b'record 1')
+            storage.append_journal(b'record 2')
+            self.assertEqual(
+                storage.load_journal(b'some data'), [b'record 1', b'record 2'])
+            # Resetting the journal discards all of the records
+            storage.reset_journal(b'some data')
+            self.assertEqual(storage.load_journal(b'some data'), [])
+
+    def test_load_journal__stale(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            storage.reset_journal(b'old data')
+            storage.append_journal(b'record')
+            # The journal is not replayed on top of some other checkpoint
+            self.assertEqual(storage.load_journal(b'new data'), [])
+
+    def test_load_journal__truncated(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            storage.reset_journal(b'some data')
+            storage.append_journal(b'record 1')
+            storage.append_journal(b'record 2')
+            with open(storage.journal_file, 'r+b') as stream:
+                stream.truncate(os.path.getsize(storage.journal_file) - 1)
+            self.assertEqual(storage.load_journal(b'some data'), [b'record 1'])
+
+    def test_append_journal__not_bytes(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            with self.assertRaises(TypeError):
+                storage.append_journal('record')
+
+    def test_load_save_header(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            self.assertEqual(storage.load_header(), b'')
+            storage.save_header(b'some header')
+            self.assertEqual(storage.load_header(), b'some header')
+            storage.save_header(b'other header')
+            self.assertEqual(storage.load_header(), b'other header')
+
+    def test_get_checkpoint_size(self):
+        with TemporaryDirectory() as tmp:
+            storage = SessionStorage.create(tmp)
+            self.assertEqual(storage.get_checkpoint_size(), 0)
+            storage.save_checkpoint(b'some data')
+            self.assertEqual(storage.get_checkpoint_size(), 9)
+            storage.reset_journal(b'some data')
+            storage.append_journal(b'record')
+            self.assertEqual(
+                storage.get_checkpoint_size(),
+                9 + os.path.getsize(storage.journal_file))
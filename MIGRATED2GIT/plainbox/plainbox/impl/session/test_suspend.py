@@ -27,6 +27,7 @@ Test definitions for :mod:`plainbox.impl.session.suspend` module
 from functools import partial
 from unittest import TestCase
 import gzip
+import json
 
 from plainbox.abc import IJobResult
 from plainbox.impl.job import JobDefinition
@@ -35,6 +36,7 @@ from plainbox.impl.result import IOLogRecord
 from plainbox.impl.result import MemoryJobResult
 from plainbox.impl.session.state import SessionMetaData
 from plainbox.impl.session.state import SessionState
+from plainbox.impl.session.suspend import SessionDeltaSuspendHelper
 from plainbox.impl.session.suspend import SessionSuspendHelper1
 from plainbox.impl.session.suspend import SessionSuspendHelper2
 from plainbox.impl.session.suspend import SessionSuspendHelper3
@@ -915,6 +917,20 @@ class SessionSuspendHelper6Tests(SessionSuspendHelper5Tests):
             b'"running_job_name":null,"title":null},"results":{}},'
             b'"version":6}'))
 
+    def test_suspend_header(self):
+        """
+        verify that the suspend_header() method returns JSON representation
+        of the session meta-data
+        """
+        session = SessionState([])
+        session.metadata.title = "title"
+        data = self.helper.suspend_header(session, self.session_dir)
+        self.assertEqual(data, (
+            b'{"session":{"metadata":'
+            b'{"app_blob":null,"app_id":null,"flags":[],'
+            b'"running_job_name":null,"title":"title"}},'
+            b'"version":6}'))
+
     def test_repr_SessionState_typical_session(self):
         """
         verify the representation of a SessionState with some unused jobs
@@ -989,6 +1005,72 @@ class SessionSuspendHelper6Tests(SessionSuspendHelper5Tests):
         })
 
 
+class SessionDeltaSuspendHelperTests(TestCase):
+    """
+    Tests for various methods of SessionDeltaSuspendHelper
+    """
+
+    def setUp(self):
+        self.job_a = make_job("a")
+        self.job_b = make_job("b")
+        self.session = SessionState([self.job_a, self.job_b])
+        self.helper = SessionDeltaSuspendHelper(self.session)
+
+    def test_suspend_delta__nothing_changed(self):
+        """
+        verify that suspend_delta() returns None if nothing has changed
+        """
+        self.assertIsNone(self.helper.suspend_delta(self.session))
+
+    def test_suspend_delta__result(self):
+        """
+        verify that suspend_delta() describes only the new result
+        """
+        result = MemoryJobResult({'outcome': IJobResult.OUTCOME_PASS})
+        self.session.update_job_result(self.job_a, result)
+        data = self.helper.suspend_delta(self.session)
+        self.assertEqual(json.loads(data.decode("UTF-8")), {
+            "checksums": {"a": self.job_a.checksum},
+            "results": {"a": [self.helper._repr_JobResult(result, None)]},
+        })
+        # The same result is not described again
+        self.assertIsNone(self.helper.suspend_delta(self.session))
+
+    def test_suspend_delta__desired_job_list(self):
+        """
+        verify that suspend_delta() describes changes to the run list
+        """
+        self.session.update_desired_job_list([self.job_b])
+        data = self.helper.suspend_delta(self.session)
+        self.assertEqual(json.loads(data.decode("UTF-8")), {
+            "jobs": {"b": self.job_b.checksum},
+            "desired_job_list": ["b"],
+        })
+
+    def test_suspend_delta__metadata(self):
+        """
+        verify that suspend_delta() describes changes to meta-data
+        """
+        self.session.metadata.running_job_name = "a"
+        data = self.helper.suspend_delta(self.session)
+        self.assertEqual(
+            json.loads(data.decode("UTF-8"))["metadata"]["running_job_name"],
+            "a")
+
+    def test_needs_snapshot(self):
+        """
+        verify that needs_snapshot() detects changes that cannot be described
+        """
+        self.assertFalse(self.helper.needs_snapshot(self.session))
+        self.assertTrue(self.helper.needs_snapshot(SessionState([])))
+        self.session.update_job_result(
+            self.job_a,
+            MemoryJobResult({'outcome': IJobResult.OUTCOME_PASS}))
+        self.helper.suspend_delta(self.session)
+        self.session.remove_unit(self.job_a)
+        self.assertTrue(self.helper.needs_snapshot(self.session))
+
+
 class RegressionTests(TestCase):
 
     def test_1388055(self):
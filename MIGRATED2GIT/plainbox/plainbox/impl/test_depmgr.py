@@ -25,11 +25,13 @@ Test definitions for plainbox.impl.depmgr module
 """
 
 from unittest import TestCase
+import sys
 
 from plainbox.impl.depmgr import DependencyCycleError
 from plainbox.impl.depmgr import DependencyDuplicateError
 from plainbox.impl.depmgr import DependencyMissingError
 from plainbox.impl.depmgr import DependencySolver
+from plainbox.impl.depmgr import DependencyUnknownError
 from plainbox.impl.testing_utils import make_job
 
 
@@ -292,3 +294,95 @@ class TestDependencySolver(TestCase):
         with self.assertRaises(DependencyCycleError) as call:
             DependencySolver.resolve_dependencies(job_list)
         self.assertEqual(call.exception.job_list, [A, R, A])
+
+    def test_long_dependency_chain(self):
+        # This tests a chain that is deeper than the recursion limit
+        # J0 -> J1 -> ... -> Jn
+        n = sys.getrecursionlimit() + 100
+        job_list = [
+            make_job(id='J{}'.format(i), depends='J{}'.format(i + 1))
+            for i in range(n)]
+        job_list.append(make_job(id='J{}'.format(n)))
+        observed = DependencySolver.resolve_dependencies(job_list)
+        self.assertEqual(observed, job_list[::-1])
+
+
+class TestDependencySolverWithRecovery(TestCase):
+
+    DIRECT = DependencyMissingError.DEP_TYPE_DIRECT
+
+    def test_no_problems(self):
+        # A -> B
+        A = make_job(id='A', depends='B')
+        B = make_job(id='B')
+        observed = DependencySolver.resolve_dependencies_with_recovery(
+            [A, B], [A])
+        self.assertEqual(observed, ([B, A], [], [A]))
+
+    def test_unknown_job(self):
+        A = make_job(id='A')
+        X = make_job(id='X')
+        solution, problems, visit_list = (
+            DependencySolver.resolve_dependencies_with_recovery([A], [X, A]))
+        self.assertEqual(solution, [A])
+        self.assertEqual(problems, [DependencyUnknownError(X)])
+        self.assertEqual(visit_list, [A])
+
+    def test_missing_dependency_prunes_dependent_jobs(self):
+        # A -> B -> (inexisting C)
+        # D -> B
+        # E
+        A = make_job(id='A', depends='B')
+        B = make_job(id='B', depends='C')
+        D = make_job(id='D', depends='B')
+        E = make_job(id='E')
+        solution, problems, visit_list = (
+            DependencySolver.resolve_dependencies_with_recovery(
+                [A, B, D, E], [A, B, D, E]))
+        self.assertEqual(solution, [E])
+        self.assertEqual(problems, [
+            DependencyMissingError(B, 'C', self.DIRECT),
+            DependencyMissingError(A, 'B', self.DIRECT),
+            DependencyMissingError(D, 'B', self.DIRECT),
+        ])
+        self.assertEqual(visit_list, [E])
+
+    def test_dependency_cycle(self):
+        # A -> B -> C -> D -> B
+        # A -> E
+        # F -> C
+        A = make_job(id='A', depends='E B')
+        B = make_job(id='B', depends='C')
+        C = make_job(id='C', depends='D')
+        D = make_job(id='D', depends='B')
+        E = make_job(id='E')
+        F = make_job(id='F', depends='C')
+        solution, problems, visit_list = (
+            DependencySolver.resolve_dependencies_with_recovery(
+                [A, B, C, D, E, F], [A, F]))
+        self.assertEqual(len(problems), 5)
+        self.assertIsInstance(problems[0], DependencyCycleError)
+        self.assertEqual(problems[0].job_list, [B, C, D, B])
+        self.assertEqual(problems[1:], [
+            DependencyMissingError(A, 'B', self.DIRECT),
+            DependencyMissingError(D, 'B', self.DIRECT),
+            DependencyMissingError(C, 'D', self.DIRECT),
+            DependencyMissingError(F, 'C', self.DIRECT),
+        ])
+        # E was only needed by A so it is not a part of the solution, even if
+        # it was visited before B
+        self.assertEqual(solution, [])
+        self.assertEqual(visit_list, [])
+
+    def test_duplicate_job(self):
+        A = make_job('A')
+        another_A = make_job('A', depends='B')
+        B = make_job('B')
+        solution, problems, visit_list = (
+            DependencySolver.resolve_dependencies_with_recovery(
+                [A, another_A, B], [A, another_A]))
+        self.assertEqual(len(problems), 1)
+        self.assertIs(problems[0].job, A)
+        self.assertIs(problems[0].duplicate_job, another_A)
+        self.assertEqual(solution, [B, another_A])
+        self.assertEqual(visit_list, [another_A])
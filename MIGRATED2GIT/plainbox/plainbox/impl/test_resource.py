@@ -27,6 +27,8 @@ Test definitions for plainbox.impl.resouce module
 import ast
 from unittest import TestCase
 
+from plainbox.vendor import mock
+
 from plainbox.impl.resource import CodeNotAllowed
 from plainbox.impl.resource import ExpressionCannotEvaluateError
 from plainbox.impl.resource import ExpressionFailedError
@@ -34,6 +36,7 @@ from plainbox.impl.resource import FakeResource
 from plainbox.impl.resource import NoResourcesReferenced
 from plainbox.impl.resource import Resource
 from plainbox.impl.resource import ResourceExpression
+from plainbox.impl.resource import ResourceMap
 from plainbox.impl.resource import ResourceNodeVisitor
 from plainbox.impl.resource import ResourceProgram
 from plainbox.impl.resource import ResourceProgramError
@@ -348,6 +351,89 @@ class ResourceExpressionTests(TestCase):
         expr = ResourceExpression("obj.a == 2")
         self.assertRaises(TypeError, expr.evaluate, [{'a': 2}])
 
+    def test_evaluate_multiple_resources(self):
+        expr = ResourceExpression("a.x == 1 and b.y == 2")
+        self.assertTrue(
+            expr.evaluate(
+                [Resource({'x': 0}), Resource({'x': 1})],
+                [Resource({'y': 2})]))
+        self.assertFalse(
+            expr.evaluate(
+                [Resource({'x': 1})],
+                [Resource({'y': 1}), Resource({'y': 3})]))
+
+    def test_select_resources(self):
+        expr = ResourceExpression("obj.a == 2")
+        r1, r2, r3, r4 = (
+            Resource({'a': 2}), Resource({'a': 1}), Resource(),
+            Resource({'a': 2}))
+        self.assertEqual(expr.select_resources([r1, r2, r3, r4]), [r1, r4])
+
+    def test_select_resources_checks_resource_type(self):
+        expr = ResourceExpression("obj.a == 2")
+        self.assertRaises(TypeError, expr.select_resources, [{'a': 2}])
+
+    def test_select_resources_multiple_aliases(self):
+        expr = ResourceExpression("a.x == 1 and b.y == 2")
+        self.assertEqual(expr.select_resources([
+            Resource({'x': 1, 'y': 1})]), [])
+        r = Resource({'x': 1, 'y': 2})
+        self.assertEqual(expr.select_resources([r]), [r])
+
+
+class ResourceMapTests(TestCase):
+
+    def setUp(self):
+        self.expr = ResourceExpression("obj.a == 2")
+        self.resource_map = ResourceMap({'obj': [Resource({'a': 2})]})
+
+    def test_generation_changes_on_set(self):
+        generation = self.resource_map.get_generation('obj')
+        self.assertNotEqual(generation, 0)
+        self.resource_map['obj'] = []
+        self.assertNotEqual(
+            self.resource_map.get_generation('obj'), generation)
+
+    def test_generation_changes_on_del(self):
+        generation = self.resource_map.get_generation('obj')
+        del self.resource_map['obj']
+        self.assertNotEqual(
+            self.resource_map.get_generation('obj'), generation)
+
+    def test_generation_of_unknown_resource(self):
+        self.assertEqual(self.resource_map.get_generation('other'), 0)
+
+    def test_is_a_dict(self):
+        self.assertEqual(self.resource_map, {'obj': [Resource({'a': 2})]})
+
+    def test_evaluate(self):
+        self.assertTrue(self.resource_map.evaluate(self.expr))
+        self.resource_map['obj'] = [Resource({'a': 1})]
+        self.assertFalse(self.resource_map.evaluate(self.expr))
+
+    def test_evaluate_is_cached(self):
+        with mock.patch.object(
+                self.expr, 'evaluate', wraps=self.expr.evaluate) as mock_eval:
+            self.assertTrue(self.resource_map.evaluate(self.expr))
+            self.assertTrue(self.resource_map.evaluate(self.expr))
+            self.assertEqual(mock_eval.call_count, 1)
+            # Identical expressions share the cached result
+            other_expr = ResourceExpression("obj.a == 2")
+            self.assertTrue(self.resource_map.evaluate(other_expr))
+            self.assertEqual(mock_eval.call_count, 1)
+            # Changing the resource list invalidates the cached result
+            self.resource_map['obj'] = [Resource({'a': 3})]
+            self.assertFalse(self.resource_map.evaluate(self.expr))
+            self.assertEqual(mock_eval.call_count, 2)
+
+    def test_evaluate_respects_namespaces(self):
+        expr1 = ResourceExpression("obj.a == 2", "ns1")
+        expr2 = ResourceExpression("obj.a == 2", "ns2")
+        self.resource_map['ns1::obj'] = [Resource({'a': 2})]
+        self.resource_map['ns2::obj'] = [Resource({'a': 1})]
+        self.assertTrue(self.resource_map.evaluate(expr1))
+        self.assertFalse(self.resource_map.evaluate(expr2))
+
 
 class ResourceProgramTests(TestCase):
 
@@ -416,6 +502,38 @@ class ResourceProgramTests(TestCase):
         }
         self.assertTrue(self.prog.evaluate_or_raise(resource_map))
 
+    def test_evaluate_with_resource_map(self):
+        resource_map = ResourceMap({
+            'package': [
+                Resource({'name': 'plainbox'}),
+                Resource({'name': 'fwts'})],
+            'platform': [
+                Resource({'arch': 'i386'})]
+        })
+        self.assertTrue(self.prog.evaluate_or_raise(resource_map))
+        resource_map['platform'] = [Resource({'arch': 'armhf'})]
+        with self.assertRaises(ExpressionFailedError) as call:
+            self.prog.evaluate_or_raise(resource_map)
+        self.assertEqual(call.exception.expression.text,
+                         "platform.arch in ('i386', 'amd64')")
+
+    def test_select_resources(self):
+        prog = ResourceProgram(
+            "device.category == 'DISK'\n"
+            "device.name != 'sdb'")
+        r1, r2, r3 = (
+            Resource({'category': 'DISK', 'name': 'sda'}),
+            Resource({'category': 'DISK', 'name': 'sdb'}),
+            Resource({'category': 'NET', 'name': 'eth0'}))
+        self.assertEqual(
+            prog.select_resources('device', [r1, r2, r3]), [r1])
+
+    def test_select_resources_other_resource(self):
+        with self.assertRaises(ExpressionCannotEvaluateError) as call:
+            self.prog.select_resources('package', [
+                Resource({'name': 'fwts', 'arch': 'i386'})])
+        self.assertEqual(call.exception.resource_id, 'platform')
+
     def test_namespace_support(self):
         prog = ResourceProgram(
             "package.name == 'fwts'\n"
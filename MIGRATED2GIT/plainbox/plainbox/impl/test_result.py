@@ -24,17 +24,23 @@ plainbox.impl.test_result
 Test definitions for plainbox.impl.result module
 """
 from tempfile import TemporaryDirectory
+import os
 from unittest import TestCase
 import doctest
 import io
+import threading
 
 from plainbox.abc import IJobResult
+from plainbox.impl.result import BinaryIOLogRecordReader
+from plainbox.impl.result import BinaryIOLogRecordWriter
 from plainbox.impl.result import DiskJobResult
+from plainbox.impl.result import IOLogCache
 from plainbox.impl.result import IOLogRecord
 from plainbox.impl.result import IOLogRecordReader
 from plainbox.impl.result import IOLogRecordWriter
 from plainbox.impl.result import JobResultBuilder
 from plainbox.impl.result import MemoryJobResult
+from plainbox.impl.result import is_binary_io_log
 from plainbox.impl.testing_utils import make_io_log
 from plainbox.vendor import mock
 
@@ -103,6 +109,20 @@ class DiskJobResultTests(TestCase, CommonTestsMixIn):
         self.assertEqual(result.return_code, 0)
         self.assertFalse(result.is_hollow)
 
+    def test_binary_io_log(self):
+        filename = os.path.join(self.scratch_dir.name, 'job.record.bin')
+        with open(filename, 'wb') as stream:
+            writer = BinaryIOLogRecordWriter(stream)
+            writer.write_record(IOLogRecord(0, 'stdout', b'blah\n'))
+            writer.write_record(IOLogRecord(0.5, 'stderr', b'oops\n'))
+        result = DiskJobResult({
+            'outcome': IJobResult.OUTCOME_PASS,
+            'io_log_filename': filename,
+        })
+        self.assertEqual(list(result.get_io_log()), [
+            (0, 'stdout', b'blah\n'), (0.5, 'stderr', b'oops\n')])
+        self.assertEqual(result.io_log_as_flat_text, 'blah\noops\n')
+
     def test_io_log_as_text_attachment(self):
         result = MemoryJobResult({
             'outcome': IJobResult.OUTCOME_PASS,
@@ -113,6 +133,61 @@ class DiskJobResultTests(TestCase, CommonTestsMixIn):
         self.assertEqual(result.io_log_as_text_attachment, '')
 
 
+class IOLogCacheTests(TestCase):
+
+    def setUp(self):
+        self.scratch_dir = TemporaryDirectory()
+        self.addCleanup(self.scratch_dir.cleanup)
+        self.result = DiskJobResult({
+            'io_log_filename': make_io_log([
+                (0, 'stdout', b'blah\n')
+            ], self.scratch_dir.name),
+        })
+
+    def test_io_log_is_read_once(self):
+        with mock.patch.object(self.result, '_read_io_log') as mock_read:
+            mock_read.return_value = iter([
+                IOLogRecord(0, 'stdout', b'blah\n')])
+            with IOLogCache().activated():
+                self.assertEqual(list(self.result.get_io_log()),
+                                 [(0, 'stdout', b'blah\n')])
+                self.assertEqual(self.result.io_log_as_flat_text, 'blah\n')
+        self.assertEqual(mock_read.call_count, 1)
+
+    def test_activated_is_scoped(self):
+        self.assertIsNone(IOLogCache.get_active())
+        with IOLogCache().activated() as outer_cache:
+            self.assertIs(IOLogCache.get_active(), outer_cache)
+            with IOLogCache().activated() as inner_cache:
+                self.assertIs(IOLogCache.get_active(), inner_cache)
+            self.assertIs(IOLogCache.get_active(), outer_cache)
+        self.assertIsNone(IOLogCache.get_active())
+
+    def test_activated_in_one_thread(self):
+        active_list = []
+        thread = threading.Thread(
+            target=lambda: active_list.append(IOLogCache.get_active()))
+        with IOLogCache().activated():
+            thread.start()
+            thread.join()
+        self.assertEqual(active_list, [None])
+
+    def test_clear(self):
+        cache = IOLogCache()
+        with cache.activated():
+            self.assertEqual(list(self.result.get_io_log()),
+                             [(0, 'stdout', b'blah\n')])
+        self.assertEqual(len(cache._record_map), 1)
+        cache.clear()
+        self.assertEqual(cache._record_map, {})
+
+    def test_result_without_io_log(self):
+        cache = IOLogCache()
+        with cache.activated():
+            self.assertEqual(list(DiskJobResult({}).get_io_log()), [])
+        self.assertEqual(cache._record_map, {})
+
+
 class MemoryJobResultTests(TestCase, CommonTestsMixIn):
 
     result_cls = MemoryJobResult
@@ -188,6 +263,75 @@ class IOLogRecordWriterTests(TestCase):
         self.assertEqual(record_list, [self._RECORD])
 
 
+class BinaryIOLogRecordTests(TestCase):
+
+    _RECORD_LIST = [
+        IOLogRecord(0.123, 'stdout', b'some\ndata'),
+        IOLogRecord(0.5, 'stderr', b''),
+        IOLogRecord(1.0, 'stdout', bytes(range(256))),
+    ]
+
+    def setUp(self):
+        self.scratch_dir = TemporaryDirectory()
+        self.filename = os.path.join(self.scratch_dir.name, 'io.record.bin')
+        with open(self.filename, 'wb') as stream:
+            writer = BinaryIOLogRecordWriter(stream)
+            for record in self._RECORD_LIST:
+                writer.write_record(record)
+
+    def tearDown(self):
+        self.scratch_dir.cleanup()
+
+    def test_data_is_not_encoded(self):
+        self.assertLess(
+            os.path.getsize(self.filename),
+            sum(len(record.data) for record in self._RECORD_LIST) + 64)
+
+    def test_unsupported_stream(self):
+        writer = BinaryIOLogRecordWriter(io.BytesIO())
+        with self.assertRaises(ValueError):
+            writer.write_record(IOLogRecord(0, 'stdin', b''))
+
+    def test_iter_read(self):
+        with BinaryIOLogRecordReader(self.filename) as reader:
+            self.assertEqual(list(reader), self._RECORD_LIST)
+
+    def test_random_access(self):
+        with BinaryIOLogRecordReader(self.filename) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader.get_record(2), self._RECORD_LIST[2])
+            self.assertEqual(reader.get_record(-1), self._RECORD_LIST[2])
+            with self.assertRaises(IndexError):
+                reader.get_record(3)
+
+    def test_record_views(self):
+        with BinaryIOLogRecordReader(self.filename) as reader:
+            record = reader.get_record_view(0)
+            self.assertIsInstance(record.data, memoryview)
+            self.assertEqual(record.data, b'some\ndata')
+            record.data.release()
+            view_list = list(reader.iter_record_views(1))
+            self.assertEqual(
+                [bytes(record.data) for record in view_list],
+                [b'', bytes(range(256))])
+            for record in view_list:
+                record.data.release()
+
+    def test_truncated_record_is_ignored(self):
+        with open(self.filename, 'ab') as stream:
+            stream.write(b'\x00' * 5)
+        with BinaryIOLogRecordReader(self.filename) as reader:
+            self.assertEqual(list(reader), self._RECORD_LIST)
+
+    def test_legacy_format_detection(self):
+        self.assertTrue(is_binary_io_log(self.filename))
+        legacy_filename = make_io_log(
+            [(0, 'stdout', b'blah\n')], self.scratch_dir.name)
+        self.assertFalse(is_binary_io_log(legacy_filename))
+        with self.assertRaises(ValueError):
+            BinaryIOLogRecordReader(legacy_filename)
+
+
 class JobResultBuildeTests(TestCase):
 
     def test_smoke_hollow(self):
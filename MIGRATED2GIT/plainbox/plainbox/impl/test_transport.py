@@ -25,9 +25,20 @@ plainbox.impl.transport.test_init
 Test definitions for plainbox.impl.transport module
 """
 
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from io import BytesIO
+from socketserver import ThreadingMixIn
 from unittest import TestCase
+import gzip
+import json
+import threading
+import time
 
+from plainbox.impl.transport import CertificationTransport
 from plainbox.impl.transport import TransportBase
+from plainbox.impl.transport import TransportError
+from plainbox.vendor import mock
 
 
 class TransportBaseTests(TestCase):
@@ -66,3 +77,221 @@ class TransportBaseTests(TestCase):
         transport = self.TestTransport("", test_opt_string)
         self.assertEqual(['this'], list(transport.options.keys()))
         self.assertEqual("contains=equal", transport.options['this'])
+
+
+class _StandInServer(ThreadingMixIn, HTTPServer):
+
+    """Local HTTP server standing in for the certification website."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _StandInHandler)
+        # Responses to send back, 'drop' closes the connection without one,
+        # 'slow' sends one after a delay
+        self.reply_list = []
+        self.request_list = []
+        self.client_address_list = []
+        self.accept_gzip = True
+        self.set_cookie = False
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}/submissions/'.format(self.server_port)
+
+    def handle_error(self, request, client_address):
+        # The client may hang up on a slow reply, that is fine
+        pass
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.request_list.append((dict(self.headers), body))
+        self.server.client_address_list.append(self.client_address)
+        reply = self.server.reply_list.pop(0) if self.server.reply_list \
+            else 201
+        if 'Content-Encoding' in self.headers and not self.server.accept_gzip:
+            reply = 415
+        if reply == 'drop':
+            self.close_connection = True
+            return
+        if reply == 'slow':
+            time.sleep(0.5)
+            reply = 201
+        data = json.dumps({'id': len(self.server.request_list)}).encode()
+        self.send_response(reply)
+        self.send_header('Content-Type', 'application/json')
+        if self.server.set_cookie:
+            self.send_header('Set-Cookie', 'session=secret; Path=/')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class CertificationTransportTests(TestCase):
+
+    def setUp(self):
+        self.server = _StandInServer()
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.transport = CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567,backoff=0')
+
+    def assertFormData(self, headers, body, data):
+        content_type, boundary = headers['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/form-data')
+        self.assertEqual(body, (
+            '--{0}\r\n'
+            'Content-Disposition: form-data; name="data"; filename="data"\r\n'
+            '\r\n'
+            '{1}\r\n'
+            '--{0}--\r\n').format(boundary, data).encode())
+
+    def test_send(self):
+        self.assertEqual(self.transport.send(b'<xml/>'), {'id': 1})
+        [(headers, body)] = self.server.request_list
+        self.assertEqual(headers['X_HARDWARE_ID'], 'abcdefg0001234567')
+        self.assertFormData(headers, body, '<xml/>')
+
+    def test_send__stream(self):
+        stream = BytesIO(b'skipped<xml/>')
+        stream.seek(len(b'skipped'))
+        self.transport.send(stream)
+        [(headers, body)] = self.server.request_list
+        self.assertFormData(headers, body, '<xml/>')
+
+    def test_send__unseekable_stream(self):
+        stream = mock.Mock(spec=['read'])
+        stream.read.side_effect = [b'<xml/>', b'']
+        self.transport.send(stream)
+        [(headers, body)] = self.server.request_list
+        self.assertFormData(headers, body, '<xml/>')
+
+    def test_send__reuses_connection(self):
+        self.transport.send(b'<xml/>')
+        self.transport.send(b'<xml/>')
+        self.assertEqual(len(set(self.server.client_address_list)), 1)
+
+    def test_send__shares_connection(self):
+        CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567').send(b'<xml/>')
+        CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567').send(b'<xml/>')
+        self.assertEqual(len(set(self.server.client_address_list)), 1)
+
+    def test_send__no_shared_cookies(self):
+        self.server.set_cookie = True
+        CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567').send(b'<xml/>')
+        CertificationTransport(
+            self.server.url, 'secure_id=hijklmn0001234567').send(b'<xml/>')
+        self.assertEqual(len(self.server.request_list), 2)
+        for headers, body in self.server.request_list:
+            self.assertNotIn('Cookie', headers)
+
+    def test_send__compress(self):
+        transport = CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567,compress=1')
+        self.assertEqual(transport.send(b'<xml/>'), {'id': 1})
+        [(headers, body)] = self.server.request_list
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertFormData(headers, gzip.decompress(body), '<xml/>')
+
+    def test_send__compress_rejected(self):
+        self.server.accept_gzip = False
+        transport = CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567,compress=1')
+        with mock.patch('plainbox.impl.transport.logger'):
+            self.assertEqual(transport.send(b'<xml/>'), {'id': 2})
+        # The server is remembered so compression is not tried again
+        self.assertEqual(transport.send(b'<xml/>'), {'id': 3})
+        self.assertEqual(len(self.server.request_list), 3)
+        for headers, body in self.server.request_list[1:]:
+            self.assertNotIn('Content-Encoding', headers)
+            self.assertFormData(headers, body, '<xml/>')
+
+    def test_send__retries(self):
+        self.server.reply_list = [502, 503]
+        with mock.patch('plainbox.impl.transport.logger') as mock_logger:
+            self.assertEqual(self.transport.send(b'<xml/>'), {'id': 3})
+        self.assertEqual(mock_logger.warning.call_count, 2)
+        for headers, body in self.server.request_list:
+            self.assertFormData(headers, body, '<xml/>')
+
+    def test_send__no_retry_after_drop(self):
+        # The server may have stored the submission before hanging up
+        self.server.reply_list = ['drop']
+        with self.assertRaises(TransportError):
+            self.transport.send(b'<xml/>')
+        self.assertEqual(len(self.server.request_list), 1)
+
+    def test_send__no_retry_after_read_timeout(self):
+        # The server may still be storing the submission
+        self.server.reply_list = ['slow']
+        transport = CertificationTransport(
+            self.server.url, 'secure_id=abcdefg0001234567,timeout=0.1')
+        with self.assertRaises(TransportError):
+            transport.send(b'<xml/>')
+        self.assertEqual(len(self.server.request_list), 1)
+
+    def test_send__slow_server(self):
+        # There is no limit on waiting for the response by default
+        self.server.reply_list = ['slow']
+        self.assertEqual(self.transport.send(b'<xml/>'), {'id': 1})
+        self.assertEqual(len(self.server.request_list), 1)
+
+    @mock.patch('plainbox.impl.transport.time.sleep')
+    def test_send__backoff(self, mock_sleep):
+        self.server.reply_list = [503, 503, 503, 503]
+        transport = CertificationTransport(
+            self.server.url,
+            'secure_id=abcdefg0001234567,backoff=0.5,retries=3')
+        with mock.patch('plainbox.impl.transport.logger'):
+            with self.assertRaises(TransportError):
+                transport.send(b'<xml/>')
+        self.assertEqual(len(self.server.request_list), 4)
+        self.assertEqual(mock_sleep.call_args_list, [
+            mock.call(0.5), mock.call(1.0), mock.call(2.0)])
+
+    def test_send__connection_error(self):
+        transport = CertificationTransport(
+            'http://127.0.0.1:1/', 'secure_id=abcdefg0001234567,retries=0')
+        with self.assertRaises(TransportError):
+            transport.send(b'<xml/>')
+
+    @mock.patch('plainbox.impl.transport.time.sleep')
+    def test_send__connection_error_retries(self, mock_sleep):
+        # Nothing was sent to the server so trying again is safe
+        transport = CertificationTransport(
+            'http://127.0.0.1:1/', 'secure_id=abcdefg0001234567,retries=2')
+        with mock.patch('plainbox.impl.transport.logger') as mock_logger:
+            with self.assertRaises(TransportError):
+                transport.send(b'<xml/>')
+        self.assertEqual(mock_logger.warning.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            CertificationTransport(self.server.url, 'timeout=soon')
+        with self.assertRaises(ValueError):
+            CertificationTransport(self.server.url, 'connect_timeout=soon')
+
+    def test_timeout_options(self):
+        self.assertEqual(
+            CertificationTransport(self.server.url, '')._timeout,
+            (CertificationTransport.DEFAULT_CONNECT_TIMEOUT, None))
+        self.assertEqual(
+            CertificationTransport(
+                self.server.url, 'connect_timeout=5,timeout=600')._timeout,
+            (5.0, 600.0))
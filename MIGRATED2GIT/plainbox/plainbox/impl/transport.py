@@ -29,12 +29,23 @@ Shared code for test data transports..
 """
 
 from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from io import BytesIO
+from io import RawIOBase
 from io import TextIOWrapper
+from io import UnsupportedOperation
 from logging import getLogger
+import gzip
+import os
 import pkg_resources
 import re
 from shutil import copyfileobj
 import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
 
 from plainbox.abc import ISessionStateTransport
 from plainbox.i18n import gettext as _
@@ -42,6 +53,8 @@ from plainbox.impl.exporter import ByteStringStreamTranslator
 from plainbox.impl.secure.config import Unset
 
 import requests
+import requests.adapters
+from requests.packages.urllib3.exceptions import NewConnectionError
 
 # OAuth is not always available on all platforms.
 _oauth_available = True
@@ -109,6 +122,67 @@ class TransportBase(ISessionStateTransport):
             raise ValueError(_("No valid options in option string"))
 
 
+#: Maximum number of connections kept open to a single endpoint
+HTTP_POOL_SIZE = 10
+
+_http_session_map = {}
+_http_no_gzip_set = set()
+_http_session_lock = threading.Lock()
+
+
+def _get_endpoint(url):
+    parts = urllib.parse.urlsplit(url)
+    return parts.scheme, parts.netloc
+
+
+def get_http_session(url):
+    """
+    Get the HTTP session used to send data to the given URL.
+
+    :param url:
+        URL the data is going to be sent to
+    :returns:
+        A requests.Session instance
+
+    There is one session for each endpoint (scheme, host and port) and it is
+    shared by all transports and threads. Connections to the endpoint are
+    kept alive and reused, saving DNS lookups and TLS handshakes when many
+    submissions are sent one after another.
+
+    Only the connections are shared. The session rejects all cookies so
+    that nothing set by the server while sending one submission is sent
+    along with the next one, which may be made for another system.
+    """
+    endpoint = _get_endpoint(url)
+    with _http_session_lock:
+        try:
+            return _http_session_map[endpoint]
+        except KeyError:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _http_session_map[endpoint] = session
+            return session
+
+
+def http_accepts_gzip(url):
+    """
+    Check if gzip encoded requests may be sent to the given URL.
+
+    This is true unless the endpoint has already rejected such a request.
+    """
+    with _http_session_lock:
+        return _get_endpoint(url) not in _http_no_gzip_set
+
+
+def _set_http_rejects_gzip(url):
+    with _http_session_lock:
+        _http_no_gzip_set.add(_get_endpoint(url))
+
+
 SECURE_ID_PATTERN = r"^[a-zA-Z0-9]{15,}$"
 
 
@@ -125,6 +199,77 @@ class InvalidSecureIDError(ValueError):
         return repr(self.value)
 
 
+class _MultipartFormDataStream(RawIOBase):
+
+    """
+    Stream with a multipart/form-data encoded body of a single file field.
+
+    The body is generated on the fly, as it is read, so the file is never
+    loaded into memory. The stream knows its total length so it can be sent
+    with a Content-Length header, and it can be rewound to send it again.
+    """
+
+    def __init__(self, field_name, stream):
+        """
+        Initialize a new multipart stream.
+
+        :param field_name:
+            Name of the form field with the file
+        :param stream:
+            Seekable binary stream with the content of the file, starting
+            at its current position.
+        """
+        self.boundary = uuid.uuid4().hex
+        filename = getattr(stream, 'name', None)
+        if isinstance(filename, str) and not filename.startswith('<'):
+            filename = os.path.basename(filename)
+        else:
+            filename = field_name
+        self._head = (
+            '--{}\r\n'
+            'Content-Disposition: form-data; name="{}"; filename="{}"\r\n'
+            '\r\n').format(self.boundary, field_name, filename).encode('UTF-8')
+        self._tail = '\r\n--{}--\r\n'.format(self.boundary).encode('UTF-8')
+        self._stream = stream
+        self._start = stream.tell()
+        self._size = stream.seek(0, os.SEEK_END) - self._start
+        self.seek(0)
+
+    @property
+    def content_type(self):
+        """value of the Content-Type header for this body."""
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Go back to the start of the body, other positions are refused."""
+        if (offset, whence) != (0, os.SEEK_SET):
+            raise UnsupportedOperation(_("can only seek to the start"))
+        self._stream.seek(self._start)
+        self._part_list = [BytesIO(self._head), self._stream,
+                           BytesIO(self._tail)]
+        self._position = 0
+        return 0
+
+    def tell(self):
+        return self._position
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        while self._part_list:
+            data = self._part_list[0].read(len(buf))
+            if data:
+                buf[:len(data)] = data
+                self._position += len(data)
+                return len(data)
+            del self._part_list[0]
+        return 0
+
+
 class CertificationTransport(TransportBase):
 
     """
@@ -135,8 +280,36 @@ class CertificationTransport(TransportBase):
      - Data is expected to be in checkbox xml-compatible format.
        This means it will work best with a stream produced by the
        xml exporter.
+     - Data is streamed from the disk, over a connection that is kept
+       open between submissions (see :func:`get_http_session()`).
+       Submissions that could not reach the server or that were turned
+       down by an overloaded server are retried a few times, waiting longer
+       after each attempt. A submission is never sent again once the server
+       may have received it, as that would create a duplicate submission.
     """
 
+    #: Number of seconds to wait for a connection to the server, by default
+    DEFAULT_CONNECT_TIMEOUT = 30
+
+    #: Number of seconds to wait for the server to respond, by default. The
+    #: server may take a long time to process a big submission so there is
+    #: no limit.
+    DEFAULT_TIMEOUT = None
+
+    #: Number of times a failed submission is retried, by default
+    DEFAULT_RETRIES = 3
+
+    #: Number of seconds to wait before the first retry, by default. The wait
+    #: time doubles after each retry.
+    DEFAULT_BACKOFF = 1
+
+    #: HTTP status codes of the responses that are worth retrying
+    RETRY_STATUS_CODES = frozenset([502, 503, 504])
+
+    #: HTTP status code of the response to a request with unsupported
+    #: Content-Encoding
+    UNSUPPORTED_MEDIA_TYPE = 415
+
     def __init__(self, where, options):
         """
         Initialize the Certification Transport.
@@ -146,8 +319,31 @@ class CertificationTransport(TransportBase):
 
         It may also contain a submit_to_hexr boolean, set to 1
         to enable submission to hexr.
+
+        The 'connect_timeout' (seconds to wait for a connection to the
+        server), 'timeout' (seconds to wait for the server to respond),
+        'retries' (number of times a failed submission is retried) and
+        'backoff' (seconds to wait before the first retry) options tune how
+        the data is sent.
+
+        The 'compress' boolean, set to 1, enables gzip compression of the
+        data. Data is sent uncompressed to servers that don't accept it.
         """
         super().__init__(where, options)
+        try:
+            connect_timeout = float(self.options.get(
+                'connect_timeout', self.DEFAULT_CONNECT_TIMEOUT))
+            read_timeout = self.options.get('timeout', self.DEFAULT_TIMEOUT)
+            if read_timeout is not None:
+                read_timeout = float(read_timeout)
+            self._timeout = (connect_timeout, read_timeout)
+            self._retries = int(
+                self.options.get('retries', self.DEFAULT_RETRIES))
+            self._backoff = float(
+                self.options.get('backoff', self.DEFAULT_BACKOFF))
+        except ValueError as exc:
+            raise ValueError(
+                _("Invalid certification transport option: {}").format(exc))
         # Interpret this setting here
         submit_to_hexr = self.options.get('submit_to_hexr')
         self._submit_to_hexr = False
@@ -159,6 +355,15 @@ class CertificationTransport(TransportBase):
         except ValueError:
             # Just leave it at False
             pass
+        compress = self.options.get('compress')
+        self._compress = False
+        try:
+            if compress and (compress.lower() in ('yes', 'true') or
+                             int(compress) == 1):
+                self._compress = True
+        except ValueError:
+            # Just leave it at False
+            pass
         self._secure_id = self.options.get('secure_id')
         if self._secure_id is not None:
             self._validate_secure_id(self._secure_id)
@@ -233,20 +438,18 @@ class CertificationTransport(TransportBase):
         if submit_to_hexr:
             headers["X-Share-With-HEXR"] = submit_to_hexr
 
-        # Requests takes care of properly handling a file-like data.
-        form_payload = {"data": data}
+        stream = self._get_seekable_stream(data)
         try:
-            response = requests.post(
-                self.url, files=form_payload, headers=headers, proxies=proxies)
-        except requests.exceptions.Timeout as exc:
-            raise TransportError(
-                _("Request to {0} timed out: {1}").format(self.url, exc))
-        except requests.exceptions.InvalidSchema as exc:
-            raise TransportError(
-                _("Invalid destination URL: {0}").format(exc))
-        except requests.exceptions.ConnectionError as exc:
-            raise TransportError(
-                _("Unable to connect to {0}: {1}").format(self.url, exc))
+            body = _MultipartFormDataStream("data", stream)
+            headers["Content-Type"] = body.content_type
+            response = None
+            if self._compress and http_accepts_gzip(self.url):
+                response = self._post_gzip(body, headers, proxies)
+            if response is None:
+                response = self._post(body, headers, proxies)
+        finally:
+            if stream is not data:
+                stream.close()
         if response is not None:
             try:
                 # This will raise HTTPError for status != 20x
@@ -266,6 +469,81 @@ class CertificationTransport(TransportBase):
             raise InvalidSecureIDError(
                 _("secure_id must be a 15 characters (or more) alphanumeric string"))
 
+    def _get_seekable_stream(self, data):
+        # The data is sent again on each retry so it has to be seekable.
+        # Anything else is spooled to a temporary file first.
+        if isinstance(data, (bytes, bytearray)):
+            return BytesIO(data)
+        if getattr(data, 'seekable', lambda: False)():
+            return data
+        spool = tempfile.TemporaryFile()
+        copyfileobj(data, spool)
+        spool.seek(0)
+        return spool
+
+    def _post_gzip(self, body, headers, proxies):
+        with tempfile.TemporaryFile() as spool:
+            with gzip.GzipFile(fileobj=spool, mode='wb') as gzip_stream:
+                copyfileobj(body, gzip_stream)
+            response = self._post(
+                spool, dict(headers, **{'Content-Encoding': 'gzip'}), proxies)
+        if response.status_code == self.UNSUPPORTED_MEDIA_TYPE:
+            logger.info(_("%s doesn't accept compressed data"), self.url)
+            _set_http_rejects_gzip(self.url)
+            return None
+        return response
+
+    def _post(self, body, headers, proxies):
+        session = get_http_session(self.url)
+        attempt = 0
+        while True:
+            body.seek(0)
+            try:
+                response = session.post(
+                    self.url, data=body, headers=headers, proxies=proxies,
+                    timeout=self._timeout)
+            except requests.exceptions.ConnectTimeout as exc:
+                error = _("Connection to {0} timed out: {1}").format(
+                    self.url, exc)
+            except requests.exceptions.Timeout as exc:
+                # The server may have accepted the data already, it must not
+                # be sent again.
+                raise TransportError(
+                    _("Request to {0} timed out: {1}").format(self.url, exc))
+            except requests.exceptions.InvalidSchema as exc:
+                raise TransportError(
+                    _("Invalid destination URL: {0}").format(exc))
+            except requests.exceptions.ConnectionError as exc:
+                if not self._is_connect_error(exc):
+                    # Same as above, the data was sent but the connection
+                    # broke before the server responded.
+                    raise TransportError(
+                        _("Connection to {0} lost: {1}").format(
+                            self.url, exc))
+                error = _("Unable to connect to {0}: {1}").format(
+                    self.url, exc)
+            else:
+                if (response.status_code not in self.RETRY_STATUS_CODES or
+                        attempt == self._retries):
+                    return response
+                error = _("Server returned status {0}").format(
+                    response.status_code)
+            if attempt == self._retries:
+                raise TransportError(error)
+            delay = self._backoff * 2 ** attempt
+            attempt += 1
+            logger.warning(_("%s, retrying in %.1fs (%d/%d)"),
+                           error, delay, attempt, self._retries)
+            time.sleep(delay)
+
+    @staticmethod
+    def _is_connect_error(exc):
+        # Connection errors raised before any of the request was sent wrap
+        # urllib3's MaxRetryError whose reason is NewConnectionError (refused
+        # connections, failed name lookups and so on).
+        reason = getattr(exc.args[0] if exc.args else None, 'reason', None)
+        return isinstance(reason, NewConnectionError)
+
 
 def oauth_available():
     return _oauth_available
@@ -302,7 +580,7 @@ class _OAuthTransport(TransportBase):
         form_payload = dict(data=data)
         form_data = dict(uploader_email=self.uploader_email)
         try:
-            response = requests.post(
+            response = get_http_session(self.url).post(
                 self.url, files=form_payload, data=form_data, headers=headers)
         except requests.exceptions.Timeout as exc:
             raise TransportError('Request to timed out: {}'.format(exc))
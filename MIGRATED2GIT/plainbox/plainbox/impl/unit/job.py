@@ -23,6 +23,7 @@
 =========================================
 """
 
+import itertools
 import logging
 import re
 import os
@@ -30,7 +31,9 @@ import os
 from plainbox.abc import IJobDefinition
 from plainbox.i18n import gettext as _
 from plainbox.i18n import gettext_noop as N_
+from plainbox.impl.depmgr import DependencyMissingError
 from plainbox.impl.resource import ResourceProgram
+from plainbox.impl.resource import ResourceProgramError
 from plainbox.impl.resource import parse_imports_stmt
 from plainbox.impl.secure.origin import JobOutputTextSource
 from plainbox.impl.secure.origin import Origin
@@ -53,7 +56,7 @@ from plainbox.impl.xparsers import Text
 from plainbox.impl.xparsers import Visitor
 from plainbox.impl.xparsers import WordList
 
-__all__ = ['JobDefinition', 'propertywithsymbols']
+__all__ = ['JobDefinition', 'JobDependencies', 'propertywithsymbols']
 
 
 logger = logging.getLogger("plainbox.unit.job")
@@ -147,6 +150,44 @@ class _CertificationStatusValues(SymbolDef):
     blocker = 'blocker'
 
 
+class JobDependencies:
+    """
+    Dependencies of a job, as parsed from its definition.
+
+    :attr direct:
+        frozenset of ids of jobs listed in the ``depends`` field
+    :attr after:
+        frozenset of ids of jobs listed in the ``after`` field
+    :attr resource:
+        frozenset of ids of jobs used by the ``requires`` field. It is empty
+        if the resource program is incorrect.
+    :attr dependency_set:
+        frozenset of pairs (dep_type, job_id) with all of the above, as
+        returned by
+        :meth:`~plainbox.abc.ISessionStateController.get_dependency_set()`
+    """
+
+    __slots__ = ('direct', 'after', 'resource', 'dependency_set')
+
+    def __init__(self, direct=frozenset(), after=frozenset(),
+                 resource=frozenset()):
+        self.direct = frozenset(direct)
+        self.after = frozenset(after)
+        self.resource = frozenset(resource)
+        self.dependency_set = frozenset(itertools.chain(
+            ((DependencyMissingError.DEP_TYPE_DIRECT, job_id)
+             for job_id in self.direct),
+            ((DependencyMissingError.DEP_TYPE_RESOURCE, job_id)
+             for job_id in self.resource),
+            ((DependencyMissingError.DEP_TYPE_ORDERING, job_id)
+             for job_id in self.after)))
+
+    def __repr__(self):
+        return "<{} direct:{!r} after:{!r} resource:{!r}>".format(
+            self.__class__.__name__, sorted(self.direct), sorted(self.after),
+            sorted(self.resource))
+
+
 class JobDefinition(UnitWithId, IJobDefinition):
     """
     Job definition class.
@@ -203,6 +244,7 @@ class JobDefinition(UnitWithId, IJobDefinition):
             from plainbox.impl.ctrl import checkbox_session_state_ctrl
             controller = checkbox_session_state_ctrl
         self._resource_program = None
+        self._dependencies = None
         self._controller = controller
 
     @classmethod
@@ -566,15 +608,31 @@ class JobDefinition(UnitWithId, IJobDefinition):
                 self.requires, implicit_namespace, imports)
         return self._resource_program
 
-    def get_direct_dependencies(self):
+    def get_dependencies(self):
         """
-        Compute and return a set of direct dependencies
+        Get all of the dependencies of this job.
 
-        To combat a simple mistake where the jobs are space-delimited any
-        mixture of white-space (including newlines) and commas are allowed.
+        :returns:
+            A :class:`JobDependencies` instance
+
+        The dependencies are parsed on first use and cached in the
+        JobDefinition, just like the checksum, as the definition of a job
+        doesn't change once it is created.
         """
+        if self._dependencies is None:
+            try:
+                program = self.get_resource_program()
+            except ResourceProgramError:
+                program = None
+            self._dependencies = JobDependencies(
+                self._parse_dependencies(self.depends),
+                self._parse_dependencies(self.after),
+                program.required_resources if program else ())
+        return self._dependencies
+
+    def _parse_dependencies(self, text):
         deps = set()
-        if self.depends is None:
+        if text is None:
             return deps
 
         class V(Visitor):
@@ -585,9 +643,18 @@ class JobDefinition(UnitWithId, IJobDefinition):
             def visit_Error_node(visitor, node: Error):
                 logger.warning(_("unable to parse depends: %s"), node.msg)
 
-        V().visit(WordList.parse(self.depends))
+        V().visit(WordList.parse(text))
         return deps
 
+    def get_direct_dependencies(self):
+        """
+        Compute and return a set of direct dependencies
+
+        To combat a simple mistake where the jobs are space-delimited any
+        mixture of white-space (including newlines) and commas are allowed.
+        """
+        return self.get_dependencies().direct
+
     def get_after_dependencies(self):
         """
         Compute and return a set of after dependencies.
@@ -603,30 +670,19 @@ class JobDefinition(UnitWithId, IJobDefinition):
         To combat a simple mistake where the jobs are space-delimited any
         mixture of white-space (including newlines) and commas are allowed.
         """
-        deps = set()
-        if self.after is None:
-            return deps
-
-        class V(Visitor):
-
-            def visit_Text_node(visitor, node: Text):
-                deps.add(self.qualify_id(node.text))
-
-            def visit_Error_node(visitor, node: Error):
-                logger.warning(_("unable to parse depends: %s"), node.msg)
-
-        V().visit(WordList.parse(self.after))
-        return deps
+        return self.get_dependencies().after
 
     def get_resource_dependencies(self):
         """
         Compute and return a set of resource dependencies
+
+        :raises ResourceProgramError:
+            If the program definition is incorrect
         """
-        program = self.get_resource_program()
-        if program:
-            return program.required_resources
-        else:
-            return set()
+        # Errors in the resource program are reported here, unlike in
+        # get_dependencies()
+        self.get_resource_program()
+        return self.get_dependencies().resource
 
     def get_category_id(self):
         """
@@ -26,6 +26,7 @@ import logging
 
 from plainbox.i18n import gettext as _
 from plainbox.i18n import gettext_noop as N_
+from plainbox.impl.resource import ExpressionCannotEvaluateError
 from plainbox.impl.resource import ExpressionFailedError
 from plainbox.impl.resource import Resource
 from plainbox.impl.resource import ResourceProgram
@@ -99,6 +100,10 @@ class TemplateUnit(Unit):
     :attr _filter_program:
         Cached ResourceProgram computed (once) and returned by
         :meth:`get_filter_program()`
+    :attr _instance_skeleton:
+        Cached parts of each instantiated unit that don't depend on the
+        resource, computed (once) and returned by
+        :meth:`_get_instance_skeleton()`
     """
 
     def __init__(self, data, origin=None, provider=None, raw_data=None,
@@ -138,6 +143,7 @@ class TemplateUnit(Unit):
         super().__init__(
             data, raw_data, origin, provider, parameters, field_offset_map)
         self._filter_program = None
+        self._instance_skeleton = None
 
     @classmethod
     def instantiate_template(cls, data, raw_data, origin, provider, parameters,
@@ -312,17 +318,25 @@ class TemplateUnit(Unit):
             (:meth:`template_resource`)
         :returns:
             A list of new Unit (or subclass) objects.
+
+        The filter program is evaluated against all of the resources at once,
+        which gives the same result as calling :meth:`should_instantiate()`
+        for each resource.
         """
         unit_cls = self.get_target_unit_cls()
-        resources = []
-        index = 0
-        for resource in resource_list:
-            if self.should_instantiate(resource):
-                index += 1
-                resources.append(self.instantiate_one(resource,
-                                                      unit_cls_hint=unit_cls,
-                                                      index=index))
-        return resources
+        program = self.get_filter_program()
+        if program is not None:
+            try:
+                resource_list = program.select_resources(
+                    self.resource_id, resource_list)
+            except ExpressionCannotEvaluateError as exc:
+                logger.warning(
+                    _("Filter of template %s cannot be evaluated: %s"),
+                    self.id, exc)
+                return []
+        return [
+            self.instantiate_one(resource, unit_cls_hint=unit_cls, index=index)
+            for index, resource in enumerate(resource_list, 1)]
 
     def instantiate_one(self, resource, unit_cls_hint=None, index=0):
         """
@@ -350,23 +364,11 @@ class TemplateUnit(Unit):
         else:
             unit_cls = self.get_target_unit_cls()
         assert unit_cls is not None
-        # Filter out template- data fields as they are not relevant to the
-        # target unit.
-        data = {
-            key: value for key, value in self._data.items()
-            if not key.startswith('template-')
-        }
-        raw_data = {
-            key: value for key, value in self._raw_data.items()
-            if not key.startswith('template-')
-        }
-        # Override the value of the 'unit' field from 'template-unit' field
-        data['unit'] = raw_data['unit'] = self.template_unit
+        data, raw_data, accessed_parameters, canonical_data = (
+            self._get_instance_skeleton())
         # XXX: extract raw dictionary from the resource object, there is no
         # normal API for that due to the way resource objects work.
-        parameters = dict(object.__getattribute__(resource, '_data'))
-        accessed_parameters = set(itertools.chain(*{
-            get_accessed_parameters(value) for value in data.values()}))
+        parameters = object.__getattribute__(resource, '_data')
         # Recreate the parameters with only the subset that will actually be
         # used by the template. Doing this filter can prevent exceptions like
         # DependencyDuplicateError where an unused resource property can differ
@@ -378,9 +380,44 @@ class TemplateUnit(Unit):
         # Add the special __index__ to the resource namespace variables
         parameters['__index__'] = index
         # Instantiate the class using the instantiation API
-        return unit_cls.instantiate_template(
-            data, raw_data, self.origin, self.provider, parameters,
-            self.field_offset_map)
+        unit = unit_cls.instantiate_template(
+            dict(data), dict(raw_data), self.origin, self.provider,
+            parameters, self.field_offset_map)
+        # All the instances share the same data so the canonical form of it,
+        # used to compute the checksum, is shared as well.
+        unit._canonical_data = canonical_data
+        return unit
+
+    def _get_instance_skeleton(self):
+        """
+        Get the parts of each instantiated unit that don't depend on the
+        resource.
+
+        :returns:
+            A tuple (data, raw_data, accessed_parameters, canonical_data) with
+            the data and raw data of each unit, the set of parameters accessed
+            by that data and the canonical form of the data, as used to compute
+            the checksum of each unit.
+        """
+        if self._instance_skeleton is None:
+            # Filter out template- data fields as they are not relevant to the
+            # target unit.
+            data = {
+                key: value for key, value in self._data.items()
+                if not key.startswith('template-')
+            }
+            raw_data = {
+                key: value for key, value in self._raw_data.items()
+                if not key.startswith('template-')
+            }
+            # Override the value of the 'unit' field from 'template-unit' field
+            data['unit'] = raw_data['unit'] = self.template_unit
+            accessed_parameters = frozenset(itertools.chain(*{
+                get_accessed_parameters(value) for value in data.values()}))
+            self._instance_skeleton = (
+                data, raw_data, accessed_parameters,
+                self._get_canonical_form(data))
+        return self._instance_skeleton
 
     def should_instantiate(self, resource):
         """
@@ -27,6 +27,7 @@ Test definitions for plainbox.impl.unit.job module
 from unittest import TestCase
 
 from plainbox.impl.providers.v1 import Provider1
+from plainbox.impl.resource import ResourceProgramError
 from plainbox.impl.secure.origin import FileTextSource
 from plainbox.impl.secure.origin import Origin
 from plainbox.impl.secure.rfc822 import RFC822Record
@@ -942,6 +943,35 @@ class TestJobDefinition(TestCase):
         observed = job.get_resource_dependencies()
         self.assertEqual(expected, observed)
 
+    def test_get_dependencies(self):
+        job = JobDefinition({
+            'id': 'id',
+            'plugin': 'plugin',
+            'depends': 'a b',
+            'after': 'c',
+            'requires': 'd.attr == "value"'})
+        dependencies = job.get_dependencies()
+        self.assertEqual(dependencies.direct, frozenset(['a', 'b']))
+        self.assertEqual(dependencies.after, frozenset(['c']))
+        self.assertEqual(dependencies.resource, frozenset(['d']))
+        self.assertEqual(dependencies.dependency_set, frozenset([
+            ('direct', 'a'), ('direct', 'b'), ('ordering', 'c'),
+            ('resource', 'd')]))
+        # The dependencies are only computed once
+        self.assertIs(job.get_dependencies(), dependencies)
+        self.assertIs(job.get_direct_dependencies(), dependencies.direct)
+        self.assertIs(job.get_after_dependencies(), dependencies.after)
+        self.assertIs(job.get_resource_dependencies(), dependencies.resource)
+
+    def test_get_dependencies__bad_resource_program(self):
+        job = JobDefinition({
+            'id': 'id',
+            'plugin': 'plugin',
+            'requires': 'this is not a valid program'})
+        self.assertEqual(job.get_dependencies().resource, frozenset())
+        with self.assertRaises(ResourceProgramError):
+            job.get_resource_dependencies()
+
     def test_checksum_smoke(self):
         job1 = JobDefinition({
             'id': 'id',
@@ -326,6 +326,69 @@ class TemplateUnitTests(TestCase):
         self.assertEqual(len(unit_list), 1)
         self.assertEqual(unit_list[0].partial_id, 'check-device-sda1')
 
+    def test_instantiate_all__same_as_should_instantiate(self):
+        template = TemplateUnit({
+            'template-resource': 'resource',
+            'template-filter': 'resource.attr == "value"',
+            'id': 'check-device-{dev_name}',
+            'plugin': 'shell',
+        })
+        resource_list = [
+            Resource({'attr': 'value', 'dev_name': 'sda1'}),
+            Resource({'dev_name': 'sda2'}),
+            Resource({'attr': 'other value', 'dev_name': 'sda3'}),
+            Resource({'attr': 'value', 'dev_name': 'sda4'}),
+        ]
+        expected = [
+            template.instantiate_one(resource, index=index)
+            for index, resource in enumerate(filter(
+                template.should_instantiate, resource_list), 1)]
+        self.assertEqual(template.instantiate_all(resource_list), expected)
+
+    def test_instantiate_all__other_resource(self):
+        template = TemplateUnit({
+            'template-resource': 'resource',
+            'template-filter': 'other.attr == "value"',
+            'id': 'check-device-{dev_name}',
+            'plugin': 'shell',
+        })
+        resource = Resource({'attr': 'value', 'dev_name': 'sda1'})
+        self.assertFalse(template.should_instantiate(resource))
+        with mock.patch('plainbox.impl.unit.template.logger') as mock_logger:
+            self.assertEqual(template.instantiate_all([resource]), [])
+        self.assertEqual(mock_logger.warning.call_count, 1)
+
+    def test_instantiate_all__checksum(self):
+        template = TemplateUnit({
+            'template-resource': 'resource',
+            'id': 'check-device-{dev_name}',
+            'summary': 'Test {name}',
+            'plugin': 'shell',
+        })
+        unit_list = template.instantiate_all([
+            Resource({'dev_name': 'sda1', 'name': 'some device'}),
+            Resource({'dev_name': 'sda2', 'name': 'other device'}),
+        ])
+        self.assertNotEqual(unit_list[0].checksum, unit_list[1].checksum)
+        # The checksum is the same as of an identical unit that was created
+        # without the help of the template.
+        for unit in unit_list:
+            self.assertEqual(unit.checksum, JobDefinition(
+                unit._data, raw_data=unit._raw_data,
+                parameters=unit.parameters).checksum)
+
+    def test_instantiate_one__skeleton_is_not_shared(self):
+        template = TemplateUnit({
+            'template-resource': 'resource',
+            'id': 'check-device-{dev_name}',
+            'plugin': 'shell',
+        })
+        job1 = template.instantiate_one(Resource({'dev_name': 'sda1'}))
+        job2 = template.instantiate_one(Resource({'dev_name': 'sda2'}))
+        self.assertIsNot(job1._data, job2._data)
+        self.assertIsNot(job1._raw_data, job2._raw_data)
+        self.assertEqual(job1.parameters, {'dev_name': 'sda1', '__index__': 0})
+
 
 class TemplateUnitFieldValidationTests(UnitFieldValidationTests):
 
@@ -488,6 +488,22 @@ class TestNestedTestPlan(TestCase):
             support.override_list,
             [('^ns1::Bar$', [('certification_status', 'blocker')])])
 
+    def test_nested_tesplan__support_is_cached(self):
+        support = self.tp3.get_support()
+        self.assertIs(self.tp3.get_support(), support)
+        self.assertEqual(support.override_list,
+                         TestPlanUnitSupport(self.tp3).override_list)
+
+    def test_nested_tesplan__support_is_shared(self):
+        tp2 = self.tp3.get_nested_part()[0]
+        tp2_support = tp2.get_support()
+        with mock.patch.object(TestPlanUnitSupport, '_get_inline_overrides',
+                               return_value=[]) as mock_get:
+            self.tp3.get_support()
+        # Only tp3 is parsed, the nested part was parsed already
+        mock_get.assert_called_once_with(self.tp3)
+        self.assertIs(tp2.get_support(), tp2_support)
+
     def test_nested_tesplan__multiple_parts(self):
         qual_list = self.tp4.get_qualifier().get_primitive_qualifiers()
         self.assertEqual(qual_list[1].field, 'id')
@@ -145,6 +145,28 @@ class TestUnitDefinition(TestCase):
         self.assertEqual(unit6.get_record_value('key'), None)
         self.assertEqual(unit6.get_record_value('key', 'default'), 'default')
 
+    def test_get_record_value__rendered_once(self):
+        """
+        Ensure that parametric values are only rendered once
+        """
+        unit = Unit({'key': '{param}', 'other': 'other'},
+                    parameters={'param': 'value'})
+        with mock.patch('string.Formatter') as mock_formatter:
+            mock_formatter().vformat.return_value = 'value'
+            mock_formatter.reset_mock()
+            for i in range(3):
+                self.assertEqual(unit.get_record_value('key'), 'value')
+                self.assertEqual(unit.get_raw_record_value('key'), 'value')
+                self.assertEqual(unit.get_record_value('other'), 'other')
+        mock_formatter().vformat.assert_called_once_with(
+            '{param}', (), {'param': 'value'})
+
+    def test_get_record_value__escaped_braces(self):
+        unit = Unit({'key': '{{literal}} {param}'},
+                    parameters={'param': 'value'})
+        self.assertEqual(unit.get_record_value('key'), '{literal} value')
+        self.assertEqual(unit.get_record_value('key'), '{literal} value')
+
     def test_get_translated_data__typical(self):
         """
         Verify the runtime behavior of get_translated_data()
@@ -409,6 +409,18 @@ class TestPlanUnit(UnitWithId):
             qual_list.extend([tp_unit.get_bootstrap_qualifier(excluding)])
         return CompositeQualifier(qual_list)
 
+    def get_support(self):
+        """
+        Get the helper with the overrides and qualifiers of this test plan.
+
+        :returns:
+            A TestPlanUnitSupport instance, computed once for each test plan
+            (and shared by all the test plans that use it as a nested part)
+        """
+        if not hasattr(self, "_support"):
+            self._support = TestPlanUnitSupport(self)
+        return self._support
+
     def _gen_qualifiers(self, field_name, field_value, inclusive):
         if field_value is not None:
             field_origin = self.origin.just_line().with_offset(
@@ -550,13 +562,10 @@ class TestPlanUnit(UnitWithId):
             category. The caller is responsible for validating that.
         """
         effective_map = {job.id: job.category_id for job in job_list}
-        if self.category_overrides is not None:
-            overrides_gen = self.parse_category_overrides(
-                self.category_overrides)
-            for lineno_offset, category_id, pattern in overrides_gen:
-                for job in job_list:
-                    if re.match(pattern, job.id):
-                        effective_map[job.id] = category_id
+        for category_id, pattern in self._get_category_override_list():
+            for job in job_list:
+                if pattern.match(job.id):
+                    effective_map[job.id] = category_id
         return effective_map
 
     def get_effective_category(self, job):
@@ -568,14 +577,30 @@ class TestPlanUnit(UnitWithId):
         :returns:
             The effective category_id
         """
-        if self.category_overrides is not None:
-            overrides_gen = self.parse_category_overrides(
-                self.category_overrides)
-            for lineno_offset, category_id, pattern in overrides_gen:
-                if re.match(pattern, job.id):
-                    return category_id
+        for category_id, pattern in self._get_category_override_list():
+            if pattern.match(job.id):
+                return category_id
         return job.category_id
 
+    def _get_category_override_list(self):
+        """
+        Get the parsed category overrides of this test plan.
+
+        :returns:
+            A list of pairs (category_id, pattern) where pattern is the
+            compiled regular expression that selects the jobs to override.
+        """
+        if not hasattr(self, "_category_override_list"):
+            if self.category_overrides is None:
+                override_list = []
+            else:
+                override_list = [
+                    (category_id, re.compile(pattern))
+                    for lineno_offset, category_id, pattern
+                    in self.parse_category_overrides(self.category_overrides)]
+            self._category_override_list = override_list
+        return self._category_override_list
+
     def qualify_pattern(self, pattern):
         """ qualify bare pattern (without ^ and $) """
         if pattern.startswith('^') and pattern.endswith('$'):
@@ -737,6 +762,12 @@ PatternMatcher('^job-[x-z]$'), inclusive=False)])
     """
 
     def __init__(self, testplan):
+        # The overrides of nested parts come from their (cached) helpers, see
+        # TestPlanUnit.get_support(), so each test plan is parsed only once.
+        self._inline_override_list = self._get_inline_overrides(testplan)
+        self._category_override_list = self._get_category_overrides(testplan)
+        self._blocker_status_override_list = (
+            self._get_blocker_status_overrides(testplan))
         self.override_list = self._get_override_list(testplan)
         self.qualifier = self._get_qualifier(testplan)
 
@@ -824,12 +855,11 @@ PatternMatcher('^job-[x-z]$'), inclusive=False)])
         """
         override_map = collections.defaultdict(list)
         # ^^ Dict[str, Tuple[str, str]]
-        for pattern, field_value_list in self._get_inline_overrides(testplan):
+        for pattern, field_value_list in self._inline_override_list:
             override_map[pattern].extend(field_value_list)
-        for pattern, field, value in self._get_category_overrides(testplan):
+        for pattern, field, value in self._category_override_list:
             override_map[pattern].append((field, value))
-        for pattern, field, value in self._get_blocker_status_overrides(
-                testplan):
+        for pattern, field, value in self._blocker_status_override_list:
             override_map[pattern].append((field, value))
         return sorted((key, field_value_list)
                       for key, field_value_list in override_map.items())
@@ -859,7 +889,8 @@ PatternMatcher('^job-[x-z]$'), inclusive=False)])
 
         V().visit(OverrideFieldList.parse(testplan.category_overrides))
         for tp_unit in testplan.get_nested_part():
-            override_list.extend(self._get_category_overrides(tp_unit))
+            override_list.extend(
+                tp_unit.get_support()._category_override_list)
         return override_list
 
     def _get_blocker_status_overrides(
@@ -888,7 +919,8 @@ PatternMatcher('^job-[x-z]$'), inclusive=False)])
             V().visit(OverrideFieldList.parse(
                 testplan.certification_status_overrides))
         for tp_unit in testplan.get_nested_part():
-            override_list.extend(self._get_blocker_status_overrides(tp_unit))
+            override_list.extend(
+                tp_unit.get_support()._blocker_status_override_list)
         return override_list
 
     def _get_inline_overrides(
@@ -918,5 +950,6 @@ PatternMatcher('^job-[x-z]$'), inclusive=False)])
 
             V().visit(IncludeStmtList.parse(testplan.include))
         for tp_unit in testplan.get_nested_part():
-            override_list.extend(self._get_inline_overrides(tp_unit))
+            override_list.extend(
+                tp_unit.get_support()._inline_override_list)
         return override_list
@@ -381,9 +381,13 @@ class Unit(metaclass=UnitType):
         self._field_offset_map = field_offset_map
         self._provider = provider
         self._checksum = None
+        # Canonical form of data, as used by _compute_checksum()
+        self._canonical_data = None
         self._parameters = parameters
         self._virtual = virtual
         self._hash_cache = None
+        # Cache of template values rendered with the parameters of this unit
+        self._rendered_value_map = {}
 
     @classmethod
     def instantiate_template(cls, data, raw_data, origin, provider, parameters,
@@ -562,7 +566,7 @@ class Unit(metaclass=UnitType):
         if value is None:
             value = self._data.get('{}'.format(name), default)
         if value is not None and self.is_parametric:
-            value = string.Formatter().vformat(value, (), self.parameters)
+            value = self._render_value(value)
         return value
 
     def get_raw_record_value(self, name, default=None):
@@ -587,7 +591,7 @@ class Unit(metaclass=UnitType):
         if value is None:
             value = self._raw_data.get('{}'.format(name), default)
         if value is not None and self.is_parametric:
-            value = string.Formatter().vformat(value, (), self.parameters)
+            value = self._render_value(value)
         return value
 
     def get_translated_record_value(self, name, default=None):
@@ -626,8 +630,7 @@ class Unit(metaclass=UnitType):
                 # might fail due to broken translations. Perhaps we should
                 # handle exceptions here and hint that this might be the cause
                 # of the problem?
-                msgstr = string.Formatter().vformat(
-                    msgstr, (), self.parameters)
+                msgstr = self._render_value(msgstr)
             return msgstr
         # If there was no marked-for-translation value then let's just return
         # the normal (untranslatable) version.
@@ -636,12 +639,34 @@ class Unit(metaclass=UnitType):
             # NOTE: there is no need to normalize anything as we already got
             # the non-raw value here.
             if self.is_parametric:
-                msgstr = string.Formatter().vformat(
-                    msgstr, (), self.parameters)
+                msgstr = self._render_value(msgstr)
             return msgstr
         # If we have nothing better let's just return the default value
         return default
 
+    def _render_value(self, value):
+        """
+        Insert the parameters of this unit into a template value.
+
+        :param value:
+            Text of a template field
+        :returns:
+            The text with all the parameters inserted
+        :raises:
+            KeyError if the parameters are incorrect
+
+        Each field of a parametric unit is typically accessed many times so
+        the rendered text is remembered. This is safe as the parameters of a
+        unit never change.
+        """
+        if '{' not in value and '}' not in value:
+            return value
+        rendered = self._rendered_value_map.get(value)
+        if rendered is None:
+            rendered = string.Formatter().vformat(value, (), self.parameters)
+            self._rendered_value_map[value] = rendered
+        return rendered
+
     def is_translatable_field(self, name):
         """
         Check if a field is marked as translatable
@@ -692,11 +717,29 @@ class Unit(metaclass=UnitType):
         """
         Compute the value for :attr:`checksum`.
         """
+        if self._canonical_data is None:
+            self._canonical_data = self._get_canonical_form(self._data)
+        text = self._canonical_data
+        # Parametric units also get a copy of their parameters stored as an
+        # additional piece of data
+        if self.is_parametric:
+            text += self._get_canonical_form(self.parameters)
+        # Compute the sha256 hash of the UTF-8 encoding of the canonical form
+        # and return the hex digest as the checksum that can be displayed.
+        return hashlib.sha256(text).hexdigest()
+
+    @staticmethod
+    def _get_canonical_form(mapping):
+        """
+        Compute the UTF-8 encoded canonical form of a mapping.
+
+        This is a part of :meth:`_compute_checksum()`.
+        """
         # Ideally we'd use simplejson.dumps() with sorted keys to get
         # predictable serialization but that's another dependency. To get
         # something simple that is equally reliable, just sort all the keys
         # manually and ask standard json to serialize that..
-        sorted_data = collections.OrderedDict(sorted(self._data.items()))
+        sorted_mapping = collections.OrderedDict(sorted(mapping.items()))
         # Define a helper function to convert symbols to strings for the
         # purpose of computing the checksum's canonical representation.
 
@@ -707,21 +750,9 @@ class Unit(metaclass=UnitType):
         # Compute the canonical form which is arbitrarily defined as sorted
         # json text with default indent and separator settings.
         canonical_form = json.dumps(
-            sorted_data, indent=None, separators=(',', ':'),
+            sorted_mapping, indent=None, separators=(',', ':'),
             default=default_fn)
-        text = canonical_form.encode('UTF-8')
-        # Parametric units also get a copy of their parameters stored as an
-        # additional piece of data
-        if self.is_parametric:
-            sorted_parameters = collections.OrderedDict(
-                sorted(self.parameters.items()))
-            canonical_parameters = json.dumps(
-                sorted_parameters, indent=None, separators=(',', ':'),
-                default=default_fn)
-            text += canonical_parameters.encode('UTF-8')
-        # Compute the sha256 hash of the UTF-8 encoding of the canonical form
-        # and return the hex digest as the checksum that can be displayed.
-        return hashlib.sha256(text).hexdigest()
+        return canonical_form.encode('UTF-8')
 
     def get_translated_data(self, msgid):
         """
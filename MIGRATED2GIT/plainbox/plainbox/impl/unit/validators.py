@@ -644,7 +644,7 @@ class UnitReferenceValidator(FieldValidatorBase):
             value_list = None
         if value_list is None:
             value_list = []
-        elif not isinstance(value_list, (list, tuple, set)):
+        elif not isinstance(value_list, (list, tuple, set, frozenset)):
             value_list = [value_list]
         for unit_id in value_list:
             try: